@@ -0,0 +1,233 @@
+# benchmarks/cenarios.py
+#
+# Cenários medidos pelo benchmark. Cada um roda em um processo próprio
+# (python -m benchmarks.cenarios <nome> <saida.json> <parametros.json>), com
+# LEGISDATA_* apontando para um diretório temporário e para o servidor local,
+# de modo que checkpoints, manifesto e caches começam vazios.
+
+import json
+import os
+import sys
+import time
+
+
+def _tamanho_diretorio(caminho: str) -> int:
+    total = 0
+    for raiz, _, arquivos in os.walk(caminho):
+        total += sum(os.path.getsize(os.path.join(raiz, a)) for a in arquivos)
+    return total
+
+
+def _coletores():
+    from legisdata.coleta.coletor_gastos import ColetorGastosCEAP
+    from legisdata.coleta.coletor_proposicoes import ColetorProposicoes
+    from legisdata.coleta.coletor_autores import ColetorAutoresProposicoes
+    from legisdata.coleta.coletor_deputados import ColetorDeputados
+    from legisdata.coleta.coletor_eventos import ColetorEventos, ColetorOrgaosEventos, ColetorPresencasEventos
+    from legisdata.coleta.coletor_comissoes import ColetorComissoes
+
+    return {
+        "gastos": ColetorGastosCEAP,
+        "proposicoes": ColetorProposicoes,
+        "autores": ColetorAutoresProposicoes,
+        "eventos": ColetorEventos,
+        "presencas": ColetorPresencasEventos,
+        "eventos_orgaos": ColetorOrgaosEventos,
+        "deputados": ColetorDeputados,
+        "comissoes": ColetorComissoes,
+    }
+
+
+def _vazao(metricas: dict) -> dict:
+    segundos = metricas["segundos"] or 1e-9
+    if "bytes" in metricas:
+        metricas["mb_por_s"] = round(metricas["bytes"] / segundos / 1e6, 2)
+    if "linhas" in metricas:
+        metricas["linhas_por_s"] = round(metricas["linhas"] / segundos)
+    metricas["segundos"] = round(metricas["segundos"], 4)
+    return metricas
+
+
+def coleta_por_coletor(tipo: str, parametros: dict) -> dict:
+    """
+    Download (e extração, no caso da CEAP) de todos os anos por um único
+    coletor, em série.
+    """
+    from legisdata.config import DIRETORIO_RAW
+
+    coletor = _coletores()[tipo]()
+    anos = parametros["anos"] if coletor.anual else ["geral"]
+    inicio = time.perf_counter()
+    for ano in anos:
+        coletor.baixar(ano)
+    segundos = time.perf_counter() - inicio
+    return _vazao({"segundos": segundos, "bytes": _tamanho_diretorio(DIRETORIO_RAW), "arquivos": len(anos)})
+
+
+def _agendar(parametros: dict, max_paralelos: int, max_por_host: int, **opcoes):
+    from legisdata.coleta.agendador import AgendadorColeta
+
+    coletores = [classe() for classe in _coletores().values()]
+    agendador = AgendadorColeta(
+        coletores, anos=parametros["anos"], max_paralelos=max_paralelos, max_por_host=max_por_host, **opcoes
+    )
+    return agendador.executar()
+
+
+def coleta_agendada(parametros: dict, max_paralelos: int, max_por_host: int) -> dict:
+    """
+    Todos os coletores pelo AgendadorColeta: em série (1 download por vez)
+    ou em paralelo, para comparar.
+    """
+    from legisdata.config import DIRETORIO_RAW
+
+    inicio = time.perf_counter()
+    resultados = _agendar(parametros, max_paralelos, max_por_host)
+    segundos = time.perf_counter() - inicio
+    return _vazao({
+        "segundos": segundos,
+        "bytes": _tamanho_diretorio(DIRETORIO_RAW),
+        "tarefas": len(resultados),
+        "erros": sum(1 for r in resultados if r.status == "erro"),
+    })
+
+
+def revalidacao(parametros: dict) -> dict:
+    """
+    Segunda passada com tudo já baixado e revalidação forçada: mede o custo
+    dos GETs condicionais (304) sobre o checkpoint cheio.
+    """
+    _agendar(parametros, 8, 4)
+    inicio = time.perf_counter()
+    resultados = _agendar(parametros, 8, 4, revalidar_gerais=True, revalidar_anos=parametros["anos"])
+    segundos = time.perf_counter() - inicio
+    return _vazao({"segundos": segundos, "tarefas": len(resultados)})
+
+
+def extracao(parametros: dict) -> dict:
+    """
+    Extração em streaming do CSV de cada zip da CEAP (sem rede).
+    """
+    import tempfile
+
+    from legisdata.coleta.coletor_gastos import ColetorGastosCEAP
+    from legisdata.config import DIRETORIO_RAW
+    from legisdata.utils.io import extrair_csv_de_zip
+
+    coletor = ColetorGastosCEAP(armazenamento="zip")
+    for ano in parametros["anos"]:
+        coletor.baixar(ano)
+
+    destino = tempfile.mkdtemp(dir=DIRETORIO_RAW)
+    inicio = time.perf_counter()
+    for ano in parametros["anos"]:
+        extrair_csv_de_zip(os.path.join(DIRETORIO_RAW, "gastos", f"{ano}.csv.zip"), os.path.join(destino, f"{ano}.csv"))
+    segundos = time.perf_counter() - inicio
+    return _vazao({"segundos": segundos, "bytes": _tamanho_diretorio(destino)})
+
+
+def checkpoint(parametros: dict) -> dict:
+    """
+    Registro e consulta de chaves nos checkpoints SQLite: arquivos por
+    (tipo, ano) e despesas por (deputado, ano, mês).
+    """
+    from legisdata.coleta.checkpoint import obter_checkpoint, obter_checkpoint_despesas
+
+    chaves = [(204_000 + d, ano, mes) for d in range(600) for ano in parametros["anos"] for mes in range(1, 13)]
+    arquivos = obter_checkpoint()
+    despesas = obter_checkpoint_despesas()
+
+    inicio = time.perf_counter()
+    for tipo in ("gastos", "proposicoes", "eventos"):
+        for ano in parametros["anos"]:
+            arquivos.registrar(tipo, ano)
+    despesas.registrar_lote(chaves)
+    registro = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    encontrados = sum(despesas.contem(*chave) for chave in chaves)
+    pendentes = despesas.novas(chaves)
+    consulta = time.perf_counter() - inicio
+
+    return _vazao({
+        "segundos": registro + consulta,
+        "segundos_registro": round(registro, 4),
+        "segundos_consulta": round(consulta, 4),
+        "chaves": len(chaves),
+        "encontrados": encontrados,
+        "pendentes": len(pendentes),
+    })
+
+
+def processamento(parametros: dict) -> dict:
+    """
+    Conversão para Parquet de tudo que foi coletado, construção do cubo, do
+    índice de autoria, das matrizes de presença e do índice de comissões,
+    seguidas de uma segunda passada (incremental, sem mudanças).
+    """
+    from legisdata.analise import construir_cubo
+    from legisdata.comissoes import construir_indice_comissoes
+    from legisdata.indice_autoria import construir_indice_autoria
+    from legisdata.presencas import construir_matrizes_presenca
+    from legisdata.processamento import processar
+
+    _agendar(parametros, 8, 4)
+
+    inicio = time.perf_counter()
+    convertidos = processar()
+    conversao = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    construir_cubo()
+    cubo = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    construir_indice_autoria()
+    indice = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    construir_matrizes_presenca()
+    matrizes = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    construir_indice_comissoes()
+    comissoes = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    processar()
+    construir_cubo()
+    construir_indice_autoria()
+    construir_matrizes_presenca()
+    construir_indice_comissoes()
+    incremental = time.perf_counter() - inicio
+
+    return _vazao({
+        "segundos": conversao + cubo + indice + matrizes + comissoes,
+        "segundos_conversao": round(conversao, 4),
+        "segundos_cubo": round(cubo, 4),
+        "segundos_indice": round(indice, 4),
+        "segundos_matrizes": round(matrizes, 4),
+        "segundos_comissoes": round(comissoes, 4),
+        "segundos_incremental": round(incremental, 4),
+        "linhas": sum(linhas for _, _, linhas in convertidos),
+    })
+
+
+CENARIOS = {
+    **{f"coleta_{tipo}": (lambda p, t=tipo: coleta_por_coletor(t, p)) for tipo in
+       ("gastos", "proposicoes", "autores", "eventos", "presencas", "eventos_orgaos",
+        "deputados", "comissoes")},
+    "coleta_serial": lambda p: coleta_agendada(p, max_paralelos=1, max_por_host=1),
+    "coleta_paralela": lambda p: coleta_agendada(p, max_paralelos=8, max_por_host=8),
+    "revalidacao": revalidacao,
+    "extracao": extracao,
+    "checkpoint": checkpoint,
+    "processamento": processamento,
+}
+
+
+if __name__ == "__main__":
+    nome, saida, parametros = sys.argv[1], sys.argv[2], json.loads(sys.argv[3])
+    metricas = CENARIOS[nome](parametros)
+    with open(saida, "w", encoding="utf-8") as f:
+        json.dump(metricas, f)
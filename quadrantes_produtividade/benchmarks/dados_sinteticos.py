@@ -0,0 +1,259 @@
+# benchmarks/dados_sinteticos.py
+#
+# Arquivos sintéticos no formato dos dados abertos da Câmara (mesmas colunas,
+# separador e tipos), com volume próximo ao real por ano. Os valores são
+# aleatórios mas determinísticos pela semente.
+
+import io
+import random
+import zipfile
+
+# Linhas por arquivo com escala 1.0, próximas das publicadas pela Câmara.
+LINHAS_POR_TIPO = {
+    "gastos": 250_000,
+    "proposicoes": 40_000,
+    "autores": 120_000,
+    "eventos": 6_000,
+    "presencas": 900_000,
+    "deputados": 8_000,
+    "comissoes": 20_000,
+}
+
+COLUNAS_CEAP = [
+    "txNomeParlamentar", "cpf", "ideCadastro", "nuCarteiraParlamentar", "nuLegislatura", "sgUF",
+    "sgPartido", "codLegislatura", "numSubCota", "txtDescricao", "numEspecificacaoSubCota",
+    "txtDescricaoEspecificacao", "txtFornecedor", "txtCNPJCPF", "txtNumero", "indTipoDocumento",
+    "datEmissao", "vlrDocumento", "vlrGlosa", "vlrLiquido", "numMes", "numAno", "numParcela",
+    "txtPassageiro", "txtTrecho", "numLote", "numRessarcimento", "datPagamentoRestituicao",
+    "vlrRestituicao", "nuDeputadoId", "ideDocumento", "urlDocumento",
+]
+
+UFS = ["SP", "RJ", "MG", "BA", "RS", "PR", "PE", "CE", "PA", "SC", "GO", "MA", "DF", "AM"]
+PARTIDOS = ["PT", "PL", "UNIÃO", "PP", "MDB", "PSD", "REPUBLICANOS", "PDT", "PSB", "PSDB", "PSOL"]
+CATEGORIAS = [
+    "COMBUSTÍVEIS E LUBRIFICANTES.", "PASSAGEM AÉREA - SIGEPA", "TELEFONIA",
+    "DIVULGAÇÃO DA ATIVIDADE PARLAMENTAR.", "MANUTENÇÃO DE ESCRITÓRIO DE APOIO À ATIVIDADE PARLAMENTAR",
+    "LOCAÇÃO OU FRETAMENTO DE VEÍCULOS AUTOMOTORES", "SERVIÇOS POSTAIS", "HOSPEDAGEM ,EXCETO DO PARLAMENTAR NO DISTRITO FEDERAL.",
+]
+TIPOS_PROPOSICAO = ["PL", "REQ", "PLP", "PEC", "INC", "RIC", "PDL", "EMC"]
+ORGAOS = ["PLEN", "CCJC", "CFT", "CSAUDE", "CE", "CDH", "CMADS", "CAPADR", "CVT", "CCTI"]
+SITUACOES = ["Aguardando Parecer", "Arquivada", "Tramitando em Conjunto", "Aguardando Designação de Relator"]
+
+NUM_DEPUTADOS = 600
+PRIMEIRO_ID_DEPUTADO = 204_000
+
+
+def _csv(cabecalho, linhas) -> bytes:
+    saida = io.StringIO()
+    saida.write(";".join(f'"{c}"' for c in cabecalho) + "\n")
+    for linha in linhas:
+        saida.write(";".join(f'"{v}"' for v in linha) + "\n")
+    return saida.getvalue().encode("utf-8")
+
+
+def _data(r: random.Random, ano: int) -> str:
+    return f"{ano}-{r.randint(1, 12):02d}-{r.randint(1, 28):02d}T{r.randint(0, 23):02d}:00:00"
+
+
+def csv_ceap(ano: int, linhas: int, semente: int = 0) -> bytes:
+    r = random.Random(semente * 10_000 + ano)
+
+    def gerar():
+        for i in range(linhas):
+            dep = r.randrange(NUM_DEPUTADOS)
+            id_dep = PRIMEIRO_ID_DEPUTADO + dep
+            mes = r.randint(1, 12)
+            valor = round(r.expovariate(1 / 900), 2)
+            yield (
+                f"DEPUTADO {dep}", f"{dep:011d}", id_dep, dep, 2023, UFS[dep % len(UFS)],
+                PARTIDOS[dep % len(PARTIDOS)], 57, r.randint(1, 15), CATEGORIAS[r.randrange(len(CATEGORIAS))],
+                0, "", f"FORNECEDOR {r.randrange(5000)}", f"{r.randrange(10**14):014d}", i,
+                r.randint(0, 4), f"{ano}-{mes:02d}-{r.randint(1, 28):02d}T00:00:00", valor, 0, valor,
+                mes, ano, 0, "", "", r.randrange(10**6), "", "", "", dep,
+                ano * 10_000_000 + i, f"https://www.camara.leg.br/cota-parlamentar/documentos/{i}.pdf",
+            )
+
+    return _csv(COLUNAS_CEAP, gerar())
+
+
+def zip_ceap(ano: int, linhas: int, semente: int = 0) -> bytes:
+    saida = io.BytesIO()
+    with zipfile.ZipFile(saida, "w", zipfile.ZIP_DEFLATED, compresslevel=1) as arquivo:
+        arquivo.writestr(f"Ano-{ano}.csv", csv_ceap(ano, linhas, semente))
+    return saida.getvalue()
+
+
+def csv_proposicoes(ano: int, linhas: int, semente: int = 0) -> bytes:
+    r = random.Random(semente * 10_000 + ano + 1)
+    cabecalho = [
+        "id", "uri", "siglaTipo", "numero", "ano", "codTipo", "descricaoTipo", "ementa",
+        "dataApresentacao", "ultimoStatus_dataHora", "ultimoStatus_siglaOrgao",
+        "ultimoStatus_descricaoTramitacao", "ultimoStatus_descricaoSituacao",
+    ]
+
+    def gerar():
+        for i in range(linhas):
+            id_prop = ano * 100_000 + i
+            sigla = TIPOS_PROPOSICAO[r.randrange(len(TIPOS_PROPOSICAO))]
+            yield (
+                id_prop, f"https://dadosabertos.camara.leg.br/api/v2/proposicoes/{id_prop}", sigla, i, ano,
+                139, sigla, f"Dispõe sobre o assunto {r.randrange(10**6)} e dá outras providências.",
+                _data(r, ano), _data(r, ano), "PLEN", "Apresentação", SITUACOES[r.randrange(len(SITUACOES))],
+            )
+
+    return _csv(cabecalho, gerar())
+
+
+def csv_autores(ano: int, linhas: int, semente: int = 0, proposicoes: int = LINHAS_POR_TIPO["proposicoes"]) -> bytes:
+    r = random.Random(semente * 10_000 + ano + 4)
+    cabecalho = [
+        "idProposicao", "uriProposicao", "idDeputadoAutor", "uriAutor", "codTipoAutor", "tipoAutor",
+        "nomeAutor", "siglaPartidoAutor", "uriPartidoAutor", "siglaUFAutor", "ordemAssinatura", "proponente",
+    ]
+
+    def gerar():
+        for i in range(linhas):
+            id_prop = ano * 100_000 + r.randrange(proposicoes)
+            if r.random() < 0.05:
+                yield (id_prop, "", "", "", 40000, "Órgão do Poder Executivo", "Poder Executivo", "", "", "", 1, 1)
+                continue
+            dep = r.randrange(NUM_DEPUTADOS)
+            id_dep = PRIMEIRO_ID_DEPUTADO + dep
+            yield (
+                id_prop, f"https://dadosabertos.camara.leg.br/api/v2/proposicoes/{id_prop}", id_dep,
+                f"https://dadosabertos.camara.leg.br/api/v2/deputados/{id_dep}", 10000, "Deputado(a)",
+                f"DEPUTADO {dep}", PARTIDOS[dep % len(PARTIDOS)], "", UFS[dep % len(UFS)], r.randint(1, 5),
+                int(r.random() < 0.5),
+            )
+
+    return _csv(cabecalho, gerar())
+
+
+def csv_eventos(ano: int, linhas: int, semente: int = 0) -> bytes:
+    r = random.Random(semente * 10_000 + ano + 2)
+    cabecalho = [
+        "id", "uri", "dataHoraInicio", "dataHoraFim", "situacao", "descricao",
+        "descricaoTipo", "localExterno", "localCamara.nome",
+    ]
+
+    def gerar():
+        for i in range(linhas):
+            id_evento = ano * 100_000 + i
+            inicio = _data(r, ano)
+            yield (
+                id_evento, f"https://dadosabertos.camara.leg.br/api/v2/eventos/{id_evento}", inicio, inicio,
+                "Encerrada", f"Reunião deliberativa {i}", "Reunião Deliberativa", "",
+                f"Anexo II, Plenário {r.randint(1, 16):02d}",
+            )
+
+    return _csv(cabecalho, gerar())
+
+
+def csv_presencas(ano: int, linhas: int, semente: int = 0, eventos: int = LINHAS_POR_TIPO["eventos"]) -> bytes:
+    r = random.Random(semente * 10_000 + ano + 5)
+    cabecalho = ["idEvento", "uriEvento", "dataHoraInicio", "idDeputado", "uriDeputado"]
+
+    def gerar():
+        for _ in range(linhas):
+            id_evento = ano * 100_000 + r.randrange(eventos)
+            id_dep = PRIMEIRO_ID_DEPUTADO + r.randrange(NUM_DEPUTADOS)
+            # Mês fixo por evento, como no arquivo real.
+            mes = id_evento % 12 + 1
+            yield (
+                id_evento, f"https://dadosabertos.camara.leg.br/api/v2/eventos/{id_evento}",
+                f"{ano}-{mes:02d}-10T14:00:00", id_dep, f"https://dadosabertos.camara.leg.br/api/v2/deputados/{id_dep}",
+            )
+
+    return _csv(cabecalho, gerar())
+
+
+def csv_eventos_orgaos(ano: int, eventos: int, semente: int = 0) -> bytes:
+    r = random.Random(semente * 10_000 + ano + 6)
+    cabecalho = ["idEvento", "uriEvento", "idOrgao", "uriOrgao", "siglaOrgao", "nomeOrgao"]
+
+    def gerar():
+        for i in range(eventos):
+            id_evento = ano * 100_000 + i
+            for _ in range(1 + (r.random() < 0.1)):
+                orgao = r.randrange(len(ORGAOS))
+                yield (
+                    id_evento, f"https://dadosabertos.camara.leg.br/api/v2/eventos/{id_evento}", 2000 + orgao,
+                    f"https://dadosabertos.camara.leg.br/api/v2/orgaos/{2000 + orgao}", ORGAOS[orgao],
+                    f"Órgão {ORGAOS[orgao]}",
+                )
+
+    return _csv(cabecalho, gerar())
+
+
+def csv_deputados(linhas: int, semente: int = 0) -> bytes:
+    r = random.Random(semente + 3)
+    cabecalho = [
+        "uri", "nome", "idLegislaturaInicial", "idLegislaturaFinal", "nomeCivil", "cpf", "siglaSexo",
+        "urlRedeSocial", "urlWebsite", "dataNascimento", "dataFalecimento", "ufNascimento",
+        "municipioNascimento",
+    ]
+
+    def gerar():
+        for i in range(linhas):
+            id_dep = PRIMEIRO_ID_DEPUTADO - linhas + NUM_DEPUTADOS + i
+            yield (
+                f"https://dadosabertos.camara.leg.br/api/v2/deputados/{id_dep}", f"DEPUTADO {i}",
+                r.randint(1, 56), 57, f"NOME CIVIL {i}", f"{i:011d}", "MF"[i % 2], "", "",
+                f"{r.randint(1930, 1995)}-{r.randint(1, 12):02d}-{r.randint(1, 28):02d}", "",
+                UFS[i % len(UFS)], "Cidade",
+            )
+
+    return _csv(cabecalho, gerar())
+
+
+def csv_comissoes(linhas: int, semente: int = 0) -> bytes:
+    r = random.Random(semente + 4)
+    cabecalho = [
+        "idOrgao", "uriOrgao", "siglaOrgao", "nomeOrgao", "idDeputado", "uriDeputado", "nomeDeputado",
+        "siglaPartido", "siglaUF", "titulo", "dataInicio", "dataFim",
+    ]
+
+    def gerar():
+        for _ in range(linhas):
+            orgao = r.randrange(400)
+            dep = r.randrange(NUM_DEPUTADOS)
+            ano = r.randint(2008, 2024)
+            yield (
+                orgao, f"https://dadosabertos.camara.leg.br/api/v2/orgaos/{orgao}", f"C{orgao}",
+                f"Comissão {orgao}", PRIMEIRO_ID_DEPUTADO + dep,
+                f"https://dadosabertos.camara.leg.br/api/v2/deputados/{PRIMEIRO_ID_DEPUTADO + dep}",
+                f"DEPUTADO {dep}", PARTIDOS[dep % len(PARTIDOS)], UFS[dep % len(UFS)],
+                "Titular", f"{ano}-02-01", f"{ano + 1}-01-31",
+            )
+
+    return _csv(cabecalho, gerar())
+
+
+def gerar_arquivos(anos, escala: float = 1.0, semente: int = 0) -> dict:
+    """
+    {caminho da URL: conteúdo} de todos os arquivos servidos, com as mesmas
+    rotas usadas pelos coletores (/arquivos/... e /cotas/...).
+    """
+    def linhas(tipo):
+        return max(1, int(LINHAS_POR_TIPO[tipo] * escala))
+
+    arquivos = {
+        "/arquivos/deputados/csv/deputados.csv": csv_deputados(linhas("deputados"), semente),
+        "/arquivos/comissoesMembros/csv/comissoesMembros.csv": csv_comissoes(linhas("comissoes"), semente),
+    }
+    for ano in anos:
+        arquivos[f"/cotas/Ano-{ano}.csv.zip"] = zip_ceap(ano, linhas("gastos"), semente)
+        arquivos[f"/arquivos/proposicoes/csv/proposicoes-{ano}.csv"] = csv_proposicoes(
+            ano, linhas("proposicoes"), semente
+        )
+        arquivos[f"/arquivos/proposicoesAutores/csv/proposicoesAutores-{ano}.csv"] = csv_autores(
+            ano, linhas("autores"), semente, proposicoes=linhas("proposicoes")
+        )
+        arquivos[f"/arquivos/eventos/csv/eventos-{ano}.csv"] = csv_eventos(ano, linhas("eventos"), semente)
+        arquivos[f"/arquivos/eventosPresencaDeputados/csv/eventosPresencaDeputados-{ano}.csv"] = csv_presencas(
+            ano, linhas("presencas"), semente, eventos=linhas("eventos")
+        )
+        arquivos[f"/arquivos/eventosOrgaos/csv/eventosOrgaos-{ano}.csv"] = csv_eventos_orgaos(
+            ano, linhas("eventos"), semente
+        )
+    return arquivos
@@ -0,0 +1,117 @@
+# benchmarks/executar.py
+#
+# Benchmark offline da coleta e do processamento.
+#
+#   python -m benchmarks.executar --anos 2022 2023 --escala 0.2 --latencia 0.02 \
+#       --banda 20000000 --quedas 0.05 --saida resultados_benchmark.json
+#
+# Gera os arquivos sintéticos, sobe o servidor local e roda cada cenário
+# em um processo separado com um diretório de dados vazio. O resultado
+# (JSON) traz os parâmetros, a máquina e as métricas de cada cenário, para
+# comparar execuções e detectar regressões.
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from benchmarks.cenarios import CENARIOS
+from benchmarks.dados_sinteticos import gerar_arquivos
+from benchmarks.servidor import ServidorCamaraLocal
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def rodar_cenario(nome: str, servidor: ServidorCamaraLocal, parametros: dict, verboso: bool = False) -> dict:
+    with tempfile.TemporaryDirectory(prefix=f"legisdata-bench-{nome}-") as diretorio:
+        ambiente = {
+            **os.environ,
+            "LEGISDATA_DIRETORIO_DADOS": os.path.join(diretorio, "data"),
+            "LEGISDATA_DIRETORIO_CHECKPOINT": os.path.join(diretorio, "checkpoints"),
+            "LEGISDATA_DIRETORIO_LOGS": os.path.join(diretorio, "logs"),
+            "LEGISDATA_URL_DADOS_ABERTOS_ARQUIVOS": f"{servidor.url}/arquivos",
+            "LEGISDATA_URL_CEAP_ZIP": f"{servidor.url}/cotas/Ano-{{ano}}.csv.zip",
+            "LEGISDATA_URL_API_CAMARA": f"{servidor.url}/api/v2",
+        }
+        saida = os.path.join(diretorio, "metricas.json")
+        antes = dict(servidor.estatisticas)
+        inicio = time.perf_counter()
+        processo = subprocess.run(
+            [sys.executable, "-m", "benchmarks.cenarios", nome, saida, json.dumps(parametros)],
+            cwd=RAIZ, env=ambiente,
+            stdout=None if verboso else subprocess.DEVNULL,
+            stderr=None if verboso else subprocess.PIPE,
+            text=True,
+        )
+        total = time.perf_counter() - inicio
+
+        if processo.returncode != 0:
+            return {"nome": nome, "status": "erro", "erro": (processo.stderr or "")[-2000:]}
+        with open(saida, encoding="utf-8") as f:
+            metricas = json.load(f)
+
+    servidor_delta = {k: servidor.estatisticas[k] - antes[k] for k in antes}
+    return {"nome": nome, "status": "ok", "segundos_processo": round(total, 4), **metricas,
+            "servidor": servidor_delta}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark offline da coleta e do processamento.")
+    parser.add_argument("--anos", type=int, nargs="+", default=[2022, 2023])
+    parser.add_argument("--escala", type=float, default=0.2,
+                        help="fração do volume real por arquivo (1.0 ≈ 250 mil linhas de CEAP por ano)")
+    parser.add_argument("--latencia", type=float, default=0.0, help="segundos antes de cada resposta")
+    parser.add_argument("--banda", type=int, default=None, help="bytes/s por conexão")
+    parser.add_argument("--quedas", type=float, default=0.0, help="probabilidade de cortar cada resposta")
+    parser.add_argument("--cenarios", nargs="+", default=list(CENARIOS), choices=list(CENARIOS))
+    parser.add_argument("--saida", default="resultados_benchmark.json")
+    parser.add_argument("--semente", type=int, default=0)
+    parser.add_argument("--verboso", action="store_true")
+    args = parser.parse_args(argv)
+
+    print(f"🧪 Gerando dados sintéticos (escala {args.escala}, anos {args.anos})...")
+    inicio = time.perf_counter()
+    arquivos = gerar_arquivos(args.anos, escala=args.escala, semente=args.semente)
+    print(f"   {len(arquivos)} arquivos, {sum(map(len, arquivos.values())) / 1e6:.1f} MB "
+          f"em {time.perf_counter() - inicio:.1f}s")
+
+    parametros = {"anos": args.anos}
+    resultados = []
+    with ServidorCamaraLocal(arquivos, latencia=args.latencia, banda=args.banda,
+                             prob_queda=args.quedas, semente=args.semente) as servidor:
+        for nome in args.cenarios:
+            resultado = rodar_cenario(nome, servidor, parametros, verboso=args.verboso)
+            resultados.append(resultado)
+            if resultado["status"] == "ok":
+                extra = f"  {resultado['mb_por_s']} MB/s" if "mb_por_s" in resultado else ""
+                print(f"  ✅ {nome:<20} {resultado['segundos']:8.3f}s{extra}")
+            else:
+                print(f"  ❌ {nome:<20} {resultado['erro'].strip().splitlines()[-1]}")
+
+    relatorio = {
+        "gerado_em": datetime.now().isoformat(timespec="seconds"),
+        "maquina": {
+            "python": platform.python_version(),
+            "plataforma": platform.platform(),
+            "cpus": os.cpu_count(),
+        },
+        "parametros": {
+            "anos": args.anos, "escala": args.escala, "latencia": args.latencia,
+            "banda": args.banda, "quedas": args.quedas, "semente": args.semente,
+            "bytes_servidos": {caminho: len(conteudo) for caminho, conteudo in arquivos.items()},
+        },
+        "cenarios": resultados,
+    }
+    with open(args.saida, "w", encoding="utf-8") as f:
+        json.dump(relatorio, f, ensure_ascii=False, indent=2)
+    print(f"💾 Resultados em {args.saida}")
+    return 0 if all(r["status"] == "ok" for r in resultados) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,143 @@
+# benchmarks/servidor.py
+#
+# Servidor HTTP local que imita dadosabertos.camara.leg.br e camara.leg.br/cotas
+# para os benchmarks: serve arquivos em memória com ETag, GET condicional,
+# HEAD e Range, e pode simular latência, limite de banda por conexão e
+# quedas de conexão no meio do corpo.
+
+import hashlib
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+TAMANHO_BLOCO_ENVIO = 64 * 1024
+
+
+class ServidorCamaraLocal:
+    """
+    Sobe um ThreadingHTTPServer em 127.0.0.1 numa porta livre.
+
+    - `latencia`: segundos de espera antes de cada resposta;
+    - `banda`: bytes por segundo por conexão (None = sem limite);
+    - `prob_queda`: probabilidade de uma resposta com corpo ser cortada
+      em um ponto aleatório, fechando a conexão.
+    """
+
+    def __init__(self, arquivos: dict, latencia: float = 0.0, banda: int = None,
+                 prob_queda: float = 0.0, semente: int = 0):
+        self.arquivos = arquivos
+        self.etags = {caminho: '"' + hashlib.md5(conteudo).hexdigest() + '"' for caminho, conteudo in arquivos.items()}
+        self.latencia = latencia
+        self.banda = banda
+        self.prob_queda = prob_queda
+        self._aleatorio = random.Random(semente)
+        self._lock = threading.Lock()
+        self.estatisticas = {"requisicoes": 0, "bytes_enviados": 0, "quedas": 0, "nao_modificado": 0}
+        self._servidor = ThreadingHTTPServer(("127.0.0.1", 0), self._criar_handler())
+        self._servidor.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, porta = self._servidor.server_address
+        return f"http://{host}:{porta}"
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self._servidor.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._servidor.shutdown()
+        self._servidor.server_close()
+
+    def _contar(self, chave, valor=1):
+        with self._lock:
+            self.estatisticas[chave] += valor
+
+    def _sortear_queda(self, tamanho: int):
+        with self._lock:
+            if self.prob_queda and self._aleatorio.random() < self.prob_queda:
+                return self._aleatorio.randrange(1, max(2, tamanho))
+        return None
+
+    def _criar_handler(self):
+        servidor = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_HEAD(self):
+                self._responder(corpo=False)
+
+            def do_GET(self):
+                self._responder(corpo=True)
+
+            def _responder(self, corpo: bool):
+                servidor._contar("requisicoes")
+                if servidor.latencia:
+                    time.sleep(servidor.latencia)
+
+                conteudo = servidor.arquivos.get(self.path.split("?")[0])
+                if conteudo is None:
+                    self.send_response(404)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+
+                etag = servidor.etags[self.path.split("?")[0]]
+                if self.headers.get("If-None-Match") == etag:
+                    servidor._contar("nao_modificado")
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.end_headers()
+                    return
+
+                inicio, status = 0, 200
+                faixa = re.match(r"bytes=(\d+)-$", self.headers.get("Range", ""))
+                if_range = self.headers.get("If-Range")
+                if faixa and (if_range is None or if_range == etag):
+                    inicio = int(faixa.group(1))
+                    if inicio >= len(conteudo):
+                        self.send_response(416)
+                        self.send_header("Content-Range", f"bytes */{len(conteudo)}")
+                        self.send_header("Content-Length", "0")
+                        self.end_headers()
+                        return
+                    status = 206
+
+                parte = memoryview(conteudo)[inicio:]
+                self.send_response(status)
+                self.send_header("Content-Length", str(len(parte)))
+                self.send_header("ETag", etag)
+                self.send_header("Accept-Ranges", "bytes")
+                if status == 206:
+                    self.send_header("Content-Range", f"bytes {inicio}-{len(conteudo) - 1}/{len(conteudo)}")
+                self.end_headers()
+                if corpo:
+                    self._enviar(parte)
+
+            def _enviar(self, parte):
+                corte = servidor._sortear_queda(len(parte))
+                limite = len(parte) if corte is None else corte
+                enviado = 0
+                while enviado < limite:
+                    bloco = parte[enviado:min(limite, enviado + TAMANHO_BLOCO_ENVIO)]
+                    try:
+                        self.wfile.write(bloco)
+                    except (BrokenPipeError, ConnectionResetError):
+                        return
+                    enviado += len(bloco)
+                    if servidor.banda:
+                        time.sleep(len(bloco) / servidor.banda)
+                servidor._contar("bytes_enviados", enviado)
+                if corte is not None:
+                    servidor._contar("quedas")
+                    self.close_connection = True
+
+        return Handler
@@ -0,0 +1,14 @@
+# conftest.py
+#
+# Os testes rodam a partir deste diretório (python -m pytest) com legisdata
+# importável daqui. Os diretórios de dados, checkpoints e logs apontam para
+# uma área temporária antes de legisdata.config ser importado, para nenhum
+# teste tocar em data/ nem no manifesto reais.
+
+import os
+import tempfile
+
+_AREA = tempfile.mkdtemp(prefix="legisdata-testes-")
+os.environ["LEGISDATA_DIRETORIO_DADOS"] = os.path.join(_AREA, "data")
+os.environ["LEGISDATA_DIRETORIO_CHECKPOINT"] = os.path.join(_AREA, "checkpoints")
+os.environ["LEGISDATA_DIRETORIO_LOGS"] = os.path.join(_AREA, "logs")
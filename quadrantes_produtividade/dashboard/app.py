@@ -0,0 +1,96 @@
+# dashboard/app.py
+#
+# API do dashboard sobre o snapshot dos agregados (legisdata.snapshot). Cada
+# worker só mapeia os arquivos Arrow do snapshot na inicialização, sem ler
+# Parquet: os workers compartilham as páginas do page cache e ficam prontos
+# em milissegundos. Quando o processamento gera uma versão nova, o próximo
+# request de cada worker passa a usá-la. Os resultados de /gastos ficam no
+# cache de legisdata.cache (em memória por worker e em disco entre eles).
+#
+# Um processo:      python -m dashboard.app
+# Vários workers:   gunicorn "dashboard.app:criar_app()" -w 4 \
+#                       --worker-class aiohttp.GunicornWebWorker
+
+import json
+import time
+
+from aiohttp import web
+
+from dashboard.settings import HOST, PORTA, MAX_LINHAS_RESPOSTA
+from legisdata.analise import MEDIDAS
+from legisdata.dimensao import CHAVE
+from legisdata.snapshot import abrir_snapshot, consultar_snapshot
+
+# Parâmetros de filtro aceitos em /gastos (repetíveis: ?uf=SP&uf=RJ).
+FILTROS = ("ano", "mes", "categoria", "partido", "uf", CHAVE)
+FILTROS_NUMERICOS = {"ano", "mes", CHAVE}
+
+
+def _snapshot():
+    snapshot = abrir_snapshot()
+    if snapshot is None:
+        raise web.HTTPServiceUnavailable(text="Snapshot ainda não gerado: rode `python -m legisdata processar`.")
+    return snapshot
+
+
+def _json(quadro) -> web.Response:
+    return web.Response(text=quadro.to_json(orient="records", force_ascii=False), content_type="application/json")
+
+
+async def saude(request):
+    snapshot = _snapshot()
+    return web.json_response({
+        "versao": snapshot.versao,
+        "linhas_cubo": snapshot.cubo.num_rows,
+        "segundos_abertura": request.app["segundos_abertura"],
+    })
+
+
+async def gastos(request):
+    """
+    /gastos?por=uf&por=ano&ano=2024&medida=total: consultar_gastos sobre o
+    snapshot, com cache.
+    """
+    por = request.query.getall("por", ["ano"])
+    medidas = request.query.getall("medida", list(MEDIDAS))
+    try:
+        filtros = {
+            nome: [int(v) if nome in FILTROS_NUMERICOS else v for v in request.query.getall(nome)]
+            for nome in FILTROS if nome in request.query
+        }
+        desconhecidos = (set(por) - set(FILTROS)) | (set(medidas) - set(MEDIDAS))
+        if desconhecidos:
+            raise ValueError(f"desconhecidos: {sorted(desconhecidos)}")
+    except ValueError as e:
+        raise web.HTTPBadRequest(text=str(e))
+    return _json(consultar_snapshot(_snapshot(), por, filtros, medidas).head(MAX_LINHAS_RESPOSTA))
+
+
+async def deputado(request):
+    try:
+        id_deputado = int(request.match_info["id_deputado"])
+    except ValueError:
+        raise web.HTTPBadRequest(text="id_deputado deve ser inteiro")
+    dados = _snapshot().deputado(id_deputado)
+    if dados is None:
+        raise web.HTTPNotFound()
+    return web.json_response(dados, dumps=lambda d: json.dumps(d, ensure_ascii=False, default=str))
+
+
+async def _abrir(app):
+    inicio = time.perf_counter()
+    abrir_snapshot()
+    app["segundos_abertura"] = round(time.perf_counter() - inicio, 4)
+
+
+def criar_app() -> web.Application:
+    app = web.Application()
+    app.on_startup.append(_abrir)
+    app.router.add_get("/saude", saude)
+    app.router.add_get("/gastos", gastos)
+    app.router.add_get("/deputados/{id_deputado}", deputado)
+    return app
+
+
+if __name__ == "__main__":
+    web.run_app(criar_app(), host=HOST, port=PORTA)
@@ -0,0 +1,13 @@
+# dashboard/settings.py
+#
+# Configuração do servidor do dashboard. Os dados vêm do snapshot mapeado em
+# memória (legisdata.snapshot), gerado pelo `processar`; os diretórios seguem
+# legisdata/config.py (LEGISDATA_DIRETORIO_DADOS).
+
+import os
+
+HOST = os.environ.get("DASHBOARD_HOST", "127.0.0.1")
+PORTA = int(os.environ.get("DASHBOARD_PORTA", "8050"))
+
+# Linhas máximas devolvidas por uma consulta de gastos
+MAX_LINHAS_RESPOSTA = 50_000
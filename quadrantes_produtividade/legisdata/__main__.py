@@ -0,0 +1,7 @@
+# legisdata/__main__.py
+
+import sys
+
+from legisdata.cli import main
+
+sys.exit(main())
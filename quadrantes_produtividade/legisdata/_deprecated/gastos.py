@@ -1,7 +1,6 @@
 import os
 import pandas as pd
 import requests
-from datetime import datetime, date
 from io import StringIO
 import wget
 import zipfile
@@ -14,41 +13,7 @@ from legisdata.config import (
     ITENS_POR_PAGINA,
     ANO_ATUAL
 )
-
-CHECKPOINT_FILE = os.path.join("checkpoints", "gastos.csv")
-
-
-# =======================
-# 🔁 Checkpoint Management
-# =======================
-
-def carregar_checkpoint():
-    if os.path.exists(CHECKPOINT_FILE):
-        return pd.read_csv(CHECKPOINT_FILE)
-    else:
-        return pd.DataFrame(columns=["id_deputado", "ano", "mes", "coletado_em"])
-
-
-def atualizar_checkpoint(id_dep, ano, mes):
-    df = carregar_checkpoint()
-    nova_linha = pd.DataFrame([{
-        "id_deputado": id_dep,
-        "ano": ano,
-        "mes": mes,
-        "coletado_em": datetime.now().isoformat()
-    }])
-    df_atualizado = pd.concat([df, nova_linha], ignore_index=True)
-    os.makedirs("checkpoints", exist_ok=True)
-    df_atualizado.to_csv(CHECKPOINT_FILE, index=False)
-
-
-def registro_existe(id_dep, ano, mes, checkpoint_df):
-    cond = (
-        (checkpoint_df["id_deputado"] == id_dep) &
-        (checkpoint_df["ano"] == ano) &
-        (checkpoint_df["mes"] == mes)
-    )
-    return not checkpoint_df[cond].empty
+from legisdata.coleta.checkpoint import obter_checkpoint_despesas
 
 
 # =======================
@@ -84,33 +49,23 @@ def salvar_gastos(df, id_dep, ano):
     os.makedirs(caminho, exist_ok=True)
     arquivo = os.path.join(caminho, f"{id_dep}.csv")
 
-    if os.path.exists(arquivo):
-        df_antigo = pd.read_csv(arquivo)
-        df_total = pd.concat([df_antigo, df], ignore_index=True)
-    else:
-        df_total = df
-
-    df_total.to_csv(arquivo, index=False, encoding="utf-8-sig")
+    # Acrescenta ao final do arquivo em vez de reler e reescrever tudo.
+    novo = not os.path.exists(arquivo)
+    df.to_csv(
+        arquivo,
+        mode="w" if novo else "a",
+        header=novo,
+        index=False,
+        encoding="utf-8-sig" if novo else "utf-8",
+    )
 
 
 def consolidar_gastos_ano_atual(lista_ids, ano=ANO_ATUAL):
-    print(f"🚀 Coletando gastos parlamentares do ano {ano} (mês a mês)...")
-    checkpoint = carregar_checkpoint()
-    mes_atual = date.today().month
+    # Coleta assíncrona (pool de conexões, limite de taxa e páginas em
+    # paralelo); grava em data/processed/despesas_api e atualiza o checkpoint.
+    from legisdata.coleta.coletor_despesas_api import ColetorDespesasAPI
 
-    for id_dep in lista_ids:
-        for mes in range(1, mes_atual + 1):
-            if registro_existe(id_dep, ano, mes, checkpoint):
-                print(f"⏭️  {id_dep} {ano}/{mes:02d} já coletado.")
-                continue
-
-            df = coletar_despesas_mensais(id_dep, ano, mes)
-            if not df.empty:
-                salvar_gastos(df, id_dep, ano)
-                atualizar_checkpoint(id_dep, ano, mes)
-                print(f"✅ {id_dep} {ano}/{mes:02d}: {len(df)} registros.")
-            else:
-                print(f"⚠️  {id_dep} {ano}/{mes:02d}: Nenhuma despesa encontrada.")
+    return ColetorDespesasAPI().coletar(lista_ids, ano)
 
 
 # =======================
@@ -174,8 +129,8 @@ def consolidar_gastos_historicos(ano: int):
         print(f"⚠️ Nenhum dado salvo para o ano {ano}.")
         return
 
-    # Normalização
-    df = df.rename(columns={"txtNumero": "id_deputado", "numMes": "mes"})
+    # Normalização (txtNumero é o número do documento; o deputado é ideCadastro)
+    df = df.rename(columns={"ideCadastro": "id_deputado", "numMes": "mes"})
 
     if "id_deputado" not in df.columns or "mes" not in df.columns:
         print("❌ Dados não contêm colunas 'id_deputado' e 'mes'.")
@@ -187,16 +142,11 @@ def consolidar_gastos_historicos(ano: int):
     df.to_csv(caminho, index=False, encoding="utf-8-sig")
     print(f"💾 Dados de {ano} salvos em: {caminho}")
 
-    # Atualiza checkpoint
-    checkpoint = carregar_checkpoint()
-    novos_registros = 0
-
-    for _, linha in df[["id_deputado", "mes"]].drop_duplicates().iterrows():
-        id_dep = linha["id_deputado"]
-        mes = int(linha["mes"])
-        if not registro_existe(id_dep, ano, mes, checkpoint):
-            atualizar_checkpoint(id_dep, ano, mes)
-            novos_registros += 1
+    # Atualiza checkpoint: diferença contra o índice e uma única escrita em lote
+    pares = df[["id_deputado", "mes"]].dropna().drop_duplicates()
+    novos_registros = obter_checkpoint_despesas().registrar_lote(
+        zip(pares["id_deputado"], [ano] * len(pares), pares["mes"])
+    )
 
     print(f"📌 {novos_registros} entradas de checkpoint adicionadas para {ano}.")
 
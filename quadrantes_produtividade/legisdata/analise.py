@@ -0,0 +1,342 @@
+# legisdata/analise.py
+#
+# Cubo de gastos da CEAP pré-agregado por deputado × ano × mês × categoria ×
+# partido × UF, com soma, contagem e máximo de vlrLiquido. É construído por
+# ano a partir do Parquet processado (só os anos cuja partição mudou) e
+# responde recortes e totais sem reler as linhas de despesa.
+#
+# Quando as linhas são necessárias, `ler_gastos` lê só o recorte pedido: ano
+# e mês escolhem os diretórios de partição (ano=<ano>/mes=<mês>), deputado,
+# partido, UF e categoria descartam grupos de linhas pelas estatísticas do
+# Parquet, e só as colunas pedidas saem do disco.
+
+import json
+import os
+import threading
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from legisdata.cache import chave_cache, obter_cache, versoes_particoes
+from legisdata.config import DIRETORIO_PROCESSED, COMPRESSAO_PARQUET
+from legisdata.delta import digestos_meses
+from legisdata.dimensao import CHAVE
+from legisdata.esquemas import ESQUEMAS
+from legisdata.manifesto import obter_manifesto
+from legisdata.metricas import medir
+from legisdata.processamento import ESTAGIO_PARQUET, caminho_processado, tamanho_processado
+
+TIPO_CUBO = "cubo_gastos"
+ESTAGIO_CUBO = "cubo"
+
+# Coluna do Parquet de gastos -> dimensão do cubo (o ano vem da partição).
+# O deputado é a chave int32 da dimensão; nomes e ids vêm de lá na exibição.
+DIMENSOES = {
+    CHAVE: CHAVE,
+    "numMes": "mes",
+    "txtDescricao": "categoria",
+    "sgPartido": "partido",
+    "sgUF": "uf",
+}
+
+# Medida do cubo -> (função de agregação nas linhas, função para reagregar).
+MEDIDAS = {
+    "total": ("sum", "sum"),
+    "quantidade": ("count", "sum"),
+    "maximo": ("max", "max"),
+}
+
+
+# Filtro de ler_gastos -> coluna do Parquet de gastos.
+FILTROS_GASTOS = {
+    "deputado": CHAVE,
+    "partido": "sgPartido",
+    "uf": "sgUF",
+    "categoria": "txtDescricao",
+}
+
+
+def _lista(valor):
+    if valor is None:
+        return None
+    return list(valor) if isinstance(valor, (list, tuple, set, frozenset, range)) else [valor]
+
+
+def _arquivos_particoes(tipo: str, anos=None, meses=None) -> list:
+    """
+    Arquivos Parquet de `tipo` nos anos (e meses, nos tipos particionados por
+    mês) pedidos. O recorte é feito listando os diretórios ano=/mes=; os
+    arquivos de fora nem são abertos.
+    """
+    raiz = os.path.join(DIRETORIO_PROCESSED, tipo)
+    if not os.path.isdir(raiz):
+        return []
+    anos = {str(a) for a in anos} if anos is not None else None
+    meses = {str(m) for m in meses} if meses is not None else None
+
+    arquivos = []
+    for nome in sorted(os.listdir(raiz)):
+        if not nome.startswith("ano=") or (anos is not None and nome.removeprefix("ano=") not in anos):
+            continue
+        diretorio = os.path.join(raiz, nome)
+        if os.path.isfile(os.path.join(diretorio, "dados.parquet")):
+            arquivos.append(os.path.join(diretorio, "dados.parquet"))
+            continue
+        for mes in sorted(os.listdir(diretorio)):
+            caminho = os.path.join(diretorio, mes, "dados.parquet")
+            if (mes.startswith("mes=") and (meses is None or mes.removeprefix("mes=") in meses)
+                    and os.path.isfile(caminho)):
+                arquivos.append(caminho)
+    return arquivos
+
+
+def ler_processado(tipo: str, colunas=None, anos=None, meses=None, filtro=None) -> pa.Table:
+    """
+    Lê o Parquet processado de `tipo` como uma tabela Arrow, com as colunas
+    de partição `ano` (e `mes`). `anos` e `meses` podam diretórios; `filtro`
+    (expressão de pyarrow.dataset) é avaliado por grupo de linhas, pulando os
+    que as estatísticas descartam.
+    """
+    import pyarrow.dataset as ds  # carrega pandas; só necessário nas consultas
+
+    arquivos = _arquivos_particoes(tipo, anos, meses)
+    if not arquivos:
+        return pa.table({nome: pa.array([], pa.null()) for nome in colunas or []})
+
+    campos = [pa.field("ano", pa.int16())]
+    if ESQUEMAS.get(tipo, {}).get("particionar_mes"):
+        campos.append(pa.field("mes", pa.int8()))
+    dataset = ds.dataset(
+        arquivos, format="parquet",
+        partitioning=ds.partitioning(pa.schema(campos), flavor="hive"),
+        partition_base_dir=os.path.join(DIRETORIO_PROCESSED, tipo),
+    )
+    return dataset.to_table(columns=list(colunas) if colunas is not None else None, filter=filtro)
+
+
+def ler_gastos(colunas=None, ano=None, mes=None, trimestre=None, deputado=None, partido=None,
+               uf=None, categoria=None, como_pandas: bool = True):
+    """
+    Linhas de despesa da CEAP no recorte pedido. Cada filtro aceita um valor
+    ou uma lista de valores; `trimestre` (1 a 4) vira os meses
+    correspondentes. `deputado` é a chave da dimensão de deputados.
+
+    Exemplo: gastos dos deputados de SP no 1º trimestre de 2024 ->
+        ler_gastos([CHAVE, "txtDescricao", "vlrLiquido"], ano=2024, trimestre=1, uf="SP")
+    """
+    import pyarrow.dataset as ds
+
+    meses = _lista(mes)
+    if trimestre is not None:
+        do_trimestre = [m for t in _lista(trimestre) for m in range(3 * int(t) - 2, 3 * int(t) + 1)]
+        meses = do_trimestre if meses is None else [m for m in meses if int(m) in do_trimestre]
+
+    filtro = None
+    valores = {"deputado": deputado, "partido": partido, "uf": uf, "categoria": categoria}
+    for nome, valor in valores.items():
+        if valor is None:
+            continue
+        expressao = ds.field(FILTROS_GASTOS[nome]).isin(_lista(valor))
+        filtro = expressao if filtro is None else filtro & expressao
+
+    tabela = ler_processado("gastos", colunas, anos=_lista(ano), meses=meses, filtro=filtro)
+    return tabela.to_pandas() if como_pandas else tabela
+
+
+def _agregar_ano(ano, meses=None) -> pa.Table:
+    tabela = ler_processado("gastos", [*DIMENSOES, "vlrLiquido"], anos=[ano], meses=meses)
+    # group_by não aceita chaves dicionário em todas as versões do Arrow.
+    for nome in DIMENSOES:
+        if pa.types.is_dictionary(tabela.schema.field(nome).type):
+            indice = tabela.schema.get_field_index(nome)
+            tabela = tabela.set_column(indice, nome, pc.cast(tabela.column(nome), pa.string()))
+
+    agregado = tabela.group_by(list(DIMENSOES)).aggregate(
+        [("vlrLiquido", funcao) for funcao, _ in MEDIDAS.values()]
+    )
+    nomes = {**DIMENSOES, **{f"vlrLiquido_{funcao}": medida for medida, (funcao, _) in MEDIDAS.items()}}
+    return agregado.rename_columns([nomes[n] for n in agregado.schema.names])
+
+
+def _atualizar_meses(destino: str, ano, digestos: dict):
+    """
+    Partição do cubo com só os meses cujo digesto (legisdata.delta) mudou
+    desde a última agregação reagregados, ou None se ela precisa ser refeita
+    inteira (sem cubo anterior ou sem digestos para comparar).
+    """
+    if not digestos or not os.path.exists(destino):
+        return None
+    anterior = pq.read_table(destino)
+    metadados = anterior.schema.metadata or {}
+    if b"meses" not in metadados:
+        return None
+    agregados = {int(m): d for m, d in json.loads(metadados[b"meses"]).items()}
+
+    alterados = {m for m in set(digestos) | set(agregados) if digestos.get(m) != agregados.get(m)}
+    if not alterados:
+        return anterior
+    mantidos = anterior.filter(pc.invert(pc.is_in(pc.fill_null(anterior["mes"], 0),
+                                                  value_set=pa.array(sorted(alterados), anterior["mes"].type))))
+    partes = [mantidos.replace_schema_metadata(None)]
+    presentes = [m for m in alterados if m in digestos]
+    if presentes:
+        partes.append(_agregar_ano(ano, meses=presentes).cast(partes[0].schema))
+    return pa.concat_tables(partes)
+
+
+def construir_cubo(anos=None, forcar: bool = False) -> list:
+    """
+    (Re)constrói as partições do cubo cujos gastos processados mudaram desde
+    a última construção (pela versão registrada no manifesto). Dentro do ano,
+    só os meses alterados são reagregados. Retorna os anos reconstruídos.
+    """
+    manifesto = obter_manifesto()
+    versoes = manifesto.derivados(ESTAGIO_PARQUET, "gastos")
+    anos = {str(a) for a in anos} if anos is not None else None
+
+    reconstruidos = []
+    for (_, ano), versao in sorted(versoes.items()):
+        if anos is not None and ano not in anos:
+            continue
+        destino = caminho_processado(TIPO_CUBO, ano)
+        if (not forcar and os.path.exists(destino)
+                and not manifesto.precisa_reconstruir(ESTAGIO_CUBO, TIPO_CUBO, ano, versao)):
+            continue
+
+        print(f"🧊 Agregando cubo de gastos de {ano}...")
+        with medir("cubo", TIPO_CUBO, ano) as medicao:
+            digestos = digestos_meses("gastos", ano)
+            cubo = None if forcar else _atualizar_meses(destino, ano, digestos)
+            if cubo is None:
+                cubo = _agregar_ano(ano)
+            cubo = cubo.replace_schema_metadata({"meses": json.dumps({str(m): d for m, d in digestos.items()})})
+            os.makedirs(os.path.dirname(destino), exist_ok=True)
+            pq.write_table(cubo, destino + ".part", compression=COMPRESSAO_PARQUET)
+            os.replace(destino + ".part", destino)
+            medicao.adicionar(linhas=cubo.num_rows, bytes=tamanho_processado("gastos", ano))
+        manifesto.registrar_derivado(ESTAGIO_CUBO, TIPO_CUBO, ano, versao)
+        reconstruidos.append(ano)
+
+    if reconstruidos:
+        print(f"✅ Cubo atualizado para {len(reconstruidos)} anos.")
+    return reconstruidos
+
+
+def carregar_cubo(anos=None):
+    """
+    Lê o cubo (todas as partições ou só `anos`) como DataFrame com as
+    dimensões categóricas.
+    """
+    import pyarrow.dataset as ds  # carrega pandas; só necessário nas consultas
+
+    dataset = ds.dataset(
+        os.path.join(DIRETORIO_PROCESSED, TIPO_CUBO), format="parquet", partitioning="hive"
+    )
+    filtro = ds.field("ano").isin([int(a) for a in anos]) if anos is not None else None
+    cubo = dataset.to_table(filter=filtro).to_pandas()
+    for nome in ("categoria", "partido", "uf"):
+        cubo[nome] = cubo[nome].astype("category")
+    return cubo
+
+
+class CuboGastos:
+    """
+    Consultas sobre o cubo carregado em memória. Os filtros são aplicados
+    como máscaras vetorizadas e os totais reagregados a partir das medidas
+    do cubo, não das linhas de despesa.
+    """
+
+    def __init__(self, cubo=None, anos=None):
+        self.cubo = cubo if cubo is not None else carregar_cubo(anos)
+
+    def _filtrar(self, filtros):
+        if not filtros:
+            return self.cubo
+        mascara = np.ones(len(self.cubo), dtype=bool)
+        for coluna, valor in filtros.items():
+            if isinstance(valor, (list, tuple, set, frozenset, range)):
+                mascara &= self.cubo[coluna].isin(list(valor)).to_numpy()
+            else:
+                mascara &= (self.cubo[coluna] == valor).to_numpy()
+        return self.cubo[mascara]
+
+    def consultar(self, por=("ano",), filtros: dict = None, medidas=tuple(MEDIDAS)):
+        """
+        Recorta o cubo por `filtros` ({dimensão: valor ou lista de valores})
+        e reagrega as `medidas` por `por`. Sem `por`, devolve o total geral.
+        Inclui a média (total / quantidade) quando as duas são pedidas.
+
+        Exemplo: gastos por categoria do PT em 2024 ->
+            consultar(por=["categoria"], filtros={"partido": "PT", "ano": 2024})
+        """
+        por, medidas = list(por), list(medidas)
+        recorte = self._filtrar(filtros)
+        agregacoes = {m: MEDIDAS[m][1] for m in medidas}
+
+        if por:
+            resultado = recorte.groupby(por, observed=True)[medidas].agg(agregacoes).reset_index()
+        else:
+            resultado = recorte[medidas].agg(agregacoes).to_frame().T
+
+        if "total" in medidas and "quantidade" in medidas:
+            resultado["media"] = resultado["total"] / resultado["quantidade"]
+        return resultado
+
+    def ranking(self, grupo=(), n: int = 10, filtros: dict = None, medida: str = "total",
+                item: str = CHAVE):
+        """
+        Os `n` maiores `item` pela `medida` dentro de cada `grupo`.
+
+        Exemplo: maiores gastadores por UF e mês ->
+            ranking(grupo=["uf", "mes"], n=5)
+        """
+        grupo = list(grupo)
+        agregado = self.consultar(por=[*grupo, item], filtros=filtros, medidas=[medida])
+        agregado = agregado.sort_values(medida, ascending=False, kind="stable")
+        if grupo:
+            agregado = agregado.groupby(grupo, observed=True, sort=False).head(n)
+            return agregado.sort_values([*grupo, medida], ascending=[True] * len(grupo) + [False])
+        return agregado.head(n)
+
+
+# Cubo compartilhado pelas consultas do processo, recarregado quando alguma
+# partição muda de versão no manifesto.
+_cubo = (None, None)
+_cubo_lock = threading.Lock()
+
+
+def obter_cubo() -> CuboGastos:
+    global _cubo
+    versao = versoes_particoes(ESTAGIO_CUBO, TIPO_CUBO)
+    with _cubo_lock:
+        if _cubo[0] != versao:
+            _cubo = (versao, CuboGastos())
+        return _cubo[1]
+
+
+def _anos_consultados(filtros):
+    return _lista((filtros or {}).get("ano"))
+
+
+def consultar_gastos(por=("ano",), filtros: dict = None, medidas=tuple(MEDIDAS)):
+    """
+    CuboGastos.consultar com cache. A chave inclui a versão só dos anos
+    filtrados, então reprocessar um ano não invalida consultas de outros.
+    O DataFrame devolvido é compartilhado: não altere.
+    """
+    versao = versoes_particoes(ESTAGIO_CUBO, TIPO_CUBO, _anos_consultados(filtros))
+    chave = chave_cache("consultar", {"por": por, "filtros": filtros, "medidas": medidas}, versao)
+    return obter_cache().obter(chave, lambda: obter_cubo().consultar(por, filtros, medidas))
+
+
+def ranking_gastos(grupo=(), n: int = 10, filtros: dict = None, medida: str = "total",
+                   item: str = CHAVE):
+    """
+    CuboGastos.ranking com cache (mesmas regras de consultar_gastos).
+    """
+    versao = versoes_particoes(ESTAGIO_CUBO, TIPO_CUBO, _anos_consultados(filtros))
+    parametros = {"grupo": grupo, "n": n, "filtros": filtros, "medida": medida, "item": item}
+    chave = chave_cache("ranking", parametros, versao)
+    return obter_cache().obter(chave, lambda: obter_cubo().ranking(grupo, n, filtros, medida, item))
@@ -0,0 +1,204 @@
+# legisdata/cache.py
+#
+# Cache de resultados de consultas entre o dashboard e legisdata.analise.
+# A chave combina os parâmetros da consulta com a versão (hash registrado no
+# manifesto) de cada partição lida; quando um ano é baixado de novo e
+# reprocessado, só as entradas que dependem daquele ano deixam de bater.
+
+import hashlib
+import os
+import pickle
+import sys
+import tempfile
+import threading
+from collections import OrderedDict
+
+from legisdata.config import (
+    MAX_ENTRADAS_CACHE_CONSULTAS,
+    MAX_BYTES_CACHE_CONSULTAS,
+    DIRETORIO_CACHE_CONSULTAS,
+    MAX_BYTES_CACHE_DISCO,
+)
+from legisdata.manifesto import obter_manifesto
+
+# Fração do limite do cache em disco que sobra depois de uma limpeza.
+FRACAO_APOS_LIMPEZA = 0.9
+
+
+def versoes_particoes(estagio: str, tipo: str, anos=None) -> tuple:
+    """
+    ((ano, hash), ...) das partições de (estagio, tipo) no manifesto,
+    opcionalmente só dos `anos` informados.
+    """
+    versoes = obter_manifesto().derivados(estagio, tipo)
+    anos = {str(a) for a in anos} if anos is not None else None
+    return tuple(sorted(
+        (ano, hash_entrada) for (_, ano), hash_entrada in versoes.items()
+        if anos is None or ano in anos
+    ))
+
+
+def chave_cache(nome: str, parametros, versao) -> str:
+    """
+    Chave estável (entre processos) para a consulta `nome` com `parametros`
+    sobre os dados na `versao` informada.
+    """
+    conteudo = repr((nome, _normalizar(parametros), versao)).encode()
+    return hashlib.blake2b(conteudo, digest_size=20).hexdigest()
+
+
+def _normalizar(valor):
+    # dicts, sets e ranges viram tuplas ordenadas: a mesma consulta escrita
+    # de formas diferentes cai na mesma chave.
+    if isinstance(valor, dict):
+        return tuple(sorted((str(k), _normalizar(v)) for k, v in valor.items()))
+    if isinstance(valor, (set, frozenset)):
+        return tuple(sorted(_normalizar(v) for v in valor))
+    if isinstance(valor, (list, tuple, range)):
+        return tuple(_normalizar(v) for v in valor)
+    if hasattr(valor, "item"):  # escalares NumPy
+        return valor.item()
+    return valor
+
+
+def _tamanho(valor) -> int:
+    if hasattr(valor, "memory_usage"):
+        uso = valor.memory_usage(deep=True)
+        return int(uso.sum() if hasattr(uso, "sum") else uso)
+    return sys.getsizeof(valor)
+
+
+class CacheConsultas:
+    """
+    LRU em memória limitado por número de entradas e por bytes, com um
+    segundo nível opcional em disco (um pickle por chave, gravado de forma
+    atômica) que os processos do dashboard compartilham.
+    """
+
+    def __init__(self, max_entradas: int = MAX_ENTRADAS_CACHE_CONSULTAS,
+                 max_bytes: int = MAX_BYTES_CACHE_CONSULTAS,
+                 diretorio: str = DIRETORIO_CACHE_CONSULTAS,
+                 max_bytes_disco: int = MAX_BYTES_CACHE_DISCO):
+        self.max_entradas = max_entradas
+        self.max_bytes = max_bytes
+        self.diretorio = diretorio
+        self.max_bytes_disco = max_bytes_disco
+        # Estimativa dos bytes em disco: varrida na primeira gravação do
+        # processo e depois só somada, até passar do limite.
+        self._bytes_disco = None
+        self._entradas = OrderedDict()  # chave -> (valor, tamanho)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.acertos = 0
+        self.falhas = 0
+        if diretorio:
+            os.makedirs(diretorio, exist_ok=True)
+
+    def obter(self, chave: str, calcular):
+        """
+        Devolve o valor em cache para `chave`; se não houver, chama
+        `calcular()`, guarda o resultado e o devolve.
+        """
+        with self._lock:
+            if chave in self._entradas:
+                self._entradas.move_to_end(chave)
+                self.acertos += 1
+                return self._entradas[chave][0]
+
+        valor = self._ler_disco(chave)
+        if valor is None:
+            with self._lock:
+                self.falhas += 1
+            valor = calcular()
+            self._gravar_disco(chave, valor)
+        else:
+            with self._lock:
+                self.acertos += 1
+
+        self._guardar(chave, valor)
+        return valor
+
+    def _guardar(self, chave: str, valor):
+        tamanho = _tamanho(valor)
+        if tamanho > self.max_bytes:
+            return
+        with self._lock:
+            if chave in self._entradas:
+                self._bytes -= self._entradas.pop(chave)[1]
+            self._entradas[chave] = (valor, tamanho)
+            self._bytes += tamanho
+            while len(self._entradas) > self.max_entradas or self._bytes > self.max_bytes:
+                _, (_, removido) = self._entradas.popitem(last=False)
+                self._bytes -= removido
+
+    def _caminho(self, chave: str) -> str:
+        return os.path.join(self.diretorio, f"{chave}.pkl")
+
+    def _ler_disco(self, chave: str):
+        if not self.diretorio:
+            return None
+        try:
+            with open(self._caminho(chave), "rb") as f:
+                valor = pickle.load(f)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            return None
+        os.utime(self._caminho(chave))  # marca o uso para a limpeza por idade
+        return valor
+
+    def _gravar_disco(self, chave: str, valor):
+        if not self.diretorio:
+            return
+        descritor, temporario = tempfile.mkstemp(dir=self.diretorio, suffix=".tmp")
+        with os.fdopen(descritor, "wb") as f:
+            pickle.dump(valor, f, protocol=pickle.HIGHEST_PROTOCOL)
+            tamanho = f.tell()
+        os.replace(temporario, self._caminho(chave))
+
+        with self._lock:
+            if self._bytes_disco is not None:
+                self._bytes_disco += tamanho
+            varrer = self._bytes_disco is None or self._bytes_disco > self.max_bytes_disco
+        if varrer:
+            self._limpar_disco()
+
+    def _limpar_disco(self):
+        # Varre o diretório e remove os arquivos usados há mais tempo até
+        # ficar abaixo de FRACAO_APOS_LIMPEZA do limite, para a próxima
+        # varredura demorar a vir. Entradas de versões antigas nunca mais são
+        # lidas e saem primeiro. A estimativa não vê as gravações dos outros
+        # processos; cada um varre quando a sua passa do limite.
+        arquivos = []
+        for entrada in os.scandir(self.diretorio):
+            if entrada.name.endswith(".pkl"):
+                estado = entrada.stat()
+                arquivos.append((estado.st_mtime, estado.st_size, entrada.path))
+        total = sum(tamanho for _, tamanho, _ in arquivos)
+        if total > self.max_bytes_disco:
+            alvo = self.max_bytes_disco * FRACAO_APOS_LIMPEZA
+            for _, tamanho, caminho in sorted(arquivos):
+                if total <= alvo:
+                    break
+                try:
+                    os.remove(caminho)
+                except FileNotFoundError:
+                    pass
+                total -= tamanho
+        with self._lock:
+            self._bytes_disco = total
+
+    def limpar(self):
+        with self._lock:
+            self._entradas.clear()
+            self._bytes = 0
+
+
+_instancia = None
+_instancia_lock = threading.Lock()
+
+
+def obter_cache() -> CacheConsultas:
+    global _instancia
+    with _instancia_lock:
+        if _instancia is None:
+            _instancia = CacheConsultas()
+        return _instancia
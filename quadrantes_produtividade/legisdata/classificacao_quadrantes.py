@@ -0,0 +1,301 @@
+# legisdata/classificacao_quadrantes.py
+#
+# Classificação dos deputados em quadrantes produtividade × gasto.
+#
+# Todo o cálculo é feito em lote com NumPy: normalização por grupo
+# (ano ou legislatura), pontos de corte por percentil e atribuição de
+# quadrante para todos os deputados de uma vez. `avaliar_cenarios`
+# vetoriza também sobre pesos e percentis, para análises de sensibilidade.
+
+import os
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from legisdata.config import DIRETORIO_PROCESSED
+
+QUADRANTES = {
+    1: "Alta produtividade / Baixo gasto",
+    2: "Alta produtividade / Alto gasto",
+    3: "Baixa produtividade / Baixo gasto",
+    4: "Baixa produtividade / Alto gasto",
+}
+
+NORMALIZACOES = ("percentil", "zscore", "minmax")
+
+
+def legislatura_do_ano(ano):
+    """
+    Número da legislatura a que pertence cada ano (57ª = 2023-2026).
+    Aceita escalares ou arrays.
+    """
+    return (np.asarray(ano) - 1999) // 4 + 51
+
+
+@dataclass
+class MatrizIndicadores:
+    """
+    Indicadores alinhados por linha (um deputado em um período).
+
+    `producao` tem uma coluna por indicador de produtividade; `gasto` é o
+    total da CEAP; `grupos` são códigos densos (0..G-1) do recorte dentro
+    do qual a normalização e os cortes são calculados.
+    """
+    chaves: pd.DataFrame
+    producao: np.ndarray
+    nomes_producao: list
+    gasto: np.ndarray
+    grupos: np.ndarray
+    n_grupos: int
+
+
+def montar_matriz(indicadores: pd.DataFrame, colunas_producao, coluna_gasto: str = "gasto",
+                  grupo="ano", chaves=("chave_deputado", "ano")) -> MatrizIndicadores:
+    """
+    Converte um DataFrame de indicadores (uma linha por deputado e período)
+    na matriz usada pelo classificador. Valores ausentes viram zero.
+    `grupo` pode ser uma coluna, uma lista de colunas ou "legislatura".
+    """
+    colunas_producao = list(colunas_producao)
+    df = indicadores.reset_index(drop=True)
+
+    if grupo == "legislatura" and "legislatura" not in df.columns:
+        df = df.assign(legislatura=legislatura_do_ano(df["ano"].to_numpy()))
+    colunas_grupo = [grupo] if isinstance(grupo, str) else list(grupo)
+
+    codigos = df.groupby(colunas_grupo, sort=True, observed=True).ngroup().to_numpy()
+    producao = df[colunas_producao].fillna(0).to_numpy(dtype=np.float64)
+    gasto = df[coluna_gasto].fillna(0).to_numpy(dtype=np.float64)
+
+    return MatrizIndicadores(
+        chaves=df[list(dict.fromkeys([*chaves, *colunas_grupo]))],
+        producao=producao,
+        nomes_producao=colunas_producao,
+        gasto=gasto,
+        grupos=codigos.astype(np.int64),
+        n_grupos=int(codigos.max()) + 1 if len(codigos) else 0,
+    )
+
+
+def _ordenar_por_grupo(valores: np.ndarray, grupos: np.ndarray):
+    """
+    Ordena `valores` (..., n) dentro de cada grupo ao longo do último eixo.
+    Retorna (ordem, inicio_do_grupo, tamanho_do_grupo).
+    """
+    # Desloca cada grupo para uma faixa própria: um único argsort ordena por
+    # (grupo, valor), bem mais rápido que lexsort em matrizes (S, n).
+    amplitude = float(valores.max() - valores.min()) + 1.0 if valores.size else 1.0
+    ordem = np.argsort(valores + grupos * amplitude, axis=-1, kind="stable")
+    tamanhos = np.bincount(grupos)
+    inicios = np.concatenate(([0], np.cumsum(tamanhos)[:-1]))
+    return ordem, inicios, tamanhos
+
+
+def _postos_medios(valores: np.ndarray, grupos: np.ndarray) -> np.ndarray:
+    """
+    Posto percentual (0..1) de cada valor dentro do seu grupo, com empates
+    recebendo o posto médio. `valores` tem forma (n,) ou (S, n).
+    """
+    valores2d = np.atleast_2d(valores)
+    linhas, n = valores2d.shape
+    ordem, inicios, tamanhos = _ordenar_por_grupo(valores2d, grupos)
+
+    ordenados = np.take_along_axis(valores2d, ordem, axis=-1)
+    grupos_ordenados = grupos[ordem]
+    posicao = np.arange(n) - inicios[grupos_ordenados]
+
+    # Sequências de valores iguais no mesmo grupo recebem a média das posições.
+    quebra = np.ones_like(ordenados, dtype=bool)
+    quebra[:, 1:] = (ordenados[:, 1:] != ordenados[:, :-1]) | (grupos_ordenados[:, 1:] != grupos_ordenados[:, :-1])
+    sequencia = np.cumsum(quebra.ravel()) - 1
+    media = np.bincount(sequencia, weights=posicao.ravel()) / np.bincount(sequencia)
+    posto = media[sequencia].reshape(linhas, n)
+
+    denominador = np.maximum(tamanhos[grupos_ordenados] - 1, 1)
+    resultado = np.empty_like(valores2d)
+    np.put_along_axis(resultado, ordem, posto / denominador, axis=-1)
+    return resultado.reshape(np.shape(valores))
+
+
+def normalizar_por_grupo(valores: np.ndarray, grupos: np.ndarray, metodo: str = "percentil") -> np.ndarray:
+    """
+    Normaliza cada coluna de `valores` (n,) ou (n, k) dentro do seu grupo.
+    """
+    if metodo not in NORMALIZACOES:
+        raise ValueError(f"Normalização inválida: {metodo!r}")
+
+    valores = np.asarray(valores, dtype=np.float64)
+    matriz = valores.reshape(len(valores), -1).T  # (k, n)
+    n_grupos = int(grupos.max()) + 1 if len(grupos) else 0
+
+    if metodo == "percentil":
+        normalizado = _postos_medios(matriz, grupos)
+    else:
+        contagem = np.bincount(grupos, minlength=n_grupos)
+        soma = np.stack([np.bincount(grupos, weights=col, minlength=n_grupos) for col in matriz])
+        if metodo == "zscore":
+            media = soma / np.maximum(contagem, 1)
+            quadrados = np.stack([np.bincount(grupos, weights=col ** 2, minlength=n_grupos) for col in matriz])
+            desvio = np.sqrt(np.maximum(quadrados / np.maximum(contagem, 1) - media ** 2, 0))
+            normalizado = (matriz - media[:, grupos]) / np.where(desvio > 0, desvio, 1)[:, grupos]
+        else:
+            minimo = np.full((len(matriz), n_grupos), np.inf)
+            maximo = np.full((len(matriz), n_grupos), -np.inf)
+            for i, col in enumerate(matriz):
+                np.minimum.at(minimo[i], grupos, col)
+                np.maximum.at(maximo[i], grupos, col)
+            amplitude = maximo - minimo
+            normalizado = (matriz - minimo[:, grupos]) / np.where(amplitude > 0, amplitude, 1)[:, grupos]
+
+    return normalizado.T.reshape(valores.shape)
+
+
+def cortes_por_grupo(valores: np.ndarray, grupos: np.ndarray, percentis) -> np.ndarray:
+    """
+    Pontos de corte por grupo com interpolação linear (como np.percentile).
+
+    `valores` tem forma (n,) ou (S, n) e `percentis` forma (S,) ou escalar;
+    o resultado tem forma (S, G) — um corte por cenário e grupo.
+    """
+    valores2d = np.atleast_2d(np.asarray(valores, dtype=np.float64))
+    percentis = np.atleast_1d(np.asarray(percentis, dtype=np.float64)) / 100.0
+
+    ordem, inicios, tamanhos = _ordenar_por_grupo(valores2d, grupos)
+    ordenados = np.take_along_axis(valores2d, ordem, axis=-1)
+
+    posicao = inicios[None, :] + percentis[:, None] * (tamanhos[None, :] - 1)
+    abaixo = np.floor(posicao).astype(np.int64)
+    acima = np.minimum(abaixo + 1, (inicios + tamanhos - 1)[None, :])
+    fracao = posicao - abaixo
+
+    inferior = np.take_along_axis(ordenados, abaixo, axis=-1)
+    superior = np.take_along_axis(ordenados, acima, axis=-1)
+    return inferior + (superior - inferior) * fracao
+
+
+def _normalizar_pesos(pesos, k: int) -> np.ndarray:
+    pesos = np.ones(k) if pesos is None else np.asarray(pesos, dtype=np.float64)
+    pesos = np.atleast_2d(pesos)
+    if pesos.shape[1] != k:
+        raise ValueError(f"Esperados {k} pesos por cenário, recebidos {pesos.shape[1]}.")
+    return pesos / pesos.sum(axis=1, keepdims=True)
+
+
+def avaliar_cenarios(matriz: MatrizIndicadores, pesos=None, percentis_producao=50, percentis_gasto=50,
+                     normalizacao: str = "percentil") -> np.ndarray:
+    """
+    Classifica todos os deputados em S cenários de uma só vez.
+
+    `pesos` tem forma (S, k) (ou (k,)); `percentis_producao` e
+    `percentis_gasto` têm forma (S,) ou são escalares. Retorna uma matriz
+    (S, n) de quadrantes (1 a 4, ver QUADRANTES).
+
+    Os cortes são assimétricos de propósito: produção alta é score >= corte
+    e gasto alto é gasto > corte. Quem fica exatamente no corte (a mediana
+    de um grupo ímpar, empates) conta como alta produtividade e baixo gasto,
+    ou seja, o empate favorece o deputado nos dois eixos.
+    """
+    k = matriz.producao.shape[1]
+    pesos = _normalizar_pesos(pesos, k)
+    p_prod = np.atleast_1d(np.asarray(percentis_producao, dtype=np.float64))
+    p_gasto = np.atleast_1d(np.asarray(percentis_gasto, dtype=np.float64))
+    n_cenarios = max(len(pesos), len(p_prod), len(p_gasto))
+
+    pesos = np.broadcast_to(pesos, (n_cenarios, k))
+    p_prod = np.broadcast_to(p_prod, (n_cenarios,))
+    p_gasto = np.broadcast_to(p_gasto, (n_cenarios,))
+
+    normalizado = normalizar_por_grupo(matriz.producao, matriz.grupos, normalizacao)  # (n, k)
+    score = pesos @ normalizado.T  # (S, n)
+
+    corte_prod = cortes_por_grupo(score, matriz.grupos, p_prod)  # (S, G)
+    corte_gasto = cortes_por_grupo(matriz.gasto, matriz.grupos, p_gasto)  # (S, G)
+
+    # Empate no corte: alta produtividade e baixo gasto (ver docstring).
+    alta_producao = score >= corte_prod[:, matriz.grupos]
+    alto_gasto = matriz.gasto[None, :] > corte_gasto[:, matriz.grupos]
+    return (1 + 2 * (~alta_producao) + alto_gasto).astype(np.int8)
+
+
+def classificar(matriz: MatrizIndicadores, pesos=None, percentil_producao: float = 50,
+                percentil_gasto: float = 50, normalizacao: str = "percentil") -> pd.DataFrame:
+    """
+    Classificação de um único cenário, com scores e cortes por linha.
+    """
+    pesos_norm = _normalizar_pesos(pesos, matriz.producao.shape[1])[0]
+    normalizado = normalizar_por_grupo(matriz.producao, matriz.grupos, normalizacao)
+    score = normalizado @ pesos_norm
+
+    corte_prod = cortes_por_grupo(score, matriz.grupos, percentil_producao)[0]
+    corte_gasto = cortes_por_grupo(matriz.gasto, matriz.grupos, percentil_gasto)[0]
+    quadrante = avaliar_cenarios(
+        matriz, pesos_norm, percentil_producao, percentil_gasto, normalizacao
+    )[0]
+
+    resultado = matriz.chaves.copy()
+    resultado["score_producao"] = score
+    resultado["gasto"] = matriz.gasto
+    resultado["corte_producao"] = corte_prod[matriz.grupos]
+    resultado["corte_gasto"] = corte_gasto[matriz.grupos]
+    resultado["quadrante"] = quadrante
+    resultado["descricao_quadrante"] = pd.Categorical.from_codes(
+        quadrante - 1, categories=[QUADRANTES[q] for q in sorted(QUADRANTES)]
+    )
+    return resultado
+
+
+def carregar_gastos_anuais(anos=None) -> pd.DataFrame:
+    """
+    Total anual da CEAP por deputado a partir do Parquet processado.
+    Linhas sem deputado identificado (lideranças) são descartadas.
+    """
+    import pyarrow.dataset as ds
+
+    dataset = ds.dataset(
+        os.path.join(DIRETORIO_PROCESSED, "gastos"), format="parquet", partitioning="hive"
+    )
+    filtro = ds.field("chave_deputado").is_valid()
+    if anos is not None:
+        filtro = filtro & ds.field("ano").isin([int(a) for a in anos])
+
+    tabela = dataset.to_table(columns=["chave_deputado", "ano", "vlrLiquido"], filter=filtro)
+    agregado = tabela.group_by(["chave_deputado", "ano"]).aggregate([("vlrLiquido", "sum")])
+    return agregado.to_pandas().rename(columns={"vlrLiquido_sum": "gasto"})
+
+
+def montar_indicadores(gastos: pd.DataFrame, *producao: pd.DataFrame) -> pd.DataFrame:
+    """
+    Junta os gastos anuais com um ou mais indicadores de produtividade, todos
+    com as colunas (chave_deputado, ano, <indicador>), todas inteiras na
+    junção. Deputados sem registro em algum indicador recebem zero.
+    """
+    resultado = gastos
+    for indicador in producao:
+        resultado = resultado.merge(indicador, on=["chave_deputado", "ano"], how="left")
+    return resultado.fillna(0)
+
+
+def classificar_agregados(**opcoes) -> pd.DataFrame:
+    """
+    Indicadores e quadrante por deputado e ano a partir dos agregados já
+    construídos: gasto do cubo, proposições do índice de autoria e presença
+    das matrizes (as que existirem). Sem nenhum indicador de produtividade,
+    sai sem as colunas de quadrante. `opcoes` vão para `classificar`.
+    """
+    from legisdata.analise import consultar_gastos
+    from legisdata.indice_autoria import indicador_proposicoes
+    from legisdata.presencas import indicador_presenca
+
+    tipos = {"chave_deputado": np.int32, "ano": np.int16}
+    gastos = consultar_gastos(por=["chave_deputado", "ano"], medidas=["total"])
+    gastos = gastos.dropna(subset=["chave_deputado"]).astype(tipos).rename(columns={"total": "gasto"})
+
+    producao = [p.astype(tipos) for p in (indicador_proposicoes(), indicador_presenca()) if len(p)]
+    indicadores = montar_indicadores(gastos, *producao)
+    nomes_producao = [c for c in ("proposicoes", "presenca") if c in indicadores.columns]
+    if not nomes_producao:
+        return indicadores
+    classificacao = classificar(montar_matriz(indicadores, nomes_producao), **opcoes)
+    colunas = ["chave_deputado", "ano", "score_producao", "quadrante", "descricao_quadrante"]
+    return indicadores.merge(classificacao[colunas], on=["chave_deputado", "ano"], how="left")
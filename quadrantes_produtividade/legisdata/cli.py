@@ -0,0 +1,173 @@
+# legisdata/cli.py
+#
+# Ponto de entrada de linha de comando:
+#
+#   python -m legisdata plan       # só lê o checkpoint e lista o que falta baixar
+#   python -m legisdata coletar    # baixa o que falta (e revalida o ano corrente)
+#   python -m legisdata processar  # Parquet, agregados, relatórios e snapshot do que mudou
+#   python -m legisdata executar   # coletar + processar (padrão, usado pelo cron)
+#   python -m legisdata despesas   # despesas do ano corrente pela API, por deputado/mês
+#
+# Dependências pesadas (requests, pyarrow, pandas) só são importadas pelos
+# subcomandos que as usam; `plan` não abre conexão nem carrega pyarrow.
+
+import argparse
+import importlib
+import sys
+
+from legisdata.config import ANO_INICIAL_COLETA, ANO_ATUAL
+
+# tipo -> (módulo, classe). Importados sob demanda, só os tipos pedidos.
+COLETORES = {
+    "gastos": ("legisdata.coleta.coletor_gastos", "ColetorGastosCEAP"),
+    "proposicoes": ("legisdata.coleta.coletor_proposicoes", "ColetorProposicoes"),
+    "autores": ("legisdata.coleta.coletor_autores", "ColetorAutoresProposicoes"),
+    "eventos": ("legisdata.coleta.coletor_eventos", "ColetorEventos"),
+    "presencas": ("legisdata.coleta.coletor_eventos", "ColetorPresencasEventos"),
+    "eventos_orgaos": ("legisdata.coleta.coletor_eventos", "ColetorOrgaosEventos"),
+    "deputados": ("legisdata.coleta.coletor_deputados", "ColetorDeputados"),
+    "comissoes": ("legisdata.coleta.coletor_comissoes", "ColetorComissoes"),
+}
+
+
+def _instanciar_coletores(tipos):
+    coletores = []
+    for tipo in tipos:
+        modulo, classe = COLETORES[tipo]
+        coletores.append(getattr(importlib.import_module(modulo), classe)())
+    return coletores
+
+
+def _anos(args):
+    return range(args.de or ANO_INICIAL_COLETA, (args.ate or ANO_ATUAL) + 1)
+
+
+def _anos_processar(args):
+    # Sem --de/--ate, o processamento olha todos os anos registrados.
+    return _anos(args) if args.de or args.ate else None
+
+
+def _agendador(args):
+    from legisdata.coleta.agendador import AgendadorColeta
+
+    # O ano corrente é republicado pela Câmara: revalida com GET condicional.
+    return AgendadorColeta(
+        _instanciar_coletores(args.tipos),
+        anos=_anos(args),
+        revalidar_anos=[] if args.sem_revalidar else [ANO_ATUAL],
+        estimar_tamanhos=args.comando != "plan",
+    )
+
+
+def comando_plan(args) -> int:
+    tarefas = _agendador(args).planejar()
+    if not tarefas:
+        print("✅ Nada a baixar: todas as tarefas já constam no checkpoint.")
+        return 0
+
+    print(f"📋 {len(tarefas)} tarefas pendentes:")
+    for tarefa in sorted(tarefas, key=lambda t: (t.tipo, str(t.ano))):
+        motivo = "revalidar" if tarefa.atualizar else "novo"
+        print(f"  {tarefa.tipo:<12} {str(tarefa.ano):<6} {motivo:<10} {tarefa.url}")
+    return 0
+
+
+def comando_coletar(args) -> int:
+    from legisdata.coleta.agendador import imprimir_resumo
+
+    resultados = _agendador(args).executar()
+    imprimir_resumo(resultados)
+    return 1 if any(r.status == "erro" for r in resultados) else 0
+
+
+def comando_processar(args) -> int:
+    from legisdata.analise import construir_cubo
+    from legisdata.comissoes import construir_indice_comissoes
+    from legisdata.indice_autoria import construir_indice_autoria
+    from legisdata.presencas import construir_matrizes_presenca
+    from legisdata.processamento import processar
+    from legisdata.relatorios import gerar_relatorios
+    from legisdata.snapshot import gerar_snapshot
+
+    processar(tipos=args.tipos, anos=_anos_processar(args), forcar=args.forcar)
+    construir_cubo(anos=_anos_processar(args), forcar=args.forcar)
+    construir_indice_autoria(anos=_anos_processar(args), forcar=args.forcar)
+    construir_matrizes_presenca(anos=_anos_processar(args), forcar=args.forcar)
+    construir_indice_comissoes(forcar=args.forcar)
+    gerar_relatorios(forcar=args.forcar)
+    gerar_snapshot(forcar=args.forcar)
+    return 0
+
+
+def comando_executar(args) -> int:
+    status = comando_coletar(args)
+    comando_processar(args)
+    return status
+
+
+def comando_despesas(args) -> int:
+    import pyarrow.compute as pc
+
+    from legisdata.classificacao_quadrantes import legislatura_do_ano
+    from legisdata.coleta.coletor_despesas_api import ColetorDespesasAPI
+    from legisdata.dimensao import dimensao_deputados
+
+    dimensao = dimensao_deputados()
+    if dimensao is None:
+        print("❌ Dimensão de deputados ainda não gerada: rode `processar --tipos deputados` antes.")
+        return 1
+
+    # Sem --de/--ate, só o ano corrente (os anteriores vêm do arquivo da CEAP).
+    anos = _anos(args) if args.de or args.ate else [ANO_ATUAL]
+    coletor = ColetorDespesasAPI()
+    erros = 0
+    for ano in anos:
+        # Deputados cujo mandato cobre a legislatura do ano.
+        legislatura = int(legislatura_do_ano(ano))
+        tabela = dimensao.tabela
+        em_exercicio = pc.and_(pc.less_equal(tabela["idLegislaturaInicial"], legislatura),
+                               pc.greater_equal(tabela["idLegislaturaFinal"], legislatura))
+        ids = tabela.filter(em_exercicio)["id_deputado"].to_pylist()
+        erros += len(coletor.coletar(ids, ano)["erros"])
+    return 1 if erros else 0
+
+
+COMANDOS = {
+    "plan": comando_plan,
+    "coletar": comando_coletar,
+    "processar": comando_processar,
+    "executar": comando_executar,
+    "despesas": comando_despesas,
+}
+
+
+def criar_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="legisdata", description="Coleta e processamento dos dados da Câmara.")
+    parser.add_argument("comando", nargs="?", default="executar", choices=list(COMANDOS))
+    parser.add_argument("--tipos", nargs="+", default=list(COLETORES), choices=list(COLETORES),
+                        help="bases a considerar (padrão: todas)")
+    parser.add_argument("--de", type=int, help=f"primeiro ano (padrão: {ANO_INICIAL_COLETA})")
+    parser.add_argument("--ate", type=int, help=f"último ano (padrão: {ANO_ATUAL})")
+    parser.add_argument("--sem-revalidar", action="store_true",
+                        help="não revalida os arquivos do ano corrente já baixados")
+    parser.add_argument("--forcar", action="store_true", help="reprocessa mesmo sem mudança nos brutos")
+    return parser
+
+
+def main(argv=None) -> int:
+    from legisdata.metricas import obter_registro
+
+    args = criar_parser().parse_args(argv)
+    # O resumo e o arquivo do Prometheus saem em todo subcomando que mediu
+    # algum job, mesmo se um estágio falhar.
+    metricas = obter_registro()
+    try:
+        return COMANDOS[args.comando](args)
+    finally:
+        if metricas.medicoes:
+            metricas.imprimir_resumo()
+            metricas.exportar_prometheus()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,196 @@
+# legisdata/coleta/agendador.py
+
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from dataclasses import dataclass, field
+from typing import Optional
+from urllib.parse import urlparse
+
+from legisdata.config import (
+    MAX_DOWNLOADS_PARALELOS,
+    MAX_DOWNLOADS_POR_HOST,
+    BANDA_MAXIMA_BYTES_POR_SEGUNDO,
+)
+
+
+class LimitadorBanda:
+    """
+    Balde de fichas (token bucket) compartilhado entre threads para limitar
+    a soma da banda de todos os downloads simultâneos.
+    """
+
+    def __init__(self, bytes_por_segundo: int):
+        self.taxa = float(bytes_por_segundo)
+        self.capacidade = float(bytes_por_segundo)
+        self._fichas = self.capacidade
+        self._ultimo = time.monotonic()
+        self._lock = threading.Lock()
+
+    def consumir(self, quantidade: int):
+        while True:
+            with self._lock:
+                agora = time.monotonic()
+                self._fichas = min(self.capacidade, self._fichas + (agora - self._ultimo) * self.taxa)
+                self._ultimo = agora
+                # Blocos maiores que a capacidade passam assim que o balde enche.
+                necessario = min(quantidade, self.capacidade)
+                if self._fichas >= necessario:
+                    self._fichas -= necessario
+                    return
+                espera = (necessario - self._fichas) / self.taxa
+            time.sleep(espera)
+
+
+@dataclass
+class Tarefa:
+    coletor: object
+    ano: object
+    url: str
+    tamanho: int = 0
+    atualizar: bool = False
+
+    @property
+    def host(self) -> str:
+        return urlparse(self.url).netloc
+
+    @property
+    def tipo(self) -> str:
+        return self.coletor.tipo
+
+
+@dataclass
+class ResultadoTarefa:
+    tipo: str
+    ano: object
+    status: str  # "ok" ou "erro"
+    duracao: float = 0.0
+    tamanho: int = 0
+    erro: Optional[str] = None
+    detalhes: Optional[str] = field(default=None, repr=False)
+
+
+class AgendadorColeta:
+    """
+    Executa os downloads de vários coletores e anos em paralelo.
+
+    As tarefas (coletor, ano) já registradas no checkpoint são descartadas,
+    exceto as bases "geral" quando `revalidar_gerais=True` e os anos em
+    `revalidar_anos`, que passam por um GET condicional. As restantes são
+    ordenadas da maior para a menor (tamanho estimado via HEAD) e
+    despachadas em um pool de threads, respeitando um limite de conexões
+    por host e um orçamento global de banda.
+    """
+
+    def __init__(self, coletores, anos, max_paralelos: int = MAX_DOWNLOADS_PARALELOS,
+                 max_por_host: int = MAX_DOWNLOADS_POR_HOST,
+                 banda_maxima: Optional[int] = BANDA_MAXIMA_BYTES_POR_SEGUNDO,
+                 estimar_tamanhos: bool = True,
+                 revalidar_gerais: bool = False,
+                 revalidar_anos=()):
+        self.coletores = list(coletores)
+        self.anos = list(anos)
+        self.max_paralelos = max_paralelos
+        self.max_por_host = max_por_host
+        self.estimar_tamanhos = estimar_tamanhos
+        self.revalidar_gerais = revalidar_gerais
+        self.revalidar_anos = {str(a) for a in revalidar_anos}
+        self.limitador = LimitadorBanda(banda_maxima) if banda_maxima else None
+
+        for coletor in self.coletores:
+            coletor.limitador_banda = self.limitador
+
+    def planejar(self) -> list:
+        """
+        Monta a lista de tarefas pendentes, da maior para a menor.
+        """
+        tarefas = []
+        for coletor in self.coletores:
+            anos = self.anos if coletor.anual else ["geral"]
+            for ano in anos:
+                if coletor.anual:
+                    atualizar = str(ano) in self.revalidar_anos
+                else:
+                    atualizar = self.revalidar_gerais
+                if coletor._ja_baixado(ano) and not atualizar:
+                    continue
+                tarefas.append(Tarefa(coletor=coletor, ano=ano, url=coletor.url(ano), atualizar=atualizar))
+
+        if self.estimar_tamanhos and tarefas:
+            with ThreadPoolExecutor(max_workers=self.max_paralelos) as pool:
+                tamanhos = pool.map(lambda t: t.coletor.tamanho_remoto(t.ano), tarefas)
+                for tarefa, tamanho in zip(tarefas, tamanhos):
+                    tarefa.tamanho = tamanho
+
+        tarefas.sort(key=lambda t: t.tamanho, reverse=True)
+        return tarefas
+
+    def _executar_tarefa(self, tarefa: Tarefa) -> ResultadoTarefa:
+        inicio = time.monotonic()
+        try:
+            tarefa.coletor.coletar(tarefa.ano, atualizar=tarefa.atualizar)
+            status, erro, detalhes = "ok", None, None
+        except Exception as e:
+            status, erro, detalhes = "erro", f"{type(e).__name__}: {e}", traceback.format_exc()
+        return ResultadoTarefa(
+            tipo=tarefa.tipo,
+            ano=tarefa.ano,
+            status=status,
+            duracao=time.monotonic() - inicio,
+            tamanho=tarefa.tamanho,
+            erro=erro,
+            detalhes=detalhes,
+        )
+
+    def executar(self, tarefas=None) -> list:
+        """
+        Executa as tarefas pendentes e retorna um ResultadoTarefa por tarefa.
+        Uma tarefa só é despachada quando há vaga no pool e no seu host; entre
+        as elegíveis, a maior sai primeiro.
+        """
+        pendentes = self.planejar() if tarefas is None else list(tarefas)
+        resultados = []
+        ativos_por_host = {}
+        em_andamento = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_paralelos) as pool:
+            while pendentes or em_andamento:
+                while len(em_andamento) < self.max_paralelos:
+                    proxima = next(
+                        (t for t in pendentes if ativos_por_host.get(t.host, 0) < self.max_por_host),
+                        None,
+                    )
+                    if proxima is None:
+                        break
+                    pendentes.remove(proxima)
+                    ativos_por_host[proxima.host] = ativos_por_host.get(proxima.host, 0) + 1
+                    em_andamento[pool.submit(self._executar_tarefa, proxima)] = proxima
+
+                concluidos, _ = wait(em_andamento, return_when=FIRST_COMPLETED)
+                for futuro in concluidos:
+                    tarefa = em_andamento.pop(futuro)
+                    ativos_por_host[tarefa.host] -= 1
+                    resultados.append(futuro.result())
+
+        return resultados
+
+
+def imprimir_resumo(resultados: list):
+    """
+    Imprime um resumo por tarefa e o total de sucessos e falhas.
+    """
+    if not resultados:
+        print("✅ Nada a baixar: todas as tarefas já constam no checkpoint.")
+        return
+
+    print("\n📋 Resumo da coleta:")
+    for r in sorted(resultados, key=lambda r: (r.tipo, str(r.ano))):
+        icone = "✅" if r.status == "ok" else "❌"
+        linha = f"  {icone} {r.tipo:<12} {str(r.ano):<6} {r.duracao:8.1f}s"
+        if r.erro:
+            linha += f"  {r.erro}"
+        print(linha)
+
+    falhas = sum(1 for r in resultados if r.status == "erro")
+    print(f"\n📊 {len(resultados) - falhas} tarefas concluídas, {falhas} com erro.")
@@ -0,0 +1,363 @@
+# legisdata/coleta/checkpoint.py
+
+import csv
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from legisdata.config import ARQUIVO_CHECKPOINT, ARQUIVO_CHECKPOINT_DB, ARQUIVO_CHECKPOINT_GASTOS
+
+
+class CheckpointStore:
+    """
+    Índice dos arquivos já baixados, persistido em SQLite (modo WAL).
+
+    Os pares (tipo, ano) ficam em uma tabela com chave primária, então
+    consultar e registrar custa o mesmo independentemente do histórico.
+    Cada registro é gravado em sua própria transação, o que torna a escrita
+    atômica e segura com vários coletores (threads ou processos) gravando
+    ao mesmo tempo. Na primeira abertura, o CSV legado é importado.
+    """
+
+    def __init__(self, caminho: str = ARQUIVO_CHECKPOINT_DB,
+                 caminho_csv_legado: str = ARQUIVO_CHECKPOINT):
+        self.caminho = caminho
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(caminho), exist_ok=True)
+
+        self._conexao = sqlite3.connect(
+            caminho, timeout=30, isolation_level=None, check_same_thread=False
+        )
+        self._conexao.execute("PRAGMA journal_mode=WAL")
+        self._conexao.execute(
+            "CREATE TABLE IF NOT EXISTS arquivos_baixados ("
+            " tipo TEXT NOT NULL,"
+            " ano TEXT NOT NULL,"
+            " baixado_em TEXT NOT NULL,"
+            " PRIMARY KEY (tipo, ano))"
+        )
+        self._conexao.execute(
+            "CREATE TABLE IF NOT EXISTS metadados_http ("
+            " url TEXT PRIMARY KEY,"
+            " etag TEXT,"
+            " last_modified TEXT,"
+            " atualizado_em TEXT NOT NULL)"
+        )
+        self._conexao.execute(
+            "CREATE TABLE IF NOT EXISTS downloads_parciais ("
+            " url TEXT PRIMARY KEY,"
+            " etag TEXT,"
+            " last_modified TEXT,"
+            " tamanho_total INTEGER,"
+            " atualizado_em TEXT NOT NULL)"
+        )
+        self._conexao.execute(
+            "CREATE TABLE IF NOT EXISTS migracoes ("
+            " nome TEXT PRIMARY KEY,"
+            " aplicada_em TEXT NOT NULL)"
+        )
+        self._migrar_csv_legado(caminho_csv_legado)
+
+        # Cache positivo: o que já foi visto como baixado não precisa ir ao disco.
+        self._indice = set(self._conexao.execute("SELECT tipo, ano FROM arquivos_baixados"))
+
+    @staticmethod
+    def _chave(tipo, ano):
+        return str(tipo), str(ano)
+
+    def _migrar_csv_legado(self, caminho_csv):
+        """
+        Importa o checkpoint CSV antigo (tipo, ano, baixado_em) uma única vez.
+        O arquivo original é mantido intacto.
+        """
+        if not caminho_csv or not os.path.exists(caminho_csv):
+            return
+
+        with self._lock:
+            ja_migrado = self._conexao.execute(
+                "SELECT 1 FROM migracoes WHERE nome = ?", ("csv_legado",)
+            ).fetchone()
+            if ja_migrado:
+                return
+
+            with open(caminho_csv, newline="", encoding="utf-8") as f:
+                linhas = [
+                    (*self._chave(linha["tipo"], linha["ano"]), linha.get("baixado_em") or "")
+                    for linha in csv.DictReader(f)
+                    if linha.get("tipo") and linha.get("ano")
+                ]
+
+            with self._conexao:
+                self._conexao.execute("BEGIN IMMEDIATE")
+                self._conexao.executemany(
+                    "INSERT OR IGNORE INTO arquivos_baixados (tipo, ano, baixado_em) VALUES (?, ?, ?)",
+                    linhas,
+                )
+                self._conexao.execute(
+                    "INSERT OR IGNORE INTO migracoes (nome, aplicada_em) VALUES (?, ?)",
+                    ("csv_legado", datetime.now().isoformat()),
+                )
+
+        print(f"📦 Checkpoint legado migrado: {len(linhas)} registros de {caminho_csv}")
+
+    def contem(self, tipo, ano) -> bool:
+        chave = self._chave(tipo, ano)
+        if chave in self._indice:
+            return True
+
+        # Outro processo pode ter registrado depois da carga inicial.
+        with self._lock:
+            encontrado = self._conexao.execute(
+                "SELECT 1 FROM arquivos_baixados WHERE tipo = ? AND ano = ?", chave
+            ).fetchone()
+        if encontrado:
+            self._indice.add(chave)
+        return bool(encontrado)
+
+    def registrar(self, tipo, ano):
+        chave = self._chave(tipo, ano)
+        with self._lock:
+            with self._conexao:
+                self._conexao.execute(
+                    "INSERT OR REPLACE INTO arquivos_baixados (tipo, ano, baixado_em) VALUES (?, ?, ?)",
+                    (*chave, datetime.now().isoformat()),
+                )
+            self._indice.add(chave)
+
+    def remover(self, tipo, ano):
+        chave = self._chave(tipo, ano)
+        with self._lock:
+            with self._conexao:
+                self._conexao.execute(
+                    "DELETE FROM arquivos_baixados WHERE tipo = ? AND ano = ?", chave
+                )
+            self._indice.discard(chave)
+
+    def registrados(self, tipo=None) -> list:
+        """
+        Lista os pares (tipo, ano) registrados, opcionalmente filtrando por tipo.
+        """
+        with self._lock:
+            if tipo is None:
+                cursor = self._conexao.execute("SELECT tipo, ano FROM arquivos_baixados")
+            else:
+                cursor = self._conexao.execute(
+                    "SELECT tipo, ano FROM arquivos_baixados WHERE tipo = ?", (str(tipo),)
+                )
+            return cursor.fetchall()
+
+    def obter_metadados_http(self, url: str) -> tuple:
+        """
+        Retorna (etag, last_modified) guardados para a URL, ou (None, None).
+        """
+        with self._lock:
+            linha = self._conexao.execute(
+                "SELECT etag, last_modified FROM metadados_http WHERE url = ?", (url,)
+            ).fetchone()
+        return linha if linha else (None, None)
+
+    def salvar_metadados_http(self, url: str, etag, last_modified):
+        with self._lock:
+            with self._conexao:
+                self._conexao.execute(
+                    "INSERT OR REPLACE INTO metadados_http (url, etag, last_modified, atualizado_em)"
+                    " VALUES (?, ?, ?, ?)",
+                    (url, etag, last_modified, datetime.now().isoformat()),
+                )
+
+    def obter_download_parcial(self, url: str) -> tuple:
+        """
+        Retorna (etag, last_modified, tamanho_total) do download parcial em
+        andamento para a URL, ou (None, None, None).
+        """
+        with self._lock:
+            linha = self._conexao.execute(
+                "SELECT etag, last_modified, tamanho_total FROM downloads_parciais WHERE url = ?",
+                (url,),
+            ).fetchone()
+        return linha if linha else (None, None, None)
+
+    def salvar_download_parcial(self, url: str, etag, last_modified, tamanho_total):
+        with self._lock:
+            with self._conexao:
+                self._conexao.execute(
+                    "INSERT OR REPLACE INTO downloads_parciais"
+                    " (url, etag, last_modified, tamanho_total, atualizado_em) VALUES (?, ?, ?, ?, ?)",
+                    (url, etag, last_modified, tamanho_total, datetime.now().isoformat()),
+                )
+
+    def remover_download_parcial(self, url: str):
+        with self._lock:
+            with self._conexao:
+                self._conexao.execute("DELETE FROM downloads_parciais WHERE url = ?", (url,))
+
+    def fechar(self):
+        with self._lock:
+            self._conexao.close()
+
+
+class CheckpointDespesas:
+    """
+    Checkpoint da coleta de despesas por (id_deputado, ano, mes).
+
+    O conjunto de chaves é carregado uma vez em memória. Chaves fora dele
+    são conferidas no SQLite antes de serem dadas como novas, pois outro
+    processo pode tê-las registrado depois da carga. `registrar_lote` grava
+    só as chaves novas em uma única transação, então registrar um ano
+    inteiro custa uma escrita.
+    """
+
+    def __init__(self, caminho: str = ARQUIVO_CHECKPOINT_DB,
+                 caminho_csv_legado: str = ARQUIVO_CHECKPOINT_GASTOS):
+        self.caminho = caminho
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(caminho), exist_ok=True)
+
+        self._conexao = sqlite3.connect(
+            caminho, timeout=30, isolation_level=None, check_same_thread=False
+        )
+        self._conexao.execute("PRAGMA journal_mode=WAL")
+        self._conexao.execute(
+            "CREATE TABLE IF NOT EXISTS despesas_coletadas ("
+            " id_deputado INTEGER NOT NULL,"
+            " ano INTEGER NOT NULL,"
+            " mes INTEGER NOT NULL,"
+            " coletado_em TEXT NOT NULL,"
+            " PRIMARY KEY (id_deputado, ano, mes))"
+        )
+        self._conexao.execute(
+            "CREATE TABLE IF NOT EXISTS migracoes ("
+            " nome TEXT PRIMARY KEY,"
+            " aplicada_em TEXT NOT NULL)"
+        )
+        self._migrar_csv_legado(caminho_csv_legado)
+        self._indice = set(self._conexao.execute("SELECT id_deputado, ano, mes FROM despesas_coletadas"))
+
+    @staticmethod
+    def _chave(id_deputado, ano, mes):
+        return int(id_deputado), int(ano), int(mes)
+
+    def _migrar_csv_legado(self, caminho_csv):
+        if not caminho_csv or not os.path.exists(caminho_csv):
+            return
+
+        with self._lock:
+            ja_migrado = self._conexao.execute(
+                "SELECT 1 FROM migracoes WHERE nome = ?", ("csv_gastos_legado",)
+            ).fetchone()
+            if ja_migrado:
+                return
+
+            linhas = []
+            with open(caminho_csv, newline="", encoding="utf-8") as f:
+                for linha in csv.DictReader(f):
+                    try:
+                        chave = self._chave(float(linha["id_deputado"]), linha["ano"], linha["mes"])
+                    except (KeyError, TypeError, ValueError):
+                        continue
+                    linhas.append((*chave, linha.get("coletado_em") or ""))
+
+            with self._conexao:
+                self._conexao.execute("BEGIN IMMEDIATE")
+                self._conexao.executemany(
+                    "INSERT OR IGNORE INTO despesas_coletadas (id_deputado, ano, mes, coletado_em)"
+                    " VALUES (?, ?, ?, ?)",
+                    linhas,
+                )
+                self._conexao.execute(
+                    "INSERT OR IGNORE INTO migracoes (nome, aplicada_em) VALUES (?, ?)",
+                    ("csv_gastos_legado", datetime.now().isoformat()),
+                )
+
+        print(f"📦 Checkpoint de despesas legado migrado: {len(linhas)} registros de {caminho_csv}")
+
+    def _registradas(self, anos) -> set:
+        # Chaves dos anos pedidos gravadas por qualquer processo. Chamar com o lock.
+        anos = sorted(anos)
+        marcadores = ", ".join("?" * len(anos))
+        return set(self._conexao.execute(
+            f"SELECT id_deputado, ano, mes FROM despesas_coletadas WHERE ano IN ({marcadores})", anos
+        ))
+
+    def contem(self, id_deputado, ano, mes) -> bool:
+        chave = self._chave(id_deputado, ano, mes)
+        if chave in self._indice:
+            return True
+
+        # Outro processo pode ter registrado depois da carga inicial.
+        with self._lock:
+            encontrado = self._conexao.execute(
+                "SELECT 1 FROM despesas_coletadas WHERE id_deputado = ? AND ano = ? AND mes = ?", chave
+            ).fetchone()
+        if encontrado:
+            self._indice.add(chave)
+        return bool(encontrado)
+
+    def novas(self, chaves) -> list:
+        """
+        Filtra, das chaves (id_deputado, ano, mes) informadas, as ainda não registradas.
+        """
+        candidatas = {self._chave(*c) for c in chaves} - self._indice
+        if candidatas:
+            with self._lock:
+                self._indice |= self._registradas({c[1] for c in candidatas})
+            candidatas -= self._indice
+        return sorted(candidatas)
+
+    def registrar_lote(self, chaves, gravar=None) -> int:
+        """
+        Registra as chaves novas em uma única transação. Retorna quantas eram novas.
+
+        As chaves são conferidas de novo no SQLite já dentro da transação
+        (BEGIN IMMEDIATE, que bloqueia os outros escritores). `gravar(novas)`,
+        se informado, roda nela antes do registro, só com as chaves que
+        ninguém registrou: dois processos coletando as mesmas chaves não
+        gravam os mesmos dados duas vezes.
+        """
+        candidatas = {self._chave(*c) for c in chaves}
+        if not candidatas:
+            return 0
+
+        agora = datetime.now().isoformat()
+        with self._lock:
+            with self._conexao:
+                self._conexao.execute("BEGIN IMMEDIATE")
+                registradas = self._registradas({c[1] for c in candidatas})
+                novas = sorted(candidatas - registradas)
+                if novas and gravar is not None:
+                    gravar(novas)
+                self._conexao.executemany(
+                    "INSERT OR IGNORE INTO despesas_coletadas (id_deputado, ano, mes, coletado_em)"
+                    " VALUES (?, ?, ?, ?)",
+                    [(*c, agora) for c in novas],
+                )
+            self._indice |= registradas
+            self._indice.update(novas)
+        return len(novas)
+
+    def fechar(self):
+        with self._lock:
+            self._conexao.close()
+
+
+_instancias = {}
+_instancias_lock = threading.Lock()
+
+
+def obter_checkpoint(caminho: str = ARQUIVO_CHECKPOINT_DB) -> CheckpointStore:
+    """
+    Retorna a instância compartilhada do checkpoint para o caminho informado,
+    para que todos os coletores do processo usem o mesmo índice em memória.
+    """
+    with _instancias_lock:
+        if caminho not in _instancias:
+            _instancias[caminho] = CheckpointStore(caminho)
+        return _instancias[caminho]
+
+
+def obter_checkpoint_despesas(caminho: str = ARQUIVO_CHECKPOINT_DB) -> CheckpointDespesas:
+    with _instancias_lock:
+        chave = ("despesas", caminho)
+        if chave not in _instancias:
+            _instancias[chave] = CheckpointDespesas(caminho)
+        return _instancias[chave]
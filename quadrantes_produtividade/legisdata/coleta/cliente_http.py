@@ -0,0 +1,237 @@
+# legisdata/coleta/cliente_http.py
+
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from legisdata.config import (
+    CABECALHOS_HTTP,
+    TAMANHO_CHUNK_DOWNLOAD,
+    TAMANHO_POOL_HTTP,
+    TENTATIVAS_HTTP,
+    FATOR_BACKOFF_HTTP,
+    TIMEOUT_HTTP,
+)
+from legisdata.manifesto import novo_hash, calcular_hash
+from .checkpoint import obter_checkpoint
+
+
+class DownloadIncompleto(Exception):
+    """
+    O corpo recebido não bate com o tamanho anunciado pelo servidor.
+    """
+
+
+@dataclass
+class ResultadoDownload:
+    caminho: str
+    status: str  # "baixado" ou "nao_modificado"
+    bytes_recebidos: int = 0
+    hash: str = None
+    retomadas: int = 0  # quantas vezes o download foi retomado após queda
+
+
+class ClienteHTTP:
+    """
+    Camada única de download usada por todos os coletores.
+
+    Mantém uma sessão com pool de conexões keep-alive, repete requisições
+    com backoff exponencial em falhas de conexão e respostas 429/5xx, e
+    revalida arquivos já baixados com If-None-Match/If-Modified-Since a
+    partir do ETag/Last-Modified guardados no checkpoint.
+
+    Os downloads são gravados em `<destino>.part` e retomados com Range a
+    partir do último byte quando a conexão cai; o arquivo só é renomeado
+    para o destino depois de conferido contra o Content-Length. O hash do
+    conteúdo é calculado durante a gravação (ver legisdata.manifesto).
+    """
+
+    def __init__(self, tamanho_chunk: int = TAMANHO_CHUNK_DOWNLOAD,
+                 tamanho_pool: int = TAMANHO_POOL_HTTP,
+                 tentativas: int = TENTATIVAS_HTTP,
+                 fator_backoff: float = FATOR_BACKOFF_HTTP,
+                 timeout: float = TIMEOUT_HTTP,
+                 metadados=None):
+        self.tamanho_chunk = tamanho_chunk
+        self.timeout = timeout
+        self.tentativas = tentativas
+        self.fator_backoff = fator_backoff
+        self.metadados = metadados if metadados is not None else obter_checkpoint()
+
+        retry = Retry(
+            total=tentativas,
+            backoff_factor=fator_backoff,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=("HEAD", "GET"),
+            respect_retry_after_header=True,
+        )
+        adaptador = HTTPAdapter(
+            pool_connections=tamanho_pool, pool_maxsize=tamanho_pool, max_retries=retry
+        )
+
+        self.sessao = requests.Session()
+        self.sessao.headers.update(CABECALHOS_HTTP)
+        self.sessao.mount("http://", adaptador)
+        self.sessao.mount("https://", adaptador)
+
+    def head(self, url: str) -> requests.Response:
+        return self.sessao.head(url, allow_redirects=True, timeout=self.timeout)
+
+    def _cabecalhos_condicionais(self, url, caminho):
+        # `caminho` é o arquivo que representa a versão dos validadores.
+        if not os.path.exists(caminho):
+            return {}
+        etag, last_modified = self.metadados.obter_metadados_http(url)
+        cabecalhos = {}
+        if etag:
+            cabecalhos["If-None-Match"] = etag
+        if last_modified:
+            cabecalhos["If-Modified-Since"] = last_modified
+        return cabecalhos
+
+    def baixar(self, url: str, caminho: str, condicional: bool = True,
+               cabecalhos: dict = None, limitador_banda=None,
+               caminho_validado: str = None) -> ResultadoDownload:
+        """
+        Baixa `url` em streaming para `caminho`, retomando de onde parou em
+        caso de queda de conexão ou corpo truncado.
+
+        Com `condicional=True` e o arquivo já presente, envia os validadores
+        guardados; um 304 encerra o download sem transferir o corpo. Quando o
+        download não fica em disco (ex.: zip descartado após a extração),
+        `caminho_validado` aponta o arquivo derivado dele, cuja presença vale
+        no lugar de `caminho`.
+
+        Só quedas no meio do corpo são retomadas aqui. Falhas ao conectar ou
+        antes da resposta já passaram pelo Retry do adaptador e sobem direto,
+        para as duas esperas não se multiplicarem.
+        """
+        tentativa = 0
+        while True:
+            try:
+                resultado = self._baixar_uma_vez(url, caminho, condicional, cabecalhos, limitador_banda,
+                                                 caminho_validado or caminho)
+                resultado.retomadas = tentativa
+                return resultado
+            except (requests.exceptions.ChunkedEncodingError, DownloadIncompleto) as e:
+                tentativa += 1
+                if tentativa > self.tentativas:
+                    raise
+                espera = self.fator_backoff * 2 ** (tentativa - 1)
+                print(f"🔁 Download interrompido ({e}). Retomando {url} em {espera:.0f}s...")
+                time.sleep(espera)
+
+    def _baixar_uma_vez(self, url, caminho, condicional, cabecalhos, limitador_banda, caminho_validado):
+        parcial = caminho + ".part"
+        inicio = os.path.getsize(parcial) if os.path.exists(parcial) else 0
+
+        # Range só faz sentido sobre os bytes originais, sem compressão de transporte.
+        cabecalhos = dict(cabecalhos or {})
+        cabecalhos["Accept-Encoding"] = "identity"
+
+        if inicio > 0:
+            etag, last_modified, _ = self.metadados.obter_download_parcial(url)
+            cabecalhos["Range"] = f"bytes={inicio}-"
+            if etag or last_modified:
+                # Se o arquivo mudou no servidor, If-Range faz ele responder 200 completo.
+                cabecalhos["If-Range"] = etag or last_modified
+        elif condicional:
+            cabecalhos.update(self._cabecalhos_condicionais(url, caminho_validado))
+
+        with self.sessao.get(url, headers=cabecalhos, stream=True, timeout=self.timeout) as response:
+            if response.status_code == 304:
+                return ResultadoDownload(caminho=caminho, status="nao_modificado")
+
+            if response.status_code == 416:
+                # O parcial não corresponde mais ao arquivo remoto: recomeça do zero.
+                os.remove(parcial)
+                self.metadados.remover_download_parcial(url)
+                raise DownloadIncompleto(f"Range {inicio}- rejeitado pelo servidor")
+
+            response.raise_for_status()
+
+            if response.status_code == 206:
+                inicio_servidor, total = _interpretar_content_range(response.headers.get("Content-Range"))
+                if inicio_servidor != inicio:
+                    os.remove(parcial)
+                    raise DownloadIncompleto(f"Content-Range inesperado: começa em {inicio_servidor}")
+                modo = "ab"
+            else:
+                inicio = 0
+                total = response.headers.get("Content-Length")
+                total = int(total) if total is not None else None
+                modo = "wb"
+
+            etag, last_modified = response.headers.get("ETag"), response.headers.get("Last-Modified")
+            if modo == "wb":
+                self.metadados.salvar_download_parcial(url, etag, last_modified, total)
+
+            os.makedirs(os.path.dirname(caminho), exist_ok=True)
+            hash_obj = novo_hash()
+            if modo == "ab":
+                # Só o prefixo já em disco é relido, e apenas ao retomar.
+                calcular_hash(parcial, hash_obj)
+
+            recebidos = 0
+            with open(parcial, modo) as f:
+                try:
+                    for chunk in response.iter_content(chunk_size=self.tamanho_chunk):
+                        if chunk:
+                            if limitador_banda is not None:
+                                limitador_banda.consumir(len(chunk))
+                            f.write(chunk)
+                            hash_obj.update(chunk)
+                            recebidos += len(chunk)
+                except requests.ConnectionError as e:
+                    # Queda (ou timeout de leitura) no meio do corpo: retomável.
+                    raise DownloadIncompleto(f"conexão perdida após {recebidos} bytes: {e}") from e
+                finally:
+                    f.flush()
+                    os.fsync(f.fileno())
+
+        tamanho = os.path.getsize(parcial)
+        if total is not None and tamanho != total:
+            if tamanho > total:
+                os.remove(parcial)
+            raise DownloadIncompleto(f"{tamanho} de {total} bytes recebidos")
+
+        os.replace(parcial, caminho)
+        self.metadados.salvar_metadados_http(url, etag, last_modified)
+        self.metadados.remover_download_parcial(url)
+
+        return ResultadoDownload(
+            caminho=caminho, status="baixado", bytes_recebidos=recebidos, hash=hash_obj.hexdigest()
+        )
+
+
+def _interpretar_content_range(valor):
+    """
+    Converte "bytes 100-999/1000" em (100, 1000). O total pode ser None ("*").
+    """
+    correspondencia = re.match(r"bytes (\d+)-\d+/(\d+|\*)", valor or "")
+    if not correspondencia:
+        raise DownloadIncompleto(f"Content-Range inválido: {valor!r}")
+    inicio, total = correspondencia.groups()
+    return int(inicio), (None if total == "*" else int(total))
+
+
+_cliente = None
+_cliente_lock = threading.Lock()
+
+
+def obter_cliente() -> ClienteHTTP:
+    """
+    Retorna o cliente compartilhado, para que todos os coletores do processo
+    reaproveitem o mesmo pool de conexões.
+    """
+    global _cliente
+    with _cliente_lock:
+        if _cliente is None:
+            _cliente = ClienteHTTP()
+        return _cliente
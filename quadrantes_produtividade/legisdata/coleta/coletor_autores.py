@@ -0,0 +1,40 @@
+# legisdata/coleta/coletor_autores.py
+
+import os
+from legisdata.config import DIRETORIO_RAW, URL_DADOS_ABERTOS_ARQUIVOS
+from .coletor_base import ColetorBase
+
+
+class ColetorAutoresProposicoes(ColetorBase):
+    """
+    Baixa os autores das proposições apresentadas em cada ano (um registro
+    por autor e proposição, com a ordem de assinatura).
+    """
+
+    def __init__(self):
+        super().__init__(tipo="autores")
+
+    def url(self, ano):
+        return f"{URL_DADOS_ABERTOS_ARQUIVOS}/proposicoesAutores/csv/proposicoesAutores-{ano}.csv"
+
+    def baixar(self, ano: int, atualizar: bool = False):
+        if self._ja_baixado(ano) and not atualizar:
+            print(f"⏭️  Autores de proposições {ano} já baixados. Pulando...")
+            return
+
+        print(f"🔽 Baixando autores de proposições de {ano}...")
+
+        caminho_csv = os.path.join(DIRETORIO_RAW, self.tipo, f"{ano}.csv")
+
+        try:
+            resultado = self._baixar_arquivo(self.url(ano), caminho_csv, ano=ano)
+
+            if resultado.status == "nao_modificado":
+                print(f"⏭️  Autores de proposições {ano} sem alterações no servidor.")
+            else:
+                print(f"\n✅ Autores de proposições {ano} salvos em: {caminho_csv}")
+            self._atualizar_checkpoint(ano)
+
+        except Exception as e:
+            print(f"\n❌ Erro ao baixar autores de proposições {ano}: {e}")
+            raise
@@ -1,35 +1,87 @@
 # legisdata/coleta/coletor_base.py
 
-import os
-import pandas as pd
-from datetime import datetime
-from legisdata.config import ARQUIVO_CHECKPOINT, DIRETORIO_CHECKPOINT
+from legisdata.manifesto import obter_manifesto
+from legisdata.metricas import medir, registrar
+from .checkpoint import obter_checkpoint
 
 
 class ColetorBase:
+    """
+    Classe base para coletores de arquivos da Câmara.
+    Define a lógica de checkpoint comum a todas as coletas.
+    """
+
+    # Coletores de bases "geral" (sem recorte anual) sobrescrevem com False.
+    anual = True
+
     def __init__(self, tipo: str):
         self.tipo = tipo
-        os.makedirs(DIRETORIO_CHECKPOINT, exist_ok=True)
+        self.checkpoint = obter_checkpoint()
+        self.manifesto = obter_manifesto()
+        self._cliente = None
+        self.limitador_banda = None
 
-    def _carregar_checkpoint(self):
-        if os.path.exists(ARQUIVO_CHECKPOINT):
-            return pd.read_csv(ARQUIVO_CHECKPOINT)
-        else:
-            return pd.DataFrame(columns=["tipo", "ano", "baixado_em"])
+    @property
+    def cliente(self):
+        # Importado só no primeiro download: planejar a coleta (checkpoint e
+        # URLs) não precisa carregar requests.
+        if self._cliente is None:
+            from .cliente_http import obter_cliente
+
+            self._cliente = obter_cliente()
+        return self._cliente
 
     def _atualizar_checkpoint(self, ano):
-        df = self._carregar_checkpoint()
-        nova_linha = pd.DataFrame([{
-            "tipo": self.tipo,
-            "ano": ano,
-            "baixado_em": datetime.now().isoformat()
-        }])
-        df = pd.concat([df, nova_linha], ignore_index=True)
-        df.to_csv(ARQUIVO_CHECKPOINT, index=False)
+        self.checkpoint.registrar(self.tipo, ano)
 
     def _ja_baixado(self, ano):
-        df = self._carregar_checkpoint()
-        return not df[(df["tipo"] == self.tipo) & (df["ano"] == ano)].empty
+        return self.checkpoint.contem(self.tipo, ano)
+
+    def _registrar_manifesto(self, ano, caminho, hash_hex):
+        self.manifesto.registrar_raw(self.tipo, ano, caminho, hash_hex)
 
-    def baixar(self, ano):
+    def _baixar_arquivo(self, url, caminho, condicional=True, cabecalhos=None, ano=None,
+                        caminho_validado=None):
+        """
+        Baixa pelo cliente compartilhado, respeitando o limitador de banda
+        do agendador (quando houver um configurado). Com `ano` informado, o
+        arquivo baixado é registrado no manifesto como o bruto de (tipo, ano).
+        `caminho_validado`: ver ClienteHTTP.baixar.
+        """
+        resultado = self.cliente.baixar(
+            url,
+            caminho,
+            condicional=condicional,
+            cabecalhos=cabecalhos,
+            limitador_banda=self.limitador_banda,
+            caminho_validado=caminho_validado,
+        )
+        if ano is not None and resultado.status == "baixado":
+            self._registrar_manifesto(ano, caminho, resultado.hash)
+        registrar(bytes=resultado.bytes_recebidos, retomadas=resultado.retomadas)
+        return resultado
+
+    def url(self, ano):
+        raise NotImplementedError("Subclasses devem implementar o método url().")
+
+    def tamanho_remoto(self, ano) -> int:
+        """
+        Estima o tamanho do arquivo remoto via HEAD (Content-Length).
+        Retorna 0 quando o servidor não informa.
+        """
+        try:
+            response = self.cliente.head(self.url(ano))
+            return int(response.headers.get("Content-Length", 0))
+        except Exception:
+            return 0
+
+    def baixar(self, ano, atualizar=False):
         raise NotImplementedError("Subclasses devem implementar o método baixar().")
+
+    def coletar(self, ano, atualizar=False):
+        """
+        Executa `baixar` medindo o job (tempo, bytes, retomadas, memória) no
+        registro de métricas da execução.
+        """
+        with medir("coleta", self.tipo, ano):
+            return self.baixar(ano, atualizar=atualizar)
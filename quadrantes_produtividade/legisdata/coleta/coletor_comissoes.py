@@ -0,0 +1,40 @@
+# legisdata/coleta/coletor_comissoes.py
+
+import os
+from legisdata.config import DIRETORIO_RAW, URL_DADOS_ABERTOS_ARQUIVOS
+from .coletor_base import ColetorBase
+
+
+class ColetorComissoes(ColetorBase):
+    """
+    Baixa os dados de composição das comissões da Câmara dos Deputados.
+    """
+
+    anual = False
+
+    def __init__(self):
+        super().__init__(tipo="comissoes")
+
+    def url(self, ano="geral"):
+        return f"{URL_DADOS_ABERTOS_ARQUIVOS}/comissoesMembros/csv/comissoesMembros.csv"
+
+    def baixar(self, ano="geral", atualizar=False):
+        if self._ja_baixado("geral") and not atualizar:
+            print("⏭️  Comissões já baixadas. Pulando...")
+            return
+
+        print("🔽 Baixando dados de composição das comissões...")
+
+        try:
+            caminho_csv = os.path.join(DIRETORIO_RAW, self.tipo, "comissoes.csv")
+            resultado = self._baixar_arquivo(self.url(), caminho_csv, ano="geral")
+
+            if resultado.status == "nao_modificado":
+                print("⏭️  Comissões sem alterações no servidor.")
+            else:
+                print(f"\n✅ Comissões salvas em: {caminho_csv}")
+            self._atualizar_checkpoint("geral")
+
+        except Exception as e:
+            print(f"\n❌ Erro ao baixar comissões: {e}")
+            raise
@@ -1,8 +1,7 @@
 # legisdata/coleta/coletor_deputados.py
 
 import os
-import requests
-from legisdata.config import DIRETORIO_RAW
+from legisdata.config import DIRETORIO_RAW, URL_DADOS_ABERTOS_ARQUIVOS
 from .coletor_base import ColetorBase
 
 
@@ -11,37 +10,31 @@ class ColetorDeputados(ColetorBase):
     Baixa a base principal de identificação dos deputados federais.
     """
 
+    anual = False
+
     def __init__(self):
         super().__init__(tipo="deputados")
 
-    def baixar(self):
-        if self._ja_baixado("geral"):
+    def url(self, ano="geral"):
+        return f"{URL_DADOS_ABERTOS_ARQUIVOS}/deputados/csv/deputados.csv"
+
+    def baixar(self, ano="geral", atualizar=False):
+        if self._ja_baixado("geral") and not atualizar:
             print("⏭️  Dados dos deputados já baixados. Pulando...")
             return
 
-        url = "https://dadosabertos.camara.leg.br/arquivos/deputados/csv/deputados.csv"
         print("🔽 Baixando base de identificação dos deputados...")
 
         try:
-            destino = os.path.join(DIRETORIO_RAW, self.tipo)
-            os.makedirs(destino, exist_ok=True)
-            caminho_csv = os.path.join(destino, "deputados.csv")
-
-            headers = {
-                "User-Agent": "Mozilla/5.0",
-                "Accept": "text/csv"
-            }
-
-            response = requests.get(url, headers=headers, stream=True)
-            response.raise_for_status()
-
-            with open(caminho_csv, "wb") as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
+            caminho_csv = os.path.join(DIRETORIO_RAW, self.tipo, "deputados.csv")
+            resultado = self._baixar_arquivo(self.url(), caminho_csv, ano="geral")
 
-            print(f"\n✅ Deputados salvos em: {caminho_csv}")
+            if resultado.status == "nao_modificado":
+                print("⏭️  Dados dos deputados sem alterações no servidor.")
+            else:
+                print(f"\n✅ Deputados salvos em: {caminho_csv}")
             self._atualizar_checkpoint("geral")
 
         except Exception as e:
             print(f"\n❌ Erro ao baixar dados dos deputados: {e}")
+            raise
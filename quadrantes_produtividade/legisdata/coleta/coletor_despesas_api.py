@@ -0,0 +1,287 @@
+# legisdata/coleta/coletor_despesas_api.py
+
+import asyncio
+import os
+import time
+import uuid
+from datetime import date
+from email.utils import parsedate_to_datetime
+from urllib.parse import parse_qs, urlparse
+
+import aiohttp
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from legisdata.config import (
+    ANO_ATUAL,
+    CABECALHOS_HTTP,
+    COMPRESSAO_PARQUET,
+    CONEXOES_API,
+    DIRETORIO_PROCESSED,
+    ITENS_POR_PAGINA,
+    REQUISICOES_POR_SEGUNDO_API,
+    TENTATIVAS_HTTP,
+    FATOR_BACKOFF_HTTP,
+    TIMEOUT_HTTP,
+    URL_API_DESPESAS,
+)
+from legisdata.dimensao import CHAVE, dimensao_deputados
+from legisdata.esquemas import esquema_arrow
+from legisdata.metricas import medir
+from .checkpoint import obter_checkpoint_despesas
+
+
+class LimitadorTaxa:
+    """
+    Balde de fichas assíncrono: no máximo `taxa` requisições por segundo,
+    com rajadas de até `capacidade`.
+    """
+
+    def __init__(self, taxa: float, capacidade: float = None):
+        self.taxa = float(taxa)
+        self.capacidade = float(capacidade or taxa)
+        self._fichas = self.capacidade
+        self._ultimo = None
+        self._lock = asyncio.Lock()
+
+    async def aguardar(self):
+        async with self._lock:
+            loop = asyncio.get_running_loop()
+            while True:
+                agora = loop.time()
+                if self._ultimo is not None:
+                    self._fichas = min(self.capacidade, self._fichas + (agora - self._ultimo) * self.taxa)
+                self._ultimo = agora
+                if self._fichas >= 1:
+                    self._fichas -= 1
+                    return
+                await asyncio.sleep((1 - self._fichas) / self.taxa)
+
+
+def _ultima_pagina(links) -> int:
+    for link in links or []:
+        if link.get("rel") == "last":
+            pagina = parse_qs(urlparse(link.get("href", "")).query).get("pagina")
+            if pagina:
+                return int(pagina[0])
+    return None
+
+
+def _segundos_retry_after(valor) -> float:
+    """
+    Espera pedida pelo cabeçalho Retry-After, em segundos ou como data HTTP
+    ("Wed, 21 Oct 2026 07:28:00 GMT"). None se ausente ou inválido.
+    """
+    if not valor:
+        return None
+    try:
+        return max(float(valor), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(valor).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+class ColetorDespesasAPI:
+    """
+    Coleta as despesas mensais por deputado na API da Câmara de forma
+    assíncrona.
+
+    Todas as requisições compartilham uma sessão aiohttp (pool de conexões
+    keep-alive) e um limitador de taxa; as páginas de cada (deputado, mês)
+    são buscadas em paralelo a partir do link "last" da primeira página;
+    429 e 5xx são repetidos com backoff. Os resultados são gravados em
+    Parquet em DIRETORIO_PROCESSED/despesas_api/ano=<ano>/ à medida que
+    chegam, com o id da API trocado pela chave da dimensão de deputados, e
+    o checkpoint é atualizado em lote depois de cada arquivo.
+
+    Só meses encerrados são coletados: um (deputado, mês) registrado no
+    checkpoint não é buscado de novo, e o mês corrente ainda recebe
+    despesas. Ele entra na coleta do mês seguinte.
+
+    É independente do `processar`: as mesmas despesas chegam pelo arquivo
+    anual da CEAP, que alimenta o cubo, então estes arquivos não entram nos
+    agregados. Roda por `python -m legisdata despesas`.
+    """
+
+    tipo = "despesas_api"
+
+    def __init__(self, requisicoes_por_segundo: float = REQUISICOES_POR_SEGUNDO_API,
+                 conexoes: int = CONEXOES_API, tentativas: int = TENTATIVAS_HTTP,
+                 fator_backoff: float = FATOR_BACKOFF_HTTP, linhas_por_arquivo: int = 50_000):
+        self.requisicoes_por_segundo = requisicoes_por_segundo
+        self.conexoes = conexoes
+        self.tentativas = tentativas
+        self.fator_backoff = fator_backoff
+        self.linhas_por_arquivo = linhas_por_arquivo
+        self.checkpoint = obter_checkpoint_despesas()
+        self.esquema = esquema_arrow(self.tipo)
+
+    def coletar(self, lista_ids, ano: int = ANO_ATUAL, meses=None) -> dict:
+        """
+        Coleta os (deputado, mês) encerrados ainda não registrados no
+        checkpoint. Retorna um resumo com linhas gravadas e chaves com erro.
+        """
+        hoje = date.today()
+        meses = [m for m in (meses or range(1, 13)) if (ano, m) < (hoje.year, hoje.month)]
+        if not meses:
+            print(f"⏭️  Nenhum mês encerrado de {ano} para coletar.")
+            return {"linhas": 0, "erros": {}}
+
+        pendentes = self.checkpoint.novas((id_dep, ano, mes) for id_dep in lista_ids for mes in meses)
+        if not pendentes:
+            print(f"⏭️  Despesas de {ano} já coletadas para todos os deputados.")
+            return {"linhas": 0, "erros": {}}
+
+        self.dimensao = dimensao_deputados()
+        if self.dimensao is None:
+            raise ValueError("Dimensão de deputados ainda não gerada: processe deputados antes das despesas.")
+
+        print(f"🚀 Coletando despesas de {ano}: {len(pendentes)} combinações deputado/mês...")
+        with medir("coleta", self.tipo, ano) as medicao:
+            resumo = asyncio.run(self._coletar(pendentes))
+            medicao.adicionar(linhas=resumo["linhas"])
+            if resumo["erros"]:
+                medicao.status = "erro"
+                medicao.erro = f"{len(resumo['erros'])} combinações deputado/mês com erro"
+        return resumo
+
+    async def _coletar(self, pendentes) -> dict:
+        self._limitador = LimitadorTaxa(self.requisicoes_por_segundo)
+        fila = asyncio.Queue(maxsize=self.conexoes * 4)
+        erros = {}
+        vagas = asyncio.Semaphore(self.conexoes)
+
+        conector = aiohttp.TCPConnector(limit=self.conexoes, keepalive_timeout=60)
+        timeout = aiohttp.ClientTimeout(total=TIMEOUT_HTTP)
+        cabecalhos = {**CABECALHOS_HTTP, "Accept": "application/json"}
+
+        async with aiohttp.ClientSession(connector=conector, timeout=timeout, headers=cabecalhos) as sessao:
+            escritor = asyncio.create_task(self._gravar(fila))
+
+            async def coletar_chave(chave):
+                async with vagas:
+                    try:
+                        registros = await self._coletar_mes(sessao, *chave)
+                    except Exception as e:
+                        erros[chave] = f"{type(e).__name__}: {e}"
+                        print(f"❌ {chave[0]} {chave[1]}/{chave[2]:02d}: {erros[chave]}")
+                        return
+                await fila.put((chave, registros))
+
+            produtores = asyncio.ensure_future(asyncio.gather(*(coletar_chave(chave) for chave in pendentes)))
+            await asyncio.wait({escritor, produtores}, return_when=asyncio.FIRST_COMPLETED)
+            if escritor.done():
+                # O escritor só termina antes dos produtores se falhou; sem
+                # ninguém consumindo a fila, eles travariam no put.
+                produtores.cancel()
+                await asyncio.gather(produtores, return_exceptions=True)
+                await escritor
+            await fila.put(None)
+            linhas = await escritor
+
+        print(f"✅ {linhas} despesas gravadas; {len(erros)} combinações com erro.")
+        return {"linhas": linhas, "erros": erros}
+
+    async def _obter_json(self, sessao, url, params) -> dict:
+        for tentativa in range(self.tentativas + 1):
+            await self._limitador.aguardar()
+            try:
+                async with sessao.get(url, params=params) as resposta:
+                    if resposta.status == 429 or resposta.status >= 500:
+                        if tentativa == self.tentativas:
+                            resposta.raise_for_status()
+                        espera = _segundos_retry_after(resposta.headers.get("Retry-After"))
+                        if not espera:
+                            espera = self.fator_backoff * 2 ** tentativa
+                        await asyncio.sleep(espera)
+                        continue
+                    resposta.raise_for_status()
+                    return await resposta.json(content_type=None)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if tentativa == self.tentativas:
+                    raise
+                await asyncio.sleep(self.fator_backoff * 2 ** tentativa)
+
+    async def _coletar_mes(self, sessao, id_dep, ano, mes) -> list:
+        url = URL_API_DESPESAS.format(id=id_dep)
+        params = {"ano": ano, "mes": mes, "itens": ITENS_POR_PAGINA}
+
+        primeira = await self._obter_json(sessao, url, {**params, "pagina": 1})
+        registros = list(primeira.get("dados", []))
+        ultima = _ultima_pagina(primeira.get("links"))
+
+        if ultima is not None:
+            paginas = await asyncio.gather(*(
+                self._obter_json(sessao, url, {**params, "pagina": p}) for p in range(2, ultima + 1)
+            ))
+            for pagina in paginas:
+                registros.extend(pagina.get("dados", []))
+        elif registros:
+            # Sem link "last": segue página a página até vir vazia.
+            pagina = 2
+            while True:
+                dados = (await self._obter_json(sessao, url, {**params, "pagina": pagina})).get("dados", [])
+                if not dados:
+                    break
+                registros.extend(dados)
+                pagina += 1
+
+        for registro in registros:
+            registro["id_deputado"] = id_dep
+        return registros
+
+    async def _gravar(self, fila) -> int:
+        """
+        Consome a fila e grava arquivos Parquet completos a cada
+        `linhas_por_arquivo` linhas, na mesma transação que registra as
+        chaves no checkpoint.
+        """
+        lotes, linhas, total = [], 0, 0
+
+        while True:
+            item = await fila.get()
+            if item is not None:
+                # Só chegam meses encerrados: registrados mesmo sem despesas.
+                lotes.append(item)
+                linhas += len(item[1])
+
+            if item is None or linhas >= self.linhas_por_arquivo:
+                if lotes:
+                    total += await asyncio.to_thread(self._descarregar, lotes)
+                lotes, linhas = [], 0
+            if item is None:
+                return total
+
+    def _descarregar(self, lotes) -> int:
+        gravadas = 0
+
+        def gravar(novas):
+            # Só as chaves que nenhum outro processo registrou nesse meio-tempo.
+            nonlocal gravadas
+            novas = set(novas)
+            registros = [r for chave, registros in lotes if chave in novas for r in registros]
+            self._gravar_partes(registros)
+            gravadas = len(registros)
+
+        self.checkpoint.registrar_lote([chave for chave, _ in lotes], gravar=gravar)
+        return gravadas
+
+    def _gravar_partes(self, registros):
+        if not registros:
+            return
+        tabela = pa.Table.from_pylist(registros, schema=self.esquema)
+        tabela = tabela.set_column(tabela.schema.get_field_index("id_deputado"), CHAVE,
+                                   self.dimensao.chaves_por_id(tabela["id_deputado"]))
+        for ano in sorted({r["ano"] for r in registros}):
+            # O ano vai no caminho da partição (ano=<ano>), não como coluna.
+            parte = tabela.filter(pc.equal(tabela["ano"], ano)).drop_columns(["ano"])
+            destino = os.path.join(
+                DIRETORIO_PROCESSED, self.tipo, f"ano={ano}", f"parte-{uuid.uuid4().hex}.parquet"
+            )
+            os.makedirs(os.path.dirname(destino), exist_ok=True)
+            pq.write_table(parte, destino + ".part", compression=COMPRESSAO_PARQUET)
+            os.replace(destino + ".part", destino)
@@ -1,47 +1,65 @@
-# legisdata/coleta/coletor_eventos_presenca.py
+# legisdata/coleta/coletor_eventos.py
 
 import os
-import requests
-from legisdata.config import DIRETORIO_RAW
+from legisdata.config import DIRETORIO_RAW, URL_DADOS_ABERTOS_ARQUIVOS
 from .coletor_base import ColetorBase
 
 
 class ColetorEventos(ColetorBase):
     """
-    Baixa os registros de presença dos deputados em eventos da Câmara por ano.
+    Baixa os eventos da Câmara (sessões, reuniões, audiências) por ano.
     """
 
+    # Subclasses trocam o dataset, o nome do arquivo da Câmara e o texto.
+    tipo_dataset = "eventos"
+    arquivo = "eventos"
+    descricao = "eventos"
+
     def __init__(self):
-        super().__init__(tipo="eventos")
+        super().__init__(tipo=self.tipo_dataset)
+
+    def url(self, ano):
+        return f"{URL_DADOS_ABERTOS_ARQUIVOS}/{self.arquivo}/csv/{self.arquivo}-{ano}.csv"
 
-    def baixar(self, ano: int):
-        if self._ja_baixado(ano):
-            print(f"⏭️  Presenças em eventos {ano} já baixadas. Pulando...")
+    def baixar(self, ano: int, atualizar: bool = False):
+        if self._ja_baixado(ano) and not atualizar:
+            print(f"⏭️  {self.descricao.capitalize()} {ano} já baixados. Pulando...")
             return
 
-        url = f"https://dadosabertos.camara.leg.br/arquivos/eventos/csv/eventos-{ano}.csv"
-        print(f"🔽 Baixando presenças em eventos de {ano}...")
+        print(f"🔽 Baixando {self.descricao} de {ano}...")
 
         try:
-            destino = os.path.join(DIRETORIO_RAW, self.tipo)
-            os.makedirs(destino, exist_ok=True)
-            caminho_csv = os.path.join(destino, f"{ano}.csv")
+            caminho_csv = os.path.join(DIRETORIO_RAW, self.tipo, f"{ano}.csv")
+            resultado = self._baixar_arquivo(self.url(ano), caminho_csv, ano=ano)
 
-            headers = {
-                "User-Agent": "Mozilla/5.0",
-                "Accept": "text/csv"
-            }
+            if resultado.status == "nao_modificado":
+                print(f"⏭️  {self.descricao.capitalize()} {ano} sem alterações no servidor.")
+            else:
+                print(f"\n✅ {self.descricao.capitalize()} {ano} salvos em: {caminho_csv}")
+            self._atualizar_checkpoint(ano)
 
-            response = requests.get(url, headers=headers, stream=True)
-            response.raise_for_status()
+        except Exception as e:
+            print(f"\n❌ Erro ao baixar {self.descricao} {ano}: {e}")
+            raise
 
-            with open(caminho_csv, "wb") as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
 
-            print(f"\n✅ Presenças em eventos {ano} salvas em: {caminho_csv}")
-            self._atualizar_checkpoint(ano)
+class ColetorPresencasEventos(ColetorEventos):
+    """
+    Baixa as presenças dos deputados em eventos por ano (um registro por
+    deputado presente em cada evento).
+    """
 
-        except Exception as e:
-            print(f"\n❌ Erro ao baixar presenças em eventos {ano}: {e}")
+    tipo_dataset = "presencas"
+    arquivo = "eventosPresencaDeputados"
+    descricao = "registros de presença em eventos"
+
+
+class ColetorOrgaosEventos(ColetorEventos):
+    """
+    Baixa a relação entre eventos e os órgãos (comissões, plenário) que os
+    promoveram, por ano.
+    """
+
+    tipo_dataset = "eventos_orgaos"
+    arquivo = "eventosOrgaos"
+    descricao = "órgãos dos eventos"
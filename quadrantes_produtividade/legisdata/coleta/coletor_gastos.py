@@ -1,42 +1,115 @@
 # legisdata/coleta/coletor_gastos.py
 
 import os
-import wget
-import tempfile
-import shutil
-from legisdata.config import DIRETORIO_RAW
-from legisdata.utils.io import extrair_csv_de_zip
+from legisdata.config import DIRETORIO_RAW, URL_CEAP_ZIP, ARMAZENAMENTO_CEAP, CONVERTER_NA_COLETA
+from legisdata.manifesto import novo_hash
+from legisdata.utils.io import extrair_csv_de_zip, abrir_csv_de_zip, FluxoEspelhado
 from .coletor_base import ColetorBase
 
 
 class ColetorGastosCEAP(ColetorBase):
-    def __init__(self):
+    """
+    Baixa os arquivos anuais da CEAP (.csv.zip) direto para data/raw/gastos.
+
+    Conforme `armazenamento`, o CSV é descomprimido em streaming para
+    <ano>.csv ("csv"), o zip é mantido e lido sob demanda ("zip"), ou ambos.
+    Com `converter=True`, o Parquet processado é gerado no mesmo passe.
+
+    No modo "csv" o zip é apagado após a extração, e o ETag/Last-Modified
+    guardados passam a valer para o CSV extraído: a revalidação diária do
+    ano corrente recebe 304 sem baixar o zip de novo.
+    """
+
+    def __init__(self, armazenamento: str = ARMAZENAMENTO_CEAP, converter: bool = CONVERTER_NA_COLETA):
         super().__init__(tipo="gastos")
+        if armazenamento not in ("csv", "zip", "ambos"):
+            raise ValueError(f"Armazenamento inválido: {armazenamento!r}")
+        self.armazenamento = armazenamento
+        self.converter = converter
+
+    def _pode_converter(self, ano) -> bool:
+        # O Parquet de gastos guarda a chave da dimensão de deputados; sem ela
+        # (deputados ainda não processados), a conversão fica para `processar`.
+        # Um ano já convertido com índice de linhas também fica: lá ele é
+        # atualizado só pela diferença, sem reconverter o ano inteiro.
+        if not self.converter:
+            return False
+        from legisdata.dimensao import caminho_dimensao_deputados
+        from legisdata.processamento import pode_aplicar_delta
+        return os.path.exists(caminho_dimensao_deputados()) and not pode_aplicar_delta(self.tipo, ano)
 
-    def baixar(self, ano: int):
-        if self._ja_baixado(ano):
+    def _extrair(self, zip_path, destino, ano, hash_zip):
+        """
+        Descomprime o CSV do zip; com conversão ativa, o mesmo fluxo alimenta o
+        Parquet e o CSV bruto (ou só o Parquet, no modo "zip"). Registra no
+        manifesto o hash do arquivo bruto que ficou em disco.
+        """
+        converter = self._pode_converter(ano)
+        if self.armazenamento == "zip":
+            self._registrar_manifesto(ano, zip_path, hash_zip)
+            if converter:
+                from legisdata.processamento import converter_para_parquet, registrar_conversao
+                with abrir_csv_de_zip(zip_path) as membro:
+                    converter_para_parquet(self.tipo, ano, fluxo=membro)
+                registrar_conversao(self.tipo, ano)
+            return
+
+        caminho_csv = os.path.join(destino, f"{ano}.csv")
+        hash_obj = novo_hash()
+
+        if not converter:
+            extrair_csv_de_zip(zip_path, destino, f"{ano}.csv", hash_obj=hash_obj)
+            self._registrar_manifesto(ano, caminho_csv, hash_obj.hexdigest())
+            return
+
+        from legisdata.processamento import converter_para_parquet, registrar_conversao
+
+        parcial = caminho_csv + ".part"
+        with abrir_csv_de_zip(zip_path) as membro, open(parcial, "wb") as copia:
+            converter_para_parquet(self.tipo, ano, fluxo=FluxoEspelhado(membro, copia, hash_obj))
+        os.replace(parcial, caminho_csv)
+        self._registrar_manifesto(ano, caminho_csv, hash_obj.hexdigest())
+        registrar_conversao(self.tipo, ano)
+
+    def url(self, ano):
+        return URL_CEAP_ZIP.format(ano=ano)
+
+    def baixar(self, ano: int, atualizar: bool = False):
+        if self._ja_baixado(ano) and not atualizar:
             print(f"⏭️  Gastos {ano} já baixado. Pulando...")
             return
 
-        url = f"http://www.camara.leg.br/cotas/Ano-{ano}.csv.zip"
         print(f"🔽 Baixando arquivo CEAP {ano}...")
 
-        try:
-            temp_dir = tempfile.mkdtemp()
-            zip_path = os.path.join(temp_dir, f"{ano}.zip")
-            wget.download(url, out=zip_path)
+        destino = os.path.join(DIRETORIO_RAW, self.tipo)
+        zip_path = os.path.join(destino, f"{ano}.csv.zip")
+        caminho_csv = os.path.join(destino, f"{ano}.csv")
 
-            caminho_csv = extrair_csv_de_zip(zip_path, temp_dir)
+        try:
+            resultado = self._baixar_arquivo(
+                self.url(ano), zip_path, cabecalhos={"Accept": "application/zip"},
+                caminho_validado=caminho_csv if self.armazenamento == "csv" else None,
+            )
+            # Com 304, um zip ainda em disco no modo "csv" sobrou de uma
+            # extração interrompida: é a versão validada, ainda não extraída.
+            pendente = self.armazenamento == "csv" and os.path.exists(zip_path)
 
-            destino = os.path.join(DIRETORIO_RAW, self.tipo)
-            os.makedirs(destino, exist_ok=True)
-            shutil.move(caminho_csv, os.path.join(destino, f"{ano}.csv"))
+            if resultado.status == "nao_modificado" and not pendente:
+                print(f"⏭️  CEAP {ano} sem alterações no servidor.")
+            elif self.armazenamento == "zip":
+                # Um CSV antigo teria precedência na leitura; o zip é a versão atual.
+                if os.path.exists(caminho_csv):
+                    os.remove(caminho_csv)
+                self._extrair(zip_path, destino, ano, resultado.hash)
+                print(f"\n✅ CEAP {ano} mantido compactado em: {zip_path}")
+            else:
+                self._extrair(zip_path, destino, ano, resultado.hash)
+                if self.armazenamento == "csv":
+                    os.remove(zip_path)
+                print(f"\n✅ CEAP {ano} salvo em: {caminho_csv}")
 
-            print(f"\n✅ CEAP {ano} salvo em: {destino}/{ano}.csv")
             self._atualizar_checkpoint(ano)
 
         except Exception as e:
             print(f"\n❌ Erro ao baixar gastos {ano}: {e}")
-
-        finally:
-            shutil.rmtree(temp_dir, ignore_errors=True)
+            raise
@@ -1,9 +1,7 @@
 # legisdata/coleta/coletor_proposicoes.py
 
 import os
-import requests
-from http.client import IncompleteRead
-from legisdata.config import DIRETORIO_RAW
+from legisdata.config import DIRETORIO_RAW, URL_DADOS_ABERTOS_ARQUIVOS
 from .coletor_base import ColetorBase
 
 
@@ -11,38 +9,27 @@ class ColetorProposicoes(ColetorBase):
     def __init__(self):
         super().__init__(tipo="proposicoes")
 
-    def baixar(self, ano: int):
-        if self._ja_baixado(ano):
+    def url(self, ano):
+        return f"{URL_DADOS_ABERTOS_ARQUIVOS}/proposicoes/csv/proposicoes-{ano}.csv"
+
+    def baixar(self, ano: int, atualizar: bool = False):
+        if self._ja_baixado(ano) and not atualizar:
             print(f"⏭️  Proposições {ano} já baixadas. Pulando...")
             return
 
-        url = f"https://dadosabertos.camara.leg.br/arquivos/proposicoes/csv/proposicoes-{ano}.csv"
         print(f"🔽 Baixando proposições de {ano}...")
 
-        destino = os.path.join(DIRETORIO_RAW, self.tipo)
-        os.makedirs(destino, exist_ok=True)
-        caminho_csv = os.path.join(destino, f"{ano}.csv")
+        caminho_csv = os.path.join(DIRETORIO_RAW, self.tipo, f"{ano}.csv")
 
         try:
-            headers = {
-                "User-Agent": "Mozilla/5.0",
-                "Accept": "text/csv"
-            }
-
-            response = requests.get(url, headers=headers, stream=True)
-            response.raise_for_status()
+            resultado = self._baixar_arquivo(self.url(ano), caminho_csv, ano=ano)
 
-            with open(caminho_csv, "wb") as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
-
-            print(f"\n✅ Proposições {ano} salvas em: {caminho_csv}")
+            if resultado.status == "nao_modificado":
+                print(f"⏭️  Proposições {ano} sem alterações no servidor.")
+            else:
+                print(f"\n✅ Proposições {ano} salvas em: {caminho_csv}")
             self._atualizar_checkpoint(ano)
 
-        except IncompleteRead as e:
-            print(f"\n⚠️ IncompleteRead ignorado para proposições {ano}: {e}")
-            self._atualizar_checkpoint(ano)  # ainda marca como baixado
-
         except Exception as e:
             print(f"\n❌ Erro ao baixar proposições {ano}: {e}")
+            raise
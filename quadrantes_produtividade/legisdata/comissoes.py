@@ -0,0 +1,214 @@
+# legisdata/comissoes.py
+#
+# Índice de intervalos da composição das comissões, para responder em lote
+# "em quais comissões, com qual cargo, o deputado estava no instante t" (e
+# "quem estava no órgão no instante t"). Em processed/indice_comissoes/:
+#
+#   periodos.arrow      um período por linha: chave_deputado, idOrgao,
+#                       siglaOrgao, titulo, inicio e fim (dias desde 1970)
+#   por_deputado.arrow  (balde, periodo) ordenado, balde = chave * 2^16 + ano
+#   por_orgao.arrow     (balde, periodo) ordenado, balde = idOrgao * 2^16 + ano
+#
+# Cada período entra no balde de cada ano que cobre; períodos em aberto vão
+# até o balde seguinte ao último ano dos dados, que também recebe todas as
+# consultas posteriores. Uma consulta é uma busca binária pelo balde do seu
+# ano e um filtro inicio <= t <= fim sobre os poucos períodos dele: milhões
+# de consultas viram algumas operações numpy, sem junção quadrática.
+
+import json
+import os
+import threading
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from legisdata.cache import versoes_particoes
+from legisdata.config import DIRETORIO_PROCESSED
+from legisdata.dimensao import CHAVE
+from legisdata.manifesto import obter_manifesto
+from legisdata.metricas import medir
+from legisdata.processamento import ESTAGIO_PARQUET, caminho_processado
+
+TIPO_INDICE_COMISSOES = "indice_comissoes"
+ESTAGIO_INTERVALOS = "intervalos"
+
+# Bits reservados ao ano no balde.
+BITS_ANO = 16
+
+# fim dos períodos em aberto.
+_SEM_FIM = np.iinfo(np.int64).max
+
+
+def _caminho(nome: str) -> str:
+    return os.path.join(DIRETORIO_PROCESSED, TIPO_INDICE_COMISSOES, f"{nome}.arrow")
+
+
+def _dias(instantes) -> np.ndarray:
+    """
+    Dias desde 1970 de datas ou timestamps (numpy, pandas ou Arrow).
+    """
+    if isinstance(instantes, (pa.Array, pa.ChunkedArray)):
+        instantes = pc.cast(instantes, pa.timestamp("s")).to_numpy()
+    return np.asarray(instantes, dtype="datetime64[D]").astype(np.int64)
+
+
+def _anos(dias: np.ndarray) -> np.ndarray:
+    return dias.astype("datetime64[D]").astype("datetime64[Y]").astype(np.int64) + 1970
+
+
+def _baldes(grupos: np.ndarray, anos: np.ndarray) -> np.ndarray:
+    return (grupos.astype(np.int64) << BITS_ANO) | anos
+
+
+def _ordenar_baldes(grupos, primeiro, ultimo) -> pa.Table:
+    # Um (balde, periodo) por ano coberto por cada período.
+    quantos = ultimo - primeiro + 1
+    periodos = np.repeat(np.arange(len(grupos)), quantos)
+    anos = np.arange(quantos.sum()) - np.repeat(np.cumsum(quantos) - quantos, quantos) + primeiro[periodos]
+    baldes = _baldes(grupos[periodos], anos)
+    ordem = np.argsort(baldes, kind="stable")
+    return pa.table({"balde": baldes[ordem], "periodo": periodos[ordem].astype(np.int32)})
+
+
+def _gravar(tabela: pa.Table, caminho: str):
+    with pa.OSFile(caminho + ".part", "wb") as arquivo:
+        with pa.ipc.new_file(arquivo, tabela.schema) as escritor:
+            escritor.write_table(tabela)
+    os.replace(caminho + ".part", caminho)
+
+
+def _ler(caminho: str) -> pa.Table:
+    with pa.memory_map(caminho, "r") as origem:
+        return pa.ipc.open_file(origem).read_all().combine_chunks()
+
+
+def construir_indice_comissoes(forcar: bool = False) -> bool:
+    """
+    (Re)constrói o índice se o Parquet de comissões mudou desde a última
+    construção. Retorna se reconstruiu.
+    """
+    manifesto = obter_manifesto()
+    versao = manifesto.hash_derivado(ESTAGIO_PARQUET, "comissoes", "geral")
+    if versao is None:
+        return False
+    if (not forcar and os.path.exists(_caminho("por_orgao"))
+            and not manifesto.precisa_reconstruir(ESTAGIO_INTERVALOS, TIPO_INDICE_COMISSOES, "geral", versao)):
+        return False
+
+    print("🪑 Indexando períodos dos membros das comissões...")
+    with medir("indice", TIPO_INDICE_COMISSOES, "geral") as medicao:
+        tabela = pq.read_table(caminho_processado("comissoes", "geral"),
+                               columns=[CHAVE, "idOrgao", "siglaOrgao", "titulo", "dataInicio", "dataFim"])
+        tabela = tabela.filter(pc.and_(pc.and_(pc.is_valid(tabela[CHAVE]), pc.is_valid(tabela["idOrgao"])),
+                                       pc.is_valid(tabela["dataInicio"])))
+        inicio = _dias(tabela["dataInicio"])
+        aberto = tabela["dataFim"].is_null().to_numpy(zero_copy_only=False)
+        fim = np.where(aberto, _SEM_FIM, _dias(pc.fill_null(tabela["dataFim"], tabela["dataInicio"])))
+
+        # Períodos em aberto (e os que terminam depois dos dados) cobrem até
+        # o balde seguinte ao último ano conhecido.
+        datas = np.concatenate([inicio, fim[~aberto]])
+        teto = int(_anos(datas).max()) + 1 if len(datas) else 1970
+        primeiro = _anos(inicio)
+        ultimo = np.where(aberto, teto, np.minimum(_anos(np.where(aberto, 0, fim)), teto))
+        ultimo = np.maximum(ultimo, primeiro)
+
+        periodos = pa.table({
+            CHAVE: tabela[CHAVE],
+            "idOrgao": tabela["idOrgao"],
+            "siglaOrgao": tabela["siglaOrgao"],
+            "titulo": tabela["titulo"],
+            "inicio": inicio,
+            "fim": fim,
+        }).replace_schema_metadata({"teto": json.dumps(teto)})
+
+        os.makedirs(os.path.dirname(_caminho("periodos")), exist_ok=True)
+        _gravar(periodos, _caminho("periodos"))
+        _gravar(_ordenar_baldes(tabela[CHAVE].to_numpy(), primeiro, ultimo), _caminho("por_deputado"))
+        _gravar(_ordenar_baldes(tabela["idOrgao"].to_numpy(), primeiro, ultimo), _caminho("por_orgao"))
+        medicao.adicionar(linhas=periodos.num_rows)
+    manifesto.registrar_derivado(ESTAGIO_INTERVALOS, TIPO_INDICE_COMISSOES, "geral", versao)
+    print(f"✅ Índice de comissões: {periodos.num_rows} períodos.")
+    return True
+
+
+class IndiceComissoes:
+    """
+    Consultas em lote sobre o índice mapeado em memória. `instantes` aceita
+    datas ou timestamps (numpy, pandas ou Arrow), um por consulta; a coluna
+    `linha` do resultado é a posição da consulta na entrada.
+    """
+
+    def __init__(self):
+        periodos = _ler(_caminho("periodos"))
+        self.teto = json.loads(periodos.schema.metadata[b"teto"])
+        self.periodos = periodos
+        self.inicio = periodos["inicio"].chunk(0).to_numpy()
+        self.fim = periodos["fim"].chunk(0).to_numpy()
+        self.indices = {}
+        for nome in ("por_deputado", "por_orgao"):
+            tabela = _ler(_caminho(nome))
+            self.indices[nome] = (tabela["balde"].chunk(0).to_numpy(), tabela["periodo"].chunk(0).to_numpy())
+
+    def _buscar(self, nome: str, grupos, instantes):
+        """
+        (consultas, periodos): um par por período ativo no instante de cada
+        consulta, entre os do grupo (deputado ou órgão) da consulta.
+        """
+        baldes_indice, periodos_indice = self.indices[nome]
+        dias = _dias(instantes)
+        grupos = np.asarray(grupos, dtype=np.int64)
+        baldes = _baldes(grupos, np.minimum(_anos(dias), self.teto))
+        inicio = np.searchsorted(baldes_indice, baldes, side="left")
+        quantos = np.searchsorted(baldes_indice, baldes, side="right") - inicio
+
+        consultas = np.repeat(np.arange(len(baldes)), quantos)
+        deslocamento = np.arange(quantos.sum()) - np.repeat(np.cumsum(quantos) - quantos, quantos)
+        periodos = periodos_indice[np.repeat(inicio, quantos) + deslocamento]
+        ativo = (self.inicio[periodos] <= dias[consultas]) & (dias[consultas] <= self.fim[periodos])
+        return consultas[ativo], periodos[ativo]
+
+    def _quadro(self, consultas, periodos, colunas):
+        import pandas as pd
+
+        quadro = {"linha": consultas}
+        for nome in colunas:
+            coluna = self.periodos[nome].chunk(0)
+            if pa.types.is_dictionary(coluna.type):
+                codigos = coluna.indices.to_numpy(zero_copy_only=False)[periodos]
+                quadro[nome] = pd.Categorical.from_codes(codigos, coluna.dictionary.to_pylist())
+            else:
+                quadro[nome] = coluna.to_numpy(zero_copy_only=False)[periodos]
+        return pd.DataFrame(quadro)
+
+    def ativos(self, chaves, instantes):
+        """
+        Comissões e cargos de cada (chave_deputado, instante): DataFrame
+        (linha, idOrgao, siglaOrgao, titulo), uma linha por período ativo.
+        """
+        consultas, periodos = self._buscar("por_deputado", chaves, instantes)
+        return self._quadro(consultas, periodos, ["idOrgao", "siglaOrgao", "titulo"])
+
+    def membros(self, orgaos, instantes):
+        """
+        Membros de cada (idOrgao, instante): DataFrame (linha,
+        chave_deputado, titulo), uma linha por período ativo.
+        """
+        consultas, periodos = self._buscar("por_orgao", orgaos, instantes)
+        return self._quadro(consultas, periodos, [CHAVE, "titulo"])
+
+
+# Índice compartilhado pelo processo, reaberto quando o Parquet de origem muda.
+_indice = (None, None)
+_indice_lock = threading.Lock()
+
+
+def obter_indice_comissoes() -> IndiceComissoes:
+    global _indice
+    versao = versoes_particoes(ESTAGIO_INTERVALOS, TIPO_INDICE_COMISSOES)
+    with _indice_lock:
+        if _indice[0] != versao:
+            _indice = (versao, IndiceComissoes())
+        return _indice[1]
@@ -4,16 +4,107 @@ from datetime import date
 # Diretório raiz do projeto (relativo ao settings.py)
 ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
 
-# Diretórios de dados
-DIRETORIO_RAW = os.path.join(ROOT_DIR, "..", "data", "raw")
-DIRETORIO_PROCESSED = os.path.join(ROOT_DIR, "..", "data", "processed")
-DIRETORIO_CHECKPOINT = os.path.join(ROOT_DIR, "..", "checkpoints")
+# Diretórios de dados (LEGISDATA_DIRETORIO_DADOS, LEGISDATA_DIRETORIO_CHECKPOINT
+# e LEGISDATA_DIRETORIO_LOGS permitem rodar contra outra área, como nos
+# benchmarks). Os logs de cada execução ficam fora do controle de versão
+# (logs/ está no .gitignore).
+DIRETORIO_DADOS = os.environ.get("LEGISDATA_DIRETORIO_DADOS", os.path.join(ROOT_DIR, "..", "data"))
+DIRETORIO_RAW = os.path.join(DIRETORIO_DADOS, "raw")
+DIRETORIO_PROCESSED = os.path.join(DIRETORIO_DADOS, "processed")
+DIRETORIO_CHECKPOINT = os.environ.get("LEGISDATA_DIRETORIO_CHECKPOINT", os.path.join(ROOT_DIR, "..", "checkpoints"))
+DIRETORIO_LOGS = os.environ.get("LEGISDATA_DIRETORIO_LOGS", os.path.join(ROOT_DIR, "..", "logs"))
 
 # Arquivo central de checkpoints de arquivos baixados
 ARQUIVO_CHECKPOINT = os.path.join(DIRETORIO_CHECKPOINT, "arquivos_baixados.csv")
 
+# Checkpoint legado da coleta de despesas por deputado/mês (migrado para o SQLite)
+ARQUIVO_CHECKPOINT_GASTOS = os.path.join(DIRETORIO_CHECKPOINT, "gastos.csv")
+
+# Índice SQLite que substitui o CSV acima (migrado automaticamente na primeira abertura)
+ARQUIVO_CHECKPOINT_DB = os.path.join(DIRETORIO_CHECKPOINT, "arquivos_baixados.sqlite")
+
+# Manifesto de versões (tamanho, mtime e hash) dos arquivos brutos e derivados
+ARQUIVO_MANIFESTO = os.path.join(DIRETORIO_CHECKPOINT, "manifesto.sqlite")
+ALGORITMO_HASH = "blake2b"
+
 # Ano atual (pode ser usado em loops)
 ANO_ATUAL = date.today().year
 
+# Primeiro ano coletado nas cargas históricas (backfill)
+ANO_INICIAL_COLETA = 2008
+
+# Endereços das bases de dados abertos da Câmara (sobrescrevíveis por variáveis
+# de ambiente para apontar para um servidor local)
+URL_DADOS_ABERTOS_ARQUIVOS = os.environ.get(
+    "LEGISDATA_URL_DADOS_ABERTOS_ARQUIVOS", "https://dadosabertos.camara.leg.br/arquivos"
+)
+URL_CEAP_ZIP = os.environ.get("LEGISDATA_URL_CEAP_ZIP", "http://www.camara.leg.br/cotas/Ano-{ano}.csv.zip")
+URL_API_CAMARA = os.environ.get("LEGISDATA_URL_API_CAMARA", "https://dadosabertos.camara.leg.br/api/v2")
+URL_API_DESPESAS = URL_API_CAMARA + "/deputados/{id}/despesas"
+URL_API_LISTA_DEPUTADOS = URL_API_CAMARA + "/deputados"
+
+# Como guardar os arquivos anuais da CEAP: "csv" (só o CSV extraído),
+# "zip" (só o .csv.zip, lido sob demanda) ou "ambos"
+ARMAZENAMENTO_CEAP = "csv"
+
+# Converte o CSV da CEAP para Parquet no mesmo passe da extração do zip
+CONVERTER_NA_COLETA = False
+
+# Compressão dos arquivos Parquet em data/processed
+COMPRESSAO_PARQUET = "zstd"
+
+# Linhas por grupo nas partições mensais ordenadas (gastos). Grupos menores
+# deixam os filtros por UF/partido pularem mais dados, com um pouco mais de
+# metadados por arquivo.
+LINHAS_POR_GRUPO_PARQUET = 4_096
+
+# Reprocessa arquivos republicados (a CEAP do ano corrente) pela diferença
+# de linhas para a última conversão, regravando só os meses alterados
+CONVERSAO_POR_DIFERENCA = True
+
+# Cliente HTTP compartilhado pelos coletores
+CABECALHOS_HTTP = {
+    "User-Agent": "Mozilla/5.0",
+    "Accept": "text/csv"
+}
+TAMANHO_CHUNK_DOWNLOAD = 1024 * 1024
+TAMANHO_POOL_HTTP = 16
+TENTATIVAS_HTTP = 5
+FATOR_BACKOFF_HTTP = 1.0  # espera 1s, 2s, 4s... entre tentativas
+TIMEOUT_HTTP = 60
+
+# Coleta assíncrona na API de dados abertos
+REQUISICOES_POR_SEGUNDO_API = 10
+CONEXOES_API = 16
+
+# Limites do agendador de downloads
+MAX_DOWNLOADS_PARALELOS = 8
+MAX_DOWNLOADS_POR_HOST = 4
+BANDA_MAXIMA_BYTES_POR_SEGUNDO = None  # None = sem limite
+
+# Processos do processamento paralelo por (tipo, ano); None = um por núcleo
+PROCESSOS_PROCESSAMENTO = None
+
+# Relatórios HTML por deputado e processos que os renderizam; None = um por núcleo
+DIRETORIO_RELATORIOS = os.path.join(DIRETORIO_DADOS, "relatorios")
+PROCESSOS_RELATORIOS = None
+
+# Snapshot dos agregados para o dashboard (Arrow IPC sem compressão, mapeado
+# em memória por todos os workers), uma versão por diretório
+DIRETORIO_SNAPSHOT = os.path.join(DIRETORIO_PROCESSED, "snapshot")
+
+# Métricas por estágio e (tipo, ano): log JSON (uma linha por job) e arquivo no
+# formato texto do Prometheus (para o textfile collector do node_exporter)
+ARQUIVO_LOG_METRICAS = os.path.join(DIRETORIO_LOGS, "metricas.jsonl")
+ARQUIVO_METRICAS_PROMETHEUS = os.path.join(DIRETORIO_LOGS, "legisdata.prom")
+
+# Cache de consultas do dashboard: LRU em memória por processo e, se
+# DIRETORIO_CACHE_CONSULTAS for definido, cache em disco compartilhado
+# entre os workers
+MAX_ENTRADAS_CACHE_CONSULTAS = 256
+MAX_BYTES_CACHE_CONSULTAS = 256 * 1024 * 1024
+DIRETORIO_CACHE_CONSULTAS = None  # ex.: os.path.join(ROOT_DIR, "..", "data", "cache")
+MAX_BYTES_CACHE_DISCO = 2 * 1024 * 1024 * 1024
+
 # Quantidade de itens por página nas requisições (se necessário)
 ITENS_POR_PAGINA = 100
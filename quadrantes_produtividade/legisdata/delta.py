@@ -0,0 +1,295 @@
+# legisdata/delta.py
+#
+# Índice de linhas para ingestão por diferença dos arquivos republicados (a
+# CEAP do ano corrente é republicada inteira todo dia, com poucas linhas
+# alteradas). Para cada linha convertida guarda:
+#
+#   chave     uint64  hash das colunas `chave_linha` do esquema (para a CEAP,
+#                     documento, parcela e deputado) e da ocorrência da
+#                     chave no arquivo, para chaves repetidas
+#   conteudo  uint64  hash de todas as colunas convertidas
+#   mes       int8    partição mensal em que a linha foi gravada
+#
+# ordenado por chave, em processed/<tipo>/_linhas/ano=<ano>.arrow (o prefixo
+# "_" deixa o arquivo fora dos leitores de dataset). Comparar o índice
+# gravado com o do arquivo novo classifica as linhas em novas, alteradas e
+# removidas e diz quais meses precisam ser regravados. Os metadados guardam
+# um digesto por mês, que os agregados usam para saber o que refazer.
+#
+# Os hashes saem direto dos buffers Arrow (sem passar por pandas), e uma
+# coluna em dicionário tem o mesmo hash da mesma coluna em texto simples,
+# como as colunas `ordenar` ficam gravadas nos meses.
+
+import json
+import os
+from dataclasses import dataclass, field
+
+import numpy as np
+import pyarrow as pa
+
+from legisdata.config import DIRETORIO_PROCESSED
+from legisdata.esquemas import ESQUEMAS
+
+# Mistura a ocorrência na chave: chaves repetidas no arquivo viram chaves
+# distintas, na ordem em que aparecem.
+_MISTURA_OCORRENCIA = np.uint64(0x9E3779B97F4A7C15)
+
+_HASH_NULO = np.uint64(0x5BD1E9955BD1E995)
+_PRIMO_TEXTO = np.uint64(0x100000001B3)
+# Pesos de cada posição de byte dentro de um texto; crescem sob demanda.
+_POTENCIAS = np.cumprod(np.full(1024, _PRIMO_TEXTO, dtype=np.uint64))
+
+
+def caminho_indice_linhas(tipo: str, ano) -> str:
+    return os.path.join(DIRETORIO_PROCESSED, tipo, "_linhas", f"ano={ano}.arrow")
+
+
+def _misturar(valores: np.ndarray) -> np.ndarray:
+    # Finalizador do splitmix64: espalha bits vizinhos pelos 64 bits.
+    valores = valores ^ (valores >> np.uint64(30))
+    valores = valores * np.uint64(0xBF58476D1CE4E5B9)
+    valores = valores ^ (valores >> np.uint64(27))
+    valores = valores * np.uint64(0x94D049BB133111EB)
+    return valores ^ (valores >> np.uint64(31))
+
+
+def _hash_texto(coluna: pa.Array) -> np.ndarray:
+    # Polinômio dos bytes de cada texto, vetorizado sobre o buffer de dados:
+    # cada byte pesa a potência da sua posição no texto e a soma por texto
+    # sai de uma soma acumulada nas fronteiras dos offsets.
+    global _POTENCIAS
+    if not len(coluna):
+        return np.array([], dtype=np.uint64)
+    largura = np.int64 if pa.types.is_large_string(coluna.type) or pa.types.is_large_binary(coluna.type) else np.int32
+    offsets = np.frombuffer(coluna.buffers()[1], dtype=largura)[coluna.offset:coluna.offset + len(coluna) + 1]
+    inicio = int(offsets[0])
+    offsets = offsets.astype(np.int64) - inicio
+    comprimentos = np.diff(offsets)
+    if not offsets[-1]:
+        return _misturar(comprimentos.astype(np.uint64))
+
+    dados = np.frombuffer(coluna.buffers()[2], dtype=np.uint8)[inicio:inicio + offsets[-1]].astype(np.uint64)
+    if comprimentos.max() > len(_POTENCIAS):
+        _POTENCIAS = np.cumprod(np.full(int(comprimentos.max()), _PRIMO_TEXTO, dtype=np.uint64))
+    posicoes = np.arange(len(dados)) - np.repeat(offsets[:-1], comprimentos)
+    acumulado = np.r_[np.uint64(0), np.cumsum((dados + np.uint64(1)) * _POTENCIAS[posicoes], dtype=np.uint64)]
+    somas = acumulado[offsets[1:]] - acumulado[offsets[:-1]]
+    return _misturar(somas ^ comprimentos.astype(np.uint64) * _MISTURA_OCORRENCIA)
+
+
+def _hash_array(coluna: pa.Array) -> np.ndarray:
+    import pyarrow.compute as pc
+
+    tipo = coluna.type
+    if pa.types.is_dictionary(tipo):
+        valores = _hash_array(coluna.dictionary)
+        indices = pc.fill_null(coluna.indices, 0).to_numpy(zero_copy_only=False)
+        hashes = valores[indices] if len(valores) else np.zeros(len(coluna), dtype=np.uint64)
+    elif pa.types.is_string_view(tipo) or pa.types.is_binary_view(tipo):
+        return _hash_array(coluna.cast(pa.large_string() if pa.types.is_string_view(tipo) else pa.large_binary()))
+    elif (pa.types.is_string(tipo) or pa.types.is_large_string(tipo)
+          or pa.types.is_binary(tipo) or pa.types.is_large_binary(tipo)):
+        hashes = _hash_texto(coluna)
+    elif pa.types.is_floating(tipo):
+        hashes = _misturar(pc.fill_null(coluna.cast(pa.float64()), 0).to_numpy(zero_copy_only=False).view(np.uint64))
+    else:
+        # Inteiros, booleanos e datas pelo valor; instantes em ns, para a
+        # mesma data gravada em s (conversão) e em ms (Parquet) coincidir.
+        if pa.types.is_timestamp(tipo):
+            coluna = coluna.cast(pa.timestamp("ns"))
+        elif pa.types.is_date(tipo):
+            coluna = coluna.cast(pa.date32())
+        inteiros = coluna.view(pa.int64() if pa.types.is_timestamp(tipo) else
+                               pa.int32() if pa.types.is_date(tipo) else coluna.type)
+        hashes = _misturar(pc.fill_null(inteiros.cast(pa.int64()), 0).to_numpy(zero_copy_only=False).view(np.uint64))
+    if coluna.null_count:
+        hashes = np.where(coluna.is_null().to_numpy(zero_copy_only=False), _HASH_NULO, hashes)
+    return hashes
+
+
+def hash_coluna(coluna) -> np.ndarray:
+    """
+    Hash uint64 de cada valor de uma coluna Arrow (Array ou ChunkedArray).
+    """
+    if isinstance(coluna, pa.ChunkedArray):
+        partes = [_hash_array(pedaco) for pedaco in coluna.chunks]
+        return np.concatenate(partes) if partes else np.array([], dtype=np.uint64)
+    return _hash_array(coluna)
+
+
+def hash_linhas(dados, colunas) -> np.ndarray:
+    """
+    Hash uint64 de cada linha de um lote ou tabela, combinando as `colunas`
+    na ordem dada.
+    """
+    hashes = np.zeros(dados.num_rows, dtype=np.uint64)
+    for nome in colunas:
+        hashes = _misturar(hashes * _MISTURA_OCORRENCIA + hash_coluna(dados.column(nome)))
+    return hashes
+
+
+class IndiceLinhas:
+    """
+    Acumula as chaves e hashes dos lotes convertidos de (tipo, ano). Os
+    lotes passam por `acompanhar`, que os devolve intactos, para o índice
+    ser calculado no mesmo passe da conversão.
+
+    Com o índice `anterior`, guarda também as linhas cujo conteúdo não
+    existia nele (novas ou alteradas), para a conversão por diferença
+    regravar os meses sem ler o bruto de novo.
+    """
+
+    def __init__(self, tipo: str, anterior: pa.Table = None):
+        self.colunas_chave = ESQUEMAS[tipo]["chave_linha"]
+        self.coluna_mes = ESQUEMAS[tipo]["particionar_mes"]
+        self._partes = []
+        self._conteudos_anteriores = None if anterior is None else np.unique(anterior["conteudo"].to_numpy())
+        self.retidas = []
+
+    def adicionar(self, lote: pa.RecordBatch):
+        import pyarrow.compute as pc
+
+        meses = pc.fill_null(lote.column(self.coluna_mes), 0).to_numpy(zero_copy_only=False).astype(np.int8)
+        conteudos = hash_linhas(lote, lote.schema.names)
+        self._partes.append((hash_linhas(lote, self.colunas_chave), conteudos, meses))
+        if self._conteudos_anteriores is not None:
+            inedita = ~_contidos(conteudos, self._conteudos_anteriores)
+            if inedita.any():
+                self.retidas.append(lote.filter(pa.array(inedita)))
+
+    def acompanhar(self, lotes):
+        for lote in lotes:
+            self.adicionar(lote)
+            yield lote
+
+    def tabela(self, formato: str) -> pa.Table:
+        if self._partes:
+            chaves, conteudos, meses = (np.concatenate(p) for p in zip(*self._partes))
+        else:
+            chaves, conteudos, meses = (np.array([], dtype=t) for t in (np.uint64, np.uint64, np.int8))
+
+        # Ocorrência de cada chave (0, 1, ...) na ordem do arquivo.
+        ordem = np.argsort(chaves, kind="stable")
+        ordenadas = chaves[ordem]
+        inicio = np.flatnonzero(np.r_[True, ordenadas[1:] != ordenadas[:-1]]) if len(ordenadas) else ordenadas
+        posicao = np.arange(len(ordenadas)) - np.repeat(inicio, np.diff(np.r_[inicio, len(ordenadas)]))
+        chaves = chaves.copy()
+        chaves[ordem] = ordenadas + posicao.astype(np.uint64) * _MISTURA_OCORRENCIA
+
+        ordem = np.argsort(chaves)
+        tabela = pa.table({
+            "chave": chaves[ordem],
+            "conteudo": conteudos[ordem],
+            "mes": meses[ordem],
+        })
+        digestos = _digestos_meses(chaves, conteudos, meses)
+        return tabela.replace_schema_metadata({
+            "formato": formato,
+            "meses": json.dumps({str(m): d for m, d in digestos.items()}),
+        })
+
+
+def _contidos(valores: np.ndarray, ordenados: np.ndarray) -> np.ndarray:
+    # np.isin sobre um vetor já ordenado e sem repetições.
+    if not len(ordenados):
+        return np.zeros(len(valores), dtype=bool)
+    posicao = np.minimum(np.searchsorted(ordenados, valores), len(ordenados) - 1)
+    return ordenados[posicao] == valores
+
+
+def _digestos_meses(chaves, conteudos, meses) -> dict:
+    # Soma (mod 2^64) dos hashes das linhas de cada mês: não depende da ordem.
+    linhas = chaves ^ (conteudos * _MISTURA_OCORRENCIA)
+    return {int(m): f"{int(linhas[meses == m].sum(dtype=np.uint64)):016x}" for m in np.unique(meses)}
+
+
+def gravar_indice_linhas(tipo: str, ano, tabela: pa.Table):
+    destino = caminho_indice_linhas(tipo, ano)
+    os.makedirs(os.path.dirname(destino), exist_ok=True)
+    with pa.OSFile(destino + ".part", "wb") as arquivo:
+        with pa.ipc.new_file(arquivo, tabela.schema) as escritor:
+            escritor.write_table(tabela)
+    os.replace(destino + ".part", destino)
+
+
+def ler_indice_linhas(tipo: str, ano, formato: str = None):
+    """
+    Índice gravado de (tipo, ano), ou None se não existe ou foi gravado
+    em outro `formato`.
+    """
+    caminho = caminho_indice_linhas(tipo, ano)
+    if not os.path.exists(caminho):
+        return None
+    with pa.memory_map(caminho, "r") as origem:
+        tabela = pa.ipc.open_file(origem).read_all()
+    metadados = tabela.schema.metadata or {}
+    if formato is not None and metadados.get(b"formato", b"").decode() != formato:
+        return None
+    return tabela
+
+
+def digestos_meses(tipo: str, ano) -> dict:
+    """
+    {mês: digesto} das linhas de (tipo, ano) gravadas; vazio sem índice.
+    """
+    indice = ler_indice_linhas(tipo, ano)
+    if indice is None:
+        return {}
+    return {int(m): d for m, d in json.loads(indice.schema.metadata[b"meses"]).items()}
+
+
+@dataclass
+class Diferenca:
+    novas: int = 0
+    alteradas: int = 0
+    removidas: int = 0
+    meses: set = field(default_factory=set)
+
+    def __bool__(self):
+        return bool(self.novas or self.alteradas or self.removidas)
+
+
+def comparar(anterior: pa.Table, atual: pa.Table) -> Diferenca:
+    """
+    Classifica as linhas de `atual` contra `anterior` e junta os meses
+    afetados: os das linhas novas e removidas, e os dois meses (antigo e
+    novo) das alteradas.
+    """
+    chaves0, conteudos0, meses0 = (anterior[n].to_numpy() for n in ("chave", "conteudo", "mes"))
+    chaves1, conteudos1, meses1 = (atual[n].to_numpy() for n in ("chave", "conteudo", "mes"))
+
+    posicao = np.minimum(np.searchsorted(chaves0, chaves1), max(len(chaves0) - 1, 0))
+    existia = (chaves0[posicao] == chaves1) if len(chaves0) else np.zeros(len(chaves1), dtype=bool)
+    alterada = existia & ((conteudos0[posicao] != conteudos1) | (meses0[posicao] != meses1))
+    removida = ~np.isin(chaves0, chaves1, assume_unique=True)
+
+    meses = set(meses1[~existia | alterada].tolist())
+    meses |= set(meses0[posicao[alterada]].tolist()) | set(meses0[removida].tolist())
+    return Diferenca(
+        novas=int((~existia).sum()),
+        alteradas=int(alterada.sum()),
+        removidas=int(removida.sum()),
+        meses=meses,
+    )
+
+
+def filtrar_mantidas(tabela: pa.Table, mantidos: np.ndarray) -> pa.Table:
+    """
+    Linhas de `tabela` cujo conteúdo está em `mantidos` (ver conteudos_mantidos).
+    """
+    return tabela.filter(pa.array(_contidos(hash_linhas(tabela, tabela.schema.names), mantidos)))
+
+
+def conteudos_mantidos(anterior: pa.Table, atual: pa.Table):
+    """
+    Conteúdos (ordenados) presentes nos dois índices, que os meses regravados
+    podem copiar da partição gravada; ou None se algum deles mudou de número
+    de ocorrências (linhas idênticas repetidas), caso em que as cópias não
+    dizem quantas manter.
+    """
+    conteudos0, contagens0 = np.unique(anterior["conteudo"].to_numpy(), return_counts=True)
+    conteudos1, contagens1 = np.unique(atual["conteudo"].to_numpy(), return_counts=True)
+    comuns, posicao0, posicao1 = np.intersect1d(conteudos0, conteudos1, assume_unique=True, return_indices=True)
+    if (contagens0[posicao0] != contagens1[posicao1]).any():
+        return None
+    return comuns
@@ -0,0 +1,292 @@
+# legisdata/dimensao.py
+#
+# Dimensão de deputados com chave substituta densa (chave_deputado, int32).
+# Todas as formas de identificar um deputado nas bases da Câmara (id da API,
+# que é o ideCadastro da CEAP, e o nome parlamentar ou civil normalizado)
+# resolvem para a mesma chave, e as tabelas processadas guardam só ela:
+# juntar bases vira uma operação vetorizada sobre inteiros.
+#
+# Arquivos (Arrow IPC sem compressão, mapeados em memória pelos workers):
+#   processed/deputados/dimensao.arrow   uma linha por chave, na ordem da chave
+#   processed/deputados/nomes.arrow      nome normalizado -> chave (sem ambíguos)
+#   processed/deputados/historico.arrow  partido e UF a partir de cada mês (CEAP)
+
+import os
+import threading
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from legisdata.config import DIRETORIO_PROCESSED
+
+CHAVE = "chave_deputado"
+
+COLUNAS_DIMENSAO = ["id_deputado", "nome", "nomeCivil", "siglaSexo", "ufNascimento",
+                    "idLegislaturaInicial", "idLegislaturaFinal"]
+
+_dimensao = None
+_dimensao_lock = threading.Lock()
+
+
+def _caminho(nome: str) -> str:
+    return os.path.join(DIRETORIO_PROCESSED, "deputados", f"{nome}.arrow")
+
+
+def caminho_dimensao_deputados() -> str:
+    return _caminho("dimensao")
+
+
+def caminho_historico_deputados() -> str:
+    return _caminho("historico")
+
+
+def normalizar_nomes(nomes) -> pa.Array:
+    """
+    Nome em maiúsculas, sem acentos e com espaços simples ("José  da Silva"
+    -> "JOSE DA SILVA"). Vazios viram nulos.
+    """
+    nomes = pc.cast(nomes, pa.string())
+    nomes = pc.utf8_normalize(nomes, "NFKD")
+    nomes = pc.replace_substring_regex(nomes, r"\p{Mn}", "")
+    nomes = pc.replace_substring_regex(pc.utf8_upper(nomes), r"\s+", " ")
+    nomes = pc.utf8_trim_whitespace(nomes)
+    return pc.if_else(pc.equal(nomes, ""), pa.scalar(None, pa.string()), nomes)
+
+
+def _gravar_ipc(tabela: pa.Table, destino: str):
+    with pa.OSFile(destino + ".part", "wb") as arquivo:
+        with pa.ipc.new_file(arquivo, tabela.schema) as escritor:
+            escritor.write_table(tabela)
+    os.replace(destino + ".part", destino)
+
+
+def _ler_ipc(caminho: str):
+    if not os.path.exists(caminho):
+        return None
+    with pa.memory_map(caminho, "r") as origem:
+        return pa.ipc.open_file(origem).read_all()
+
+
+def _sem_dicionarios(tabela: pa.Table) -> pa.Table:
+    # Colunas categóricas viram texto: a dimensão é pequena e o formato de
+    # arquivo IPC não aceita dicionários diferentes entre lotes.
+    for i, campo in enumerate(tabela.schema):
+        if pa.types.is_dictionary(campo.type):
+            tabela = tabela.set_column(i, campo.name, pc.cast(tabela.column(i), pa.string()))
+    return tabela
+
+
+def _atribuir_chaves(novos: pa.Table, anterior) -> pa.Table:
+    """
+    Chaves estáveis entre execuções: um id já conhecido mantém a chave da
+    dimensão anterior; ids novos recebem as próximas, em ordem de id. Ids que
+    sumiram do arquivo da Câmara continuam na dimensão (a chave não é reusada).
+    """
+    novos = novos.sort_by("id_deputado")
+    if anterior is None:
+        return novos.append_column(CHAVE, pa.array(np.arange(novos.num_rows, dtype=np.int32)))
+
+    posicoes = pc.index_in(novos["id_deputado"], value_set=anterior["id_deputado"].combine_chunks())
+    conhecidos = pc.is_valid(posicoes).to_numpy(zero_copy_only=False)
+    chaves = np.empty(novos.num_rows, dtype=np.int32)
+    chaves[conhecidos] = pc.take(anterior[CHAVE], pc.drop_null(posicoes)).to_numpy()
+    chaves[~conhecidos] = anterior.num_rows + np.arange((~conhecidos).sum(), dtype=np.int32)
+    novos = novos.append_column(CHAVE, pa.array(chaves))
+
+    presentes = pc.is_in(anterior["id_deputado"], value_set=novos["id_deputado"].combine_chunks())
+    retidos = anterior.filter(pc.invert(presentes))
+    retidos = retidos.select(novos.schema.names).cast(novos.schema)
+    return pa.concat_tables([novos, retidos]).sort_by(CHAVE)
+
+
+def _indice_nomes(dimensao: pa.Table) -> pa.Table:
+    """
+    Nome normalizado (parlamentar e civil) -> chave. Nomes que levam a mais
+    de um deputado ficam de fora: a resolução por nome só vale sem ambiguidade.
+    """
+    nomes = pa.concat_arrays([
+        normalizar_nomes(dimensao["nome"].combine_chunks()),
+        normalizar_nomes(dimensao["nomeCivil"].combine_chunks()),
+    ])
+    chaves = pa.concat_arrays([dimensao[CHAVE].combine_chunks()] * 2)
+    pares = pa.table({"nome": nomes, CHAVE: chaves}).filter(pc.is_valid(nomes))
+    pares = pares.group_by(["nome", CHAVE]).aggregate([])
+    contagem = pares.group_by("nome").aggregate([(CHAVE, "count")])
+    unicos = contagem.filter(pc.equal(contagem[f"{CHAVE}_count"], 1))["nome"]
+    return pares.filter(pc.is_in(pares["nome"], value_set=unicos.combine_chunks())).sort_by("nome")
+
+
+def gravar_dimensao_deputados():
+    """
+    Regrava a dimensão e o índice de nomes a partir de processed/deputados.
+    """
+    import pyarrow.parquet as pq
+
+    from legisdata.processamento import caminho_processado
+
+    novos = pq.read_table(caminho_processado("deputados", "geral"), columns=COLUNAS_DIMENSAO)
+    novos = _sem_dicionarios(novos.filter(pc.is_valid(novos["id_deputado"])))
+    # Um id repetido no arquivo fica com a última linha.
+    ultimas = novos.append_column("_linha", pa.array(np.arange(novos.num_rows)))
+    ultimas = ultimas.group_by("id_deputado").aggregate([("_linha", "max")])["_linha_max"]
+    novos = novos.take(ultimas)
+
+    anterior = _ler_ipc(caminho_dimensao_deputados())
+    if anterior is not None and CHAVE not in anterior.schema.names:
+        anterior = None  # dimensão de uma versão anterior, sem chave
+    dimensao = _atribuir_chaves(novos, anterior)
+    dimensao = dimensao.select([CHAVE, *COLUNAS_DIMENSAO]).combine_chunks()
+    _gravar_ipc(dimensao, caminho_dimensao_deputados())
+    _gravar_ipc(_indice_nomes(dimensao).combine_chunks(), _caminho("nomes"))
+    descartar_dimensao()
+
+
+def gravar_historico_deputados():
+    """
+    Histórico de partido e UF por chave a partir dos gastos processados: uma
+    linha por mudança (chave, desde=AAAAMM, partido, uf), ordenada por chave e
+    mês, com partido e UF codificados como dicionário (int16).
+    """
+    import pyarrow.dataset as ds
+
+    dataset = ds.dataset(os.path.join(DIRETORIO_PROCESSED, "gastos"), format="parquet", partitioning="hive")
+    tabela = dataset.to_table(columns=[CHAVE, "ano", "numMes", "sgPartido", "sgUF"],
+                              filter=ds.field(CHAVE).is_valid() & ds.field("numMes").is_valid())
+    desde = pc.add(pc.multiply(pc.cast(tabela["ano"], pa.int32()), 100), pc.cast(tabela["numMes"], pa.int32()))
+    meses = pa.table({
+        CHAVE: tabela[CHAVE],
+        "desde": desde,
+        "partido": pc.cast(tabela["sgPartido"], pa.string()),
+        "uf": pc.cast(tabela["sgUF"], pa.string()),
+    }).group_by([CHAVE, "desde", "partido", "uf"]).aggregate([])
+    meses = meses.sort_by([(CHAVE, "ascending"), ("desde", "ascending")]).combine_chunks()
+
+    # Só as linhas em que (chave, partido, uf) muda em relação à anterior.
+    colunas = [meses[n].to_numpy(zero_copy_only=False) for n in (CHAVE, "partido", "uf")]
+    mudou = np.ones(meses.num_rows, dtype=bool)
+    if meses.num_rows:
+        mudou[1:] = np.logical_or.reduce([c[1:] != c[:-1] for c in colunas])
+    historico = meses.filter(pa.array(mudou)).combine_chunks()
+    codificado = pa.dictionary(pa.int16(), pa.string())
+    historico = pa.table({
+        CHAVE: historico[CHAVE],
+        "desde": historico["desde"],
+        "partido": pc.cast(pc.dictionary_encode(historico["partido"].combine_chunks()), codificado),
+        "uf": pc.cast(pc.dictionary_encode(historico["uf"].combine_chunks()), codificado),
+    })
+
+    os.makedirs(os.path.dirname(caminho_historico_deputados()), exist_ok=True)
+    _gravar_ipc(historico, caminho_historico_deputados())
+    descartar_dimensao()
+    return historico.num_rows
+
+
+def _arrow(valores):
+    if isinstance(valores, pa.ChunkedArray):
+        return valores.combine_chunks()
+    return valores if isinstance(valores, pa.Array) else pa.array(valores)
+
+
+class DimensaoDeputados:
+    """
+    Consultas vetorizadas sobre a dimensão: de identificadores para chaves e
+    de chaves para atributos. Entradas e saídas são arrays Arrow; chaves não
+    encontradas saem nulas.
+    """
+
+    def __init__(self, tabela: pa.Table, nomes: pa.Table, historico: pa.Table = None):
+        self.tabela = tabela
+        self._ids = tabela["id_deputado"].combine_chunks()
+        self._nomes = nomes["nome"].combine_chunks()
+        self._chaves_nomes = nomes[CHAVE].combine_chunks()
+        self.historico = historico
+        if historico is not None:
+            self._mes_historico = self._chave_mes(historico[CHAVE], historico["desde"])
+
+    @classmethod
+    def carregar(cls):
+        tabela, nomes = _ler_ipc(caminho_dimensao_deputados()), _ler_ipc(_caminho("nomes"))
+        if tabela is None or nomes is None or CHAVE not in tabela.schema.names:
+            return None
+        return cls(tabela, nomes, _ler_ipc(caminho_historico_deputados()))
+
+    def __len__(self):
+        return self.tabela.num_rows
+
+    def chaves_por_id(self, ids) -> pa.Array:
+        """
+        Chaves dos ids da API (ou ideCadastro da CEAP). Como a dimensão está
+        na ordem da chave, a posição do id é a própria chave.
+        """
+        return pc.cast(pc.index_in(pc.cast(ids, pa.int64()), value_set=self._ids), pa.int32())
+
+    def chaves_por_nome(self, nomes) -> pa.Array:
+        posicoes = pc.index_in(normalizar_nomes(nomes), value_set=self._nomes)
+        return pc.take(self._chaves_nomes, posicoes)
+
+    def resolver(self, ids=None, nomes=None) -> pa.Array:
+        """
+        Chave pelo id e, onde ele falta ou é desconhecido, pelo nome.
+        """
+        chaves = self.chaves_por_id(ids) if ids is not None else None
+        if nomes is None:
+            return chaves
+        if chaves is None:
+            return self.chaves_por_nome(nomes)
+        if chaves.null_count == 0:
+            return chaves
+        # Só normaliza os nomes das linhas ainda sem chave.
+        faltantes = pc.if_else(pc.is_null(chaves), pc.cast(nomes, pa.string()), pa.scalar(None, pa.string()))
+        return pc.coalesce(chaves, self.chaves_por_nome(faltantes))
+
+    def atributo(self, chaves, coluna: str) -> pa.Array:
+        return pc.take(self.tabela[coluna], chaves)
+
+    def ids(self, chaves) -> pa.Array:
+        return self.atributo(chaves, "id_deputado")
+
+    @staticmethod
+    def _chave_mes(chaves, anomes) -> np.ndarray:
+        # Chave e mês em um único int64 ordenável: chave * 10^6 + AAAAMM.
+        chaves = pc.fill_null(pc.cast(_arrow(chaves), pa.int64()), -1).to_numpy()
+        return chaves * 1_000_000 + pc.cast(_arrow(anomes), pa.int64()).to_numpy()
+
+    def _no_mes(self, chaves, anomes, coluna: str) -> pa.Array:
+        if self.historico is None:
+            raise FileNotFoundError("Histórico de deputados ainda não gerado: processe os gastos antes.")
+        consulta = self._chave_mes(chaves, anomes)
+        posicoes = np.searchsorted(self._mes_historico, consulta, side="right") - 1
+        chave_hist = self._mes_historico[np.maximum(posicoes, 0)] // 1_000_000
+        validas = (posicoes >= 0) & (chave_hist == consulta // 1_000_000)
+        return pc.take(self.historico[coluna], pa.array(posicoes, mask=~validas))
+
+    def partido_em(self, chaves, anomes) -> pa.Array:
+        """
+        Partido de cada chave no mês AAAAMM (o último registrado até ele).
+        """
+        return self._no_mes(chaves, anomes, "partido")
+
+    def uf_em(self, chaves, anomes) -> pa.Array:
+        return self._no_mes(chaves, anomes, "uf")
+
+
+def dimensao_deputados():
+    """
+    A dimensão mapeada em memória (aberta uma vez por processo), ou None se
+    ainda não foi gerada.
+    """
+    global _dimensao
+    with _dimensao_lock:
+        if _dimensao is None:
+            _dimensao = DimensaoDeputados.carregar()
+        return _dimensao
+
+
+def descartar_dimensao():
+    """
+    Esquece a dimensão aberta neste processo (ex.: em um worker novo).
+    """
+    global _dimensao
+    with _dimensao_lock:
+        _dimensao = None
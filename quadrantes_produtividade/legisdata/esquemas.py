@@ -0,0 +1,200 @@
+# legisdata/esquemas.py
+#
+# Esquemas explícitos dos arquivos brutos da Câmara. Cada entrada define o
+# separador, a codificação e o tipo Arrow de cada coluna aproveitada; as
+# colunas ausentes em algum ano entram como nulas, as não listadas são
+# descartadas na conversão. `renomear` evita colunas com o mesmo nome da
+# partição (ano=<ano>) do Parquet processado. `particionar_mes` divide o ano
+# em mes=<mês> pela coluna indicada, e `ordenar` grava cada mês ordenado
+# pelas colunas listadas (como texto simples, não dicionário), para que as
+# estatísticas dos grupos de linhas sirvam aos filtros de leitura.
+# `chave_linha` identifica cada linha entre republicações do arquivo, para a
+# conversão por diferença (legisdata.delta).
+
+import pyarrow as pa
+
+CATEGORIA = pa.dictionary(pa.int32(), pa.string())
+DINHEIRO = pa.float64()
+
+ESQUEMAS = {
+    "gastos": {
+        "separador": ";",
+        "codificacao": "utf8",
+        "colunas": {
+            "txNomeParlamentar": CATEGORIA,
+            "cpf": pa.string(),
+            "ideCadastro": pa.int64(),
+            "nuCarteiraParlamentar": pa.int32(),
+            "nuLegislatura": pa.int16(),
+            "sgUF": CATEGORIA,
+            "sgPartido": CATEGORIA,
+            "codLegislatura": pa.int16(),
+            "numSubCota": pa.int16(),
+            "txtDescricao": CATEGORIA,
+            "numEspecificacaoSubCota": pa.int16(),
+            "txtDescricaoEspecificacao": CATEGORIA,
+            "txtFornecedor": pa.string(),
+            "txtCNPJCPF": pa.string(),
+            "txtNumero": pa.string(),
+            "indTipoDocumento": pa.int8(),
+            "datEmissao": pa.timestamp("s"),
+            "vlrDocumento": DINHEIRO,
+            "vlrGlosa": DINHEIRO,
+            "vlrLiquido": DINHEIRO,
+            "numMes": pa.int8(),
+            "numAno": pa.int16(),
+            "numParcela": pa.int16(),
+            "txtPassageiro": pa.string(),
+            "txtTrecho": pa.string(),
+            "numLote": pa.string(),
+            "numRessarcimento": pa.string(),
+            "vlrRestituicao": DINHEIRO,
+            "nuDeputadoId": pa.int32(),
+            "ideDocumento": pa.int64(),
+            "urlDocumento": pa.string(),
+        },
+        "particionar_mes": "numMes",
+        "ordenar": ["sgUF", "sgPartido", "chave_deputado"],
+        "chave_linha": ["ideDocumento", "numParcela", "chave_deputado"],
+    },
+    "proposicoes": {
+        "separador": ";",
+        "codificacao": "utf8",
+        "colunas": {
+            "id": pa.int64(),
+            "uri": pa.string(),
+            "siglaTipo": CATEGORIA,
+            "numero": pa.int32(),
+            "ano": pa.int16(),
+            "codTipo": pa.int32(),
+            "descricaoTipo": CATEGORIA,
+            "ementa": pa.string(),
+            "dataApresentacao": pa.timestamp("s"),
+            "ultimoStatus_dataHora": pa.timestamp("s"),
+            "ultimoStatus_siglaOrgao": CATEGORIA,
+            "ultimoStatus_descricaoTramitacao": CATEGORIA,
+            "ultimoStatus_descricaoSituacao": CATEGORIA,
+        },
+        "renomear": {"ano": "anoProposicao"},
+    },
+    # Um registro por (proposição, autor). O autor deputado vira a chave da
+    # dimensão na conversão; os demais (Senado, Executivo...) ficam pelo nome.
+    "autores": {
+        "separador": ";",
+        "codificacao": "utf8",
+        "colunas": {
+            "idProposicao": pa.int64(),
+            "idDeputadoAutor": pa.int64(),
+            "codTipoAutor": pa.int32(),
+            "tipoAutor": CATEGORIA,
+            "nomeAutor": pa.string(),
+            "siglaPartidoAutor": CATEGORIA,
+            "siglaUFAutor": CATEGORIA,
+            "ordemAssinatura": pa.int16(),
+            "proponente": pa.int8(),
+        },
+    },
+    "eventos": {
+        "separador": ";",
+        "codificacao": "utf8",
+        "colunas": {
+            "id": pa.int64(),
+            "uri": pa.string(),
+            "dataHoraInicio": pa.timestamp("s"),
+            "dataHoraFim": pa.timestamp("s"),
+            "situacao": CATEGORIA,
+            "descricao": pa.string(),
+            "descricaoTipo": CATEGORIA,
+            "localExterno": pa.string(),
+            "localCamara.nome": CATEGORIA,
+        },
+    },
+    # Um registro por deputado presente em cada evento.
+    "presencas": {
+        "separador": ";",
+        "codificacao": "utf8",
+        "colunas": {
+            "idEvento": pa.int64(),
+            "dataHoraInicio": pa.timestamp("s"),
+            "idDeputado": pa.int64(),
+        },
+    },
+    "eventos_orgaos": {
+        "separador": ";",
+        "codificacao": "utf8",
+        "colunas": {
+            "idEvento": pa.int64(),
+            "idOrgao": pa.int64(),
+            "siglaOrgao": CATEGORIA,
+            "nomeOrgao": CATEGORIA,
+        },
+    },
+    "deputados": {
+        "separador": ";",
+        "codificacao": "utf8",
+        "colunas": {
+            "uri": pa.string(),
+            "nome": pa.string(),
+            "idLegislaturaInicial": pa.int16(),
+            "idLegislaturaFinal": pa.int16(),
+            "nomeCivil": pa.string(),
+            "cpf": pa.string(),
+            "siglaSexo": CATEGORIA,
+            "dataNascimento": pa.date32(),
+            "dataFalecimento": pa.date32(),
+            "ufNascimento": CATEGORIA,
+            "municipioNascimento": pa.string(),
+        },
+    },
+    # Composição das comissões: um período de cada deputado em cada órgão,
+    # com o cargo (titulo). dataFim vazia = membro até hoje. O idDeputado é
+    # trocado pela chave da dimensão na conversão.
+    "comissoes": {
+        "separador": ";",
+        "codificacao": "utf8",
+        "colunas": {
+            "idOrgao": pa.int64(),
+            "siglaOrgao": CATEGORIA,
+            "nomeOrgao": CATEGORIA,
+            "idDeputado": pa.int64(),
+            "siglaPartido": CATEGORIA,
+            "siglaUF": CATEGORIA,
+            "titulo": CATEGORIA,
+            "dataInicio": pa.timestamp("s"),
+            "dataFim": pa.timestamp("s"),
+        },
+    },
+    # Registros da API /deputados/{id}/despesas (sem arquivo bruto em CSV).
+    # O id_deputado é trocado pela chave da dimensão ao gravar.
+    "despesas_api": {
+        "colunas": {
+            "id_deputado": pa.int64(),
+            "ano": pa.int16(),
+            "mes": pa.int8(),
+            "tipoDespesa": CATEGORIA,
+            "codDocumento": pa.int64(),
+            "tipoDocumento": CATEGORIA,
+            "codTipoDocumento": pa.int16(),
+            "dataDocumento": pa.string(),
+            "numDocumento": pa.string(),
+            "valorDocumento": DINHEIRO,
+            "urlDocumento": pa.string(),
+            "nomeFornecedor": pa.string(),
+            "cnpjCpfFornecedor": pa.string(),
+            "valorLiquido": DINHEIRO,
+            "valorGlosa": DINHEIRO,
+            "numRessarcimento": pa.string(),
+            "codLote": pa.int64(),
+            "parcela": pa.int16(),
+        },
+    },
+}
+
+
+def esquema_arrow(tipo: str) -> pa.Schema:
+    """
+    Esquema Arrow (já com os nomes renomeados) de um dataset.
+    """
+    definicao = ESQUEMAS[tipo]
+    renomear = definicao.get("renomear", {})
+    return pa.schema([(renomear.get(nome, nome), tipo_arrow) for nome, tipo_arrow in definicao["colunas"].items()])
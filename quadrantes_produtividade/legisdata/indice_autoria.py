@@ -0,0 +1,234 @@
+# legisdata/indice_autoria.py
+#
+# Índice invertido deputado -> proposições de que é autor, particionado por
+# ano (o ano do arquivo de autores, que é o da proposição). Cada partição,
+# processed/indice_autoria/ano=<ano>/indice.arrow, guarda arrays ordenados
+# juntos por (chave_deputado, tipo, idProposicao):
+#
+#   chave_tipo    int64  chave_deputado * 2^16 + código do tipo
+#   idProposicao  int64
+#   siglaTipo     dicionário int16 (o código é a posição no dicionário)
+#
+# Quantas proposições (de um tipo) um deputado assinou no ano é a distância
+# entre duas buscas binárias em chave_tipo: O(log n), sem reler os arquivos.
+
+import os
+import threading
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from legisdata.cache import versoes_particoes
+from legisdata.config import DIRETORIO_PROCESSED
+from legisdata.dimensao import CHAVE
+from legisdata.manifesto import novo_hash, obter_manifesto
+from legisdata.metricas import medir
+from legisdata.processamento import ESTAGIO_PARQUET, caminho_processado
+
+TIPO_INDICE = "indice_autoria"
+ESTAGIO_INDICE = "indice"
+
+# Bits reservados ao código do tipo em chave_tipo.
+BITS_TIPO = 16
+
+
+def caminho_indice(ano) -> str:
+    return os.path.join(DIRETORIO_PROCESSED, TIPO_INDICE, f"ano={ano}", "indice.arrow")
+
+
+def _versao_entrada(manifesto, ano) -> str:
+    # O índice depende dos autores e dos tipos vindos das proposições do ano.
+    combinado = novo_hash()
+    for tipo in ("autores", "proposicoes"):
+        combinado.update((manifesto.hash_derivado(ESTAGIO_PARQUET, tipo, ano) or "").encode())
+    return combinado.hexdigest()
+
+
+def _tipos_proposicoes(ano, ids: pa.Array) -> pa.Array:
+    """
+    siglaTipo de cada id pelo Parquet de proposições do ano; "" quando a
+    proposição (ou o ano inteiro) não está lá.
+    """
+    if not os.path.exists(caminho_processado("proposicoes", ano)):
+        return pa.array([""] * len(ids), pa.string())
+    proposicoes = pq.read_table(caminho_processado("proposicoes", ano), columns=["id", "siglaTipo"])
+    posicoes = pc.index_in(ids, value_set=proposicoes["id"].combine_chunks())
+    siglas = pc.take(proposicoes["siglaTipo"].combine_chunks(), posicoes)
+    return pc.fill_null(pc.cast(siglas, pa.string()), "")
+
+
+def _construir_ano(ano) -> pa.Table:
+    autores = pq.read_table(caminho_processado("autores", ano), columns=[CHAVE, "idProposicao"])
+    autores = autores.filter(pc.and_(pc.is_valid(autores[CHAVE]), pc.is_valid(autores["idProposicao"])))
+    # Coautoria repetida no arquivo conta uma vez.
+    autores = autores.group_by([CHAVE, "idProposicao"]).aggregate([]).combine_chunks()
+
+    ids = autores["idProposicao"].combine_chunks()
+    siglas = _tipos_proposicoes(ano, ids)
+    dicionario = pc.unique(siglas).sort()
+    codigos = pc.index_in(siglas, value_set=dicionario).to_numpy().astype(np.int64)
+
+    chave_tipo = (autores[CHAVE].to_numpy().astype(np.int64) << BITS_TIPO) | codigos
+    ordem = np.lexsort((ids.to_numpy(), chave_tipo))
+    return pa.table({
+        "chave_tipo": chave_tipo[ordem],
+        "idProposicao": ids.to_numpy()[ordem],
+        "siglaTipo": pa.DictionaryArray.from_arrays(pa.array(codigos[ordem], pa.int16()), dicionario),
+    })
+
+
+def construir_indice_autoria(anos=None, forcar: bool = False) -> list:
+    """
+    (Re)constrói as partições do índice cujos autores ou proposições
+    processados mudaram desde a última construção. Retorna os anos
+    reconstruídos.
+    """
+    manifesto = obter_manifesto()
+    anos = {str(a) for a in anos} if anos is not None else None
+
+    reconstruidos = []
+    for (_, ano) in sorted(manifesto.derivados(ESTAGIO_PARQUET, "autores")):
+        if anos is not None and ano not in anos:
+            continue
+        versao = _versao_entrada(manifesto, ano)
+        destino = caminho_indice(ano)
+        if (not forcar and os.path.exists(destino)
+                and not manifesto.precisa_reconstruir(ESTAGIO_INDICE, TIPO_INDICE, ano, versao)):
+            continue
+
+        print(f"📇 Indexando autoria de proposições de {ano}...")
+        with medir("indice", TIPO_INDICE, ano) as medicao:
+            indice = _construir_ano(ano)
+            os.makedirs(os.path.dirname(destino), exist_ok=True)
+            with pa.OSFile(destino + ".part", "wb") as arquivo:
+                with pa.ipc.new_file(arquivo, indice.schema) as escritor:
+                    escritor.write_table(indice)
+            os.replace(destino + ".part", destino)
+            medicao.adicionar(linhas=indice.num_rows, bytes=os.path.getsize(destino))
+        manifesto.registrar_derivado(ESTAGIO_INDICE, TIPO_INDICE, ano, versao)
+        reconstruidos.append(ano)
+
+    if reconstruidos:
+        print(f"✅ Índice de autoria atualizado para {len(reconstruidos)} anos.")
+    return reconstruidos
+
+
+class IndiceAutoria:
+    """
+    Consultas sobre as partições do índice, mapeadas em memória. `chaves`
+    aceita um escalar ou um array de chaves de deputado; `anos` e `tipos`
+    (siglas, ex. ["PL", "PEC"]) restringem o período e os tipos.
+    """
+
+    def __init__(self, anos=None):
+        self.particoes = {}
+        raiz = os.path.join(DIRETORIO_PROCESSED, TIPO_INDICE)
+        for nome in sorted(os.listdir(raiz)) if os.path.isdir(raiz) else []:
+            ano = nome.removeprefix("ano=")
+            if anos is not None and ano not in {str(a) for a in anos}:
+                continue
+            if not os.path.exists(caminho_indice(ano)):
+                continue
+            with pa.memory_map(caminho_indice(ano), "r") as origem:
+                tabela = pa.ipc.open_file(origem).read_all().combine_chunks()
+            if tabela.num_rows:
+                self.particoes[int(ano)] = (
+                    tabela["chave_tipo"].chunk(0).to_numpy(),
+                    tabela["idProposicao"].chunk(0).to_numpy(),
+                    tabela["siglaTipo"].chunk(0).dictionary.to_pylist(),
+                )
+
+    def _anos(self, anos):
+        if anos is None:
+            return sorted(self.particoes)
+        return [int(a) for a in anos if int(a) in self.particoes]
+
+    def _faixas(self, ano, chaves: np.ndarray, tipos):
+        """
+        [(início, fim)] em chave_tipo para cada chave: uma faixa por tipo
+        pedido, ou a faixa de todos os tipos da chave.
+        """
+        chave_tipo, _, dicionario = self.particoes[ano]
+        base = chaves << BITS_TIPO
+        if tipos is None:
+            return [(np.searchsorted(chave_tipo, base), np.searchsorted(chave_tipo, base + (1 << BITS_TIPO)))]
+        codigos = [dicionario.index(t) for t in tipos if t in dicionario]
+        return [(np.searchsorted(chave_tipo, base | c), np.searchsorted(chave_tipo, base | c, side="right"))
+                for c in codigos]
+
+    def contar(self, chaves, anos=None, tipos=None) -> np.ndarray:
+        """
+        Número de proposições de cada chave no período (somado entre anos).
+        """
+        chaves = np.atleast_1d(np.asarray(chaves, dtype=np.int64))
+        total = np.zeros(len(chaves), dtype=np.int64)
+        for ano in self._anos(anos):
+            for inicio, fim in self._faixas(ano, chaves, tipos):
+                total += fim - inicio
+        return total
+
+    def proposicoes(self, chave: int, anos=None, tipos=None) -> np.ndarray:
+        """
+        Ids das proposições de um deputado no período, por ano e tipo.
+        """
+        chaves = np.array([chave], dtype=np.int64)
+        partes = []
+        for ano in self._anos(anos):
+            ids = self.particoes[ano][1]
+            partes += [ids[inicio[0]:fim[0]] for inicio, fim in self._faixas(ano, chaves, tipos)]
+        return np.concatenate(partes) if partes else np.array([], dtype=np.int64)
+
+    def contagens(self, anos=None, tipos=None, por_tipo: bool = False):
+        """
+        DataFrame (chave_deputado, ano[, siglaTipo], proposicoes) com todos os
+        deputados que assinaram alguma proposição no período.
+        """
+        import pandas as pd
+
+        partes = []
+        for ano in self._anos(anos):
+            chave_tipo, _, dicionario = self.particoes[ano]
+            if tipos is not None:
+                codigos = [dicionario.index(t) for t in tipos if t in dicionario]
+                chave_tipo = chave_tipo[np.isin(chave_tipo & ((1 << BITS_TIPO) - 1), codigos)]
+            grupos = chave_tipo if por_tipo else chave_tipo >> BITS_TIPO
+            if not len(grupos):
+                continue
+            # Os arrays já estão ordenados: cada grupo é uma sequência contígua.
+            inicios = np.flatnonzero(np.r_[True, grupos[1:] != grupos[:-1]])
+            valores, quantidades = grupos[inicios], np.diff(np.r_[inicios, len(grupos)])
+            parte = pd.DataFrame({
+                CHAVE: (valores >> BITS_TIPO if por_tipo else valores).astype(np.int32),
+                "ano": np.full(len(valores), ano, dtype=np.int16),
+                "proposicoes": quantidades,
+            })
+            if por_tipo:
+                parte.insert(2, "siglaTipo", np.asarray(dicionario, dtype=object)[valores & ((1 << BITS_TIPO) - 1)])
+            partes.append(parte)
+        colunas = [CHAVE, "ano", *(["siglaTipo"] if por_tipo else []), "proposicoes"]
+        return pd.concat(partes, ignore_index=True) if partes else pd.DataFrame(columns=colunas)
+
+
+# Índice compartilhado pelo processo, reaberto quando alguma partição muda.
+_indice = (None, None)
+_indice_lock = threading.Lock()
+
+
+def obter_indice_autoria() -> IndiceAutoria:
+    global _indice
+    versao = versoes_particoes(ESTAGIO_INDICE, TIPO_INDICE)
+    with _indice_lock:
+        if _indice[0] != versao:
+            _indice = (versao, IndiceAutoria())
+        return _indice[1]
+
+
+def indicador_proposicoes(anos=None, tipos=None, nome: str = "proposicoes"):
+    """
+    Proposições assinadas por deputado e ano, no formato de
+    `montar_indicadores` (chave_deputado, ano, <nome>).
+    """
+    contagens = obter_indice_autoria().contagens(anos=anos, tipos=tipos)
+    return contagens.rename(columns={"proposicoes": nome})
@@ -0,0 +1,145 @@
+# legisdata/manifesto.py
+
+import hashlib
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from legisdata.config import ARQUIVO_MANIFESTO, ALGORITMO_HASH
+
+TAMANHO_BLOCO_HASH = 1024 * 1024
+
+
+def novo_hash():
+    return hashlib.new(ALGORITMO_HASH)
+
+
+def calcular_hash(caminho: str, hash_obj=None):
+    """
+    Calcula (ou continua, se `hash_obj` for informado) o hash de um arquivo
+    lendo-o em blocos. Retorna o objeto de hash.
+    """
+    hash_obj = hash_obj if hash_obj is not None else novo_hash()
+    with open(caminho, "rb") as f:
+        for bloco in iter(lambda: f.read(TAMANHO_BLOCO_HASH), b""):
+            hash_obj.update(bloco)
+    return hash_obj
+
+
+class Manifesto:
+    """
+    Registro de versões dos arquivos brutos e do que foi derivado deles.
+
+    Para cada (tipo, ano) guarda tamanho, mtime e hash do arquivo em
+    data/raw; o hash é calculado durante o download, sem segunda leitura.
+    Cada estágio de processamento registra o hash de entrada com que gerou
+    sua saída, e só reconstrói as partições cujo hash mudou.
+    """
+
+    def __init__(self, caminho: str = ARQUIVO_MANIFESTO):
+        self.caminho = caminho
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(caminho), exist_ok=True)
+
+        self._conexao = sqlite3.connect(
+            caminho, timeout=30, isolation_level=None, check_same_thread=False
+        )
+        self._conexao.execute("PRAGMA journal_mode=WAL")
+        self._conexao.execute(
+            "CREATE TABLE IF NOT EXISTS arquivos_raw ("
+            " tipo TEXT NOT NULL,"
+            " ano TEXT NOT NULL,"
+            " caminho TEXT NOT NULL,"
+            " tamanho INTEGER NOT NULL,"
+            " mtime REAL NOT NULL,"
+            " hash TEXT NOT NULL,"
+            " registrado_em TEXT NOT NULL,"
+            " PRIMARY KEY (tipo, ano))"
+        )
+        self._conexao.execute(
+            "CREATE TABLE IF NOT EXISTS derivados ("
+            " estagio TEXT NOT NULL,"
+            " tipo TEXT NOT NULL,"
+            " ano TEXT NOT NULL,"
+            " hash_entrada TEXT NOT NULL,"
+            " gerado_em TEXT NOT NULL,"
+            " PRIMARY KEY (estagio, tipo, ano))"
+        )
+
+    def registrar_raw(self, tipo: str, ano, caminho: str, hash_hex: str):
+        estado = os.stat(caminho)
+        with self._lock:
+            with self._conexao:
+                self._conexao.execute(
+                    "INSERT OR REPLACE INTO arquivos_raw"
+                    " (tipo, ano, caminho, tamanho, mtime, hash, registrado_em)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (str(tipo), str(ano), caminho, estado.st_size, estado.st_mtime,
+                     hash_hex, datetime.now().isoformat()),
+                )
+
+    def hash_raw(self, tipo: str, ano, caminho: str) -> str:
+        """
+        Hash do arquivo bruto atual. Se tamanho e mtime batem com o registro,
+        devolve o hash guardado sem ler o arquivo; caso contrário (arquivo
+        trocado fora do coletor), recalcula e atualiza o manifesto.
+        """
+        estado = os.stat(caminho)
+        with self._lock:
+            linha = self._conexao.execute(
+                "SELECT caminho, tamanho, mtime, hash FROM arquivos_raw WHERE tipo = ? AND ano = ?",
+                (str(tipo), str(ano)),
+            ).fetchone()
+        if linha and linha[:3] == (caminho, estado.st_size, estado.st_mtime):
+            return linha[3]
+
+        hash_hex = calcular_hash(caminho).hexdigest()
+        self.registrar_raw(tipo, ano, caminho, hash_hex)
+        return hash_hex
+
+    def hash_derivado(self, estagio: str, tipo: str, ano):
+        with self._lock:
+            linha = self._conexao.execute(
+                "SELECT hash_entrada FROM derivados WHERE estagio = ? AND tipo = ? AND ano = ?",
+                (estagio, str(tipo), str(ano)),
+            ).fetchone()
+        return linha[0] if linha else None
+
+    def precisa_reconstruir(self, estagio: str, tipo: str, ano, hash_entrada: str) -> bool:
+        return self.hash_derivado(estagio, tipo, ano) != hash_entrada
+
+    def registrar_derivado(self, estagio: str, tipo: str, ano, hash_entrada: str):
+        with self._lock:
+            with self._conexao:
+                self._conexao.execute(
+                    "INSERT OR REPLACE INTO derivados (estagio, tipo, ano, hash_entrada, gerado_em)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    (estagio, str(tipo), str(ano), hash_entrada, datetime.now().isoformat()),
+                )
+
+    def derivados(self, estagio: str, tipo: str = None) -> dict:
+        """
+        Retorna {(tipo, ano): hash_entrada} de um estágio.
+        """
+        with self._lock:
+            if tipo is None:
+                cursor = self._conexao.execute(
+                    "SELECT tipo, ano, hash_entrada FROM derivados WHERE estagio = ?", (estagio,)
+                )
+            else:
+                cursor = self._conexao.execute(
+                    "SELECT tipo, ano, hash_entrada FROM derivados WHERE estagio = ? AND tipo = ?",
+                    (estagio, str(tipo)),
+                )
+            return {(t, a): h for t, a, h in cursor.fetchall()}
+
+
+_instancias = {}
+_instancias_lock = threading.Lock()
+
+
+def obter_manifesto(caminho: str = ARQUIVO_MANIFESTO) -> Manifesto:
+    with _instancias_lock:
+        if caminho not in _instancias:
+            _instancias[caminho] = Manifesto(caminho)
+        return _instancias[caminho]
@@ -0,0 +1,214 @@
+# legisdata/metricas.py
+#
+# Métricas por job (estágio, tipo, ano) da coleta, do processamento e da
+# análise: duração, bytes, vazão, retomadas de download, linhas e memória.
+# Cada job vira uma linha JSON no log de métricas; ao fim da execução, o
+# conjunto é exportado no formato texto do Prometheus e resumido no terminal.
+
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+
+from legisdata.config import ARQUIVO_LOG_METRICAS, ARQUIVO_METRICAS_PROMETHEUS
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def _pico_memoria() -> int:
+    """
+    Pico de memória residente do processo até agora, em bytes (0 se o
+    sistema não informa).
+    """
+    if resource is None:
+        return 0
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return pico if sys.platform == "darwin" else pico * 1024
+
+
+def _formatar(valor) -> str:
+    return str(valor) if isinstance(valor, int) else f"{valor:.6f}"
+
+
+@dataclass
+class Medicao:
+    estagio: str
+    tipo: str
+    ano: str
+    inicio: float = field(default_factory=time.time)
+    duracao: float = 0.0
+    status: str = "ok"
+    erro: str = None
+    bytes: int = 0
+    linhas: int = 0
+    retomadas: int = 0
+    pico_memoria: int = 0
+    aumento_pico_memoria: int = 0
+
+    @property
+    def vazao(self) -> float:
+        """
+        Bytes por segundo (0 quando não houve transferência).
+        """
+        return self.bytes / self.duracao if self.duracao > 0 else 0.0
+
+    def adicionar(self, **valores):
+        for nome, valor in valores.items():
+            setattr(self, nome, getattr(self, nome) + (valor or 0))
+
+
+class RegistroMetricas:
+    """
+    Coleta as medições de uma execução. `medir` é seguro entre threads: cada
+    thread tem sua pilha de medições em andamento, e `registrar` soma valores
+    à medição mais interna da thread atual.
+    """
+
+    def __init__(self, arquivo_log: str = ARQUIVO_LOG_METRICAS):
+        self.arquivo_log = arquivo_log
+        self.execucao = f"{datetime.now():%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}"
+        self.medicoes = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _pilha(self) -> list:
+        if not hasattr(self._local, "pilha"):
+            self._local.pilha = []
+        return self._local.pilha
+
+    @contextmanager
+    def medir(self, estagio: str, tipo: str, ano):
+        medicao = Medicao(estagio=estagio, tipo=tipo, ano=str(ano))
+        pico_inicial = _pico_memoria()
+        inicio = time.perf_counter()
+        self._pilha().append(medicao)
+        try:
+            yield medicao
+        except BaseException as e:
+            medicao.status = "erro"
+            medicao.erro = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            self._pilha().pop()
+            medicao.duracao = time.perf_counter() - inicio
+            medicao.pico_memoria = _pico_memoria()
+            medicao.aumento_pico_memoria = medicao.pico_memoria - pico_inicial
+            self.incluir(medicao)
+
+    def incluir(self, medicao: Medicao):
+        """
+        Acrescenta uma medição feita em outro processo (ex.: um worker do
+        processamento paralelo) a esta execução.
+        """
+        with self._lock:
+            self.medicoes.append(medicao)
+        self._registrar_log(medicao)
+
+    def registrar(self, **valores):
+        pilha = self._pilha()
+        if pilha:
+            pilha[-1].adicionar(**valores)
+
+    def _registrar_log(self, medicao: Medicao):
+        if not self.arquivo_log:
+            return
+        linha = {
+            "evento": "job",
+            "execucao": self.execucao,
+            "registrado_em": datetime.now().isoformat(timespec="seconds"),
+            **asdict(medicao),
+            "vazao_bytes_por_segundo": round(medicao.vazao, 1),
+        }
+        with self._lock:
+            os.makedirs(os.path.dirname(self.arquivo_log), exist_ok=True)
+            with open(self.arquivo_log, "a", encoding="utf-8") as f:
+                f.write(json.dumps(linha, ensure_ascii=False) + "\n")
+
+    def exportar_prometheus(self, caminho: str = ARQUIVO_METRICAS_PROMETHEUS):
+        """
+        Grava as medições no formato texto do Prometheus (uma série por
+        estágio, tipo e ano; a última medição de cada job prevalece).
+        """
+        series = {
+            "legisdata_job_duracao_segundos": ("Duração do job.", lambda m: m.duracao),
+            "legisdata_job_bytes": ("Bytes transferidos ou lidos pelo job.", lambda m: m.bytes),
+            "legisdata_job_vazao_bytes_por_segundo": ("Vazão do job.", lambda m: m.vazao),
+            "legisdata_job_linhas": ("Linhas processadas pelo job.", lambda m: m.linhas),
+            "legisdata_job_retomadas": ("Downloads retomados após queda.", lambda m: m.retomadas),
+            "legisdata_job_pico_memoria_bytes": ("Pico de memória do processo ao fim do job.",
+                                                 lambda m: m.pico_memoria),
+            "legisdata_job_sucesso": ("1 se o job terminou sem erro.", lambda m: int(m.status == "ok")),
+        }
+        with self._lock:
+            ultimas = {(m.estagio, m.tipo, m.ano): m for m in self.medicoes}
+
+        linhas = []
+        for nome, (ajuda, valor) in series.items():
+            linhas += [f"# HELP {nome} {ajuda}", f"# TYPE {nome} gauge"]
+            for (estagio, tipo, ano), medicao in sorted(ultimas.items()):
+                rotulos = f'estagio="{estagio}",tipo="{tipo}",ano="{ano}"'
+                linhas.append(f"{nome}{{{rotulos}}} {_formatar(valor(medicao))}")
+        linhas += [
+            "# HELP legisdata_execucao_fim_timestamp_segundos Fim da execução.",
+            "# TYPE legisdata_execucao_fim_timestamp_segundos gauge",
+            f"legisdata_execucao_fim_timestamp_segundos {time.time():.0f}",
+        ]
+
+        # Grava e renomeia: o coletor nunca lê um arquivo pela metade.
+        os.makedirs(os.path.dirname(caminho), exist_ok=True)
+        with open(caminho + ".tmp", "w", encoding="utf-8") as f:
+            f.write("\n".join(linhas) + "\n")
+        os.replace(caminho + ".tmp", caminho)
+
+    def imprimir_resumo(self, maiores: int = 10):
+        """
+        Totais por estágio e os jobs mais demorados da execução.
+        """
+        with self._lock:
+            medicoes = list(self.medicoes)
+        if not medicoes:
+            return
+
+        print("\n⏱️  Métricas da execução:")
+        for estagio in dict.fromkeys(m.estagio for m in medicoes):
+            do_estagio = [m for m in medicoes if m.estagio == estagio]
+            duracao = sum(m.duracao for m in do_estagio)
+            volume = sum(m.bytes for m in do_estagio)
+            erros = sum(1 for m in do_estagio if m.status != "ok")
+            print(f"  {estagio:<14} {len(do_estagio):4d} jobs {duracao:9.1f}s "
+                  f"{volume / 1e6:10.1f} MB  {erros} com erro")
+
+        print(f"\n🐢 {min(maiores, len(medicoes))} jobs mais demorados:")
+        for m in sorted(medicoes, key=lambda m: m.duracao, reverse=True)[:maiores]:
+            icone = "✅" if m.status == "ok" else "❌"
+            print(f"  {icone} {m.estagio:<14} {m.tipo:<12} {m.ano:<6} {m.duracao:8.1f}s "
+                  f"{m.vazao / 1e6:7.1f} MB/s {m.linhas:>10} linhas {m.retomadas} retomadas "
+                  f"pico {m.pico_memoria / 2**20:.0f} MiB")
+
+
+_registro = None
+_registro_lock = threading.Lock()
+
+
+def obter_registro() -> RegistroMetricas:
+    global _registro
+    with _registro_lock:
+        if _registro is None:
+            _registro = RegistroMetricas()
+        return _registro
+
+
+def medir(estagio: str, tipo: str, ano):
+    return obter_registro().medir(estagio, tipo, ano)
+
+
+def registrar(**valores):
+    obter_registro().registrar(**valores)
@@ -0,0 +1,305 @@
+# legisdata/presencas.py
+#
+# Matriz esparsa de presença deputado × evento, uma por ano, construída a
+# partir dos Parquets de presenças, eventos e órgãos dos eventos. Cada
+# partição, em processed/matriz_presencas/ano=<ano>/, tem:
+#
+#   presencas.npz    CSR booleana (scipy): linha = chave_deputado, coluna = evento
+#   eventos.parquet  uma linha por coluna da matriz: idEvento, mes, tipo
+#   orgaos.parquet   pares (coluna, siglaOrgao); um evento pode ter vários órgãos
+#
+# Só entram eventos com alguma presença registrada (os demais não chegaram
+# a acontecer). As taxas de presença são calculadas com produtos de matrizes
+# esparsas, sem pivotar deputados × eventos em memória.
+
+import os
+import threading
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from legisdata.cache import versoes_particoes
+from legisdata.config import DIRETORIO_PROCESSED, COMPRESSAO_PARQUET
+from legisdata.dimensao import CHAVE
+from legisdata.manifesto import novo_hash, obter_manifesto
+from legisdata.metricas import medir
+from legisdata.processamento import ESTAGIO_PARQUET, caminho_processado
+
+TIPO_MATRIZ = "matriz_presencas"
+ESTAGIO_MATRIZ = "matriz"
+
+# Recortes aceitos em `por` (o ano é sempre um deles).
+RECORTES = ("mes", "tipo", "orgao")
+
+
+def diretorio_matriz(ano) -> str:
+    return os.path.join(DIRETORIO_PROCESSED, TIPO_MATRIZ, f"ano={ano}")
+
+
+def _versao_entrada(manifesto, ano) -> str:
+    combinado = novo_hash()
+    for tipo in ("presencas", "eventos", "eventos_orgaos"):
+        combinado.update((manifesto.hash_derivado(ESTAGIO_PARQUET, tipo, ano) or "").encode())
+    return combinado.hexdigest()
+
+
+def _atributo_eventos(tipo: str, ano, ids: np.ndarray, coluna_id: str, coluna: str) -> pa.Array:
+    """
+    `coluna` do Parquet de `tipo` para cada id de evento ("" se ausente).
+    """
+    if not os.path.exists(caminho_processado(tipo, ano)):
+        return pa.array([""] * len(ids), pa.string())
+    tabela = pq.read_table(caminho_processado(tipo, ano), columns=[coluna_id, coluna])
+    posicoes = pc.index_in(pa.array(ids), value_set=tabela[coluna_id].combine_chunks())
+    valores = pc.take(tabela[coluna].combine_chunks(), posicoes)
+    return pc.fill_null(pc.cast(valores, pa.string()), "")
+
+
+def _construir_ano(ano):
+    import scipy.sparse as sp
+
+    presencas = pq.read_table(caminho_processado("presencas", ano), columns=[CHAVE, "idEvento", "dataHoraInicio"])
+    presencas = presencas.filter(pc.and_(pc.is_valid(presencas[CHAVE]), pc.is_valid(presencas["idEvento"])))
+    linhas = presencas[CHAVE].to_numpy().astype(np.int32)
+    ids, colunas = np.unique(presencas["idEvento"].to_numpy(), return_inverse=True)
+
+    matriz = sp.coo_matrix(
+        (np.ones(len(linhas), dtype=bool), (linhas, colunas)),
+        shape=(int(linhas.max()) + 1 if len(linhas) else 0, len(ids)),
+    ).tocsr()
+    matriz.sum_duplicates()
+
+    meses = np.zeros(len(ids), dtype=np.int8)
+    meses[colunas] = pc.fill_null(pc.month(presencas["dataHoraInicio"]), 0).to_numpy()
+    eventos = pa.table({
+        "idEvento": ids,
+        "mes": meses,
+        "tipo": pc.dictionary_encode(_atributo_eventos("eventos", ano, ids, "id", "descricaoTipo")),
+    })
+
+    # Evento sem órgão conhecido entra com sigla "" para contar nas taxas.
+    pares_colunas, pares_siglas = np.arange(len(ids)), pa.array([""] * len(ids), pa.string())
+    if os.path.exists(caminho_processado("eventos_orgaos", ano)):
+        orgaos = pq.read_table(caminho_processado("eventos_orgaos", ano), columns=["idEvento", "siglaOrgao"])
+        posicoes = pc.index_in(orgaos["idEvento"], value_set=pa.array(ids))
+        orgaos = orgaos.filter(pc.is_valid(posicoes)).append_column("coluna", pc.drop_null(posicoes))
+        orgaos = orgaos.group_by(["coluna", "siglaOrgao"]).aggregate([])
+        com_orgao = np.zeros(len(ids), dtype=bool)
+        com_orgao[orgaos["coluna"].to_numpy()] = True
+        pares_colunas = np.concatenate([orgaos["coluna"].to_numpy(), np.flatnonzero(~com_orgao)])
+        pares_siglas = pa.concat_arrays([
+            pc.fill_null(pc.cast(orgaos["siglaOrgao"], pa.string()), "").combine_chunks(),
+            pa.array([""] * int((~com_orgao).sum()), pa.string()),
+        ])
+    ordem = np.argsort(pares_colunas, kind="stable")
+    orgaos = pa.table({
+        "coluna": pa.array(pares_colunas[ordem], pa.int32()),
+        "siglaOrgao": pc.dictionary_encode(pc.take(pares_siglas, pa.array(ordem))),
+    })
+    return matriz, eventos, orgaos
+
+
+def construir_matrizes_presenca(anos=None, forcar: bool = False) -> list:
+    """
+    (Re)constrói as matrizes dos anos cujas presenças, eventos ou órgãos
+    processados mudaram desde a última construção. Retorna os anos
+    reconstruídos.
+    """
+    import scipy.sparse as sp
+
+    manifesto = obter_manifesto()
+    anos = {str(a) for a in anos} if anos is not None else None
+
+    reconstruidos = []
+    for (_, ano) in sorted(manifesto.derivados(ESTAGIO_PARQUET, "presencas")):
+        if anos is not None and ano not in anos:
+            continue
+        versao = _versao_entrada(manifesto, ano)
+        diretorio = diretorio_matriz(ano)
+        if (not forcar and os.path.exists(os.path.join(diretorio, "presencas.npz"))
+                and not manifesto.precisa_reconstruir(ESTAGIO_MATRIZ, TIPO_MATRIZ, ano, versao)):
+            continue
+
+        print(f"🧮 Montando matriz de presenças de {ano}...")
+        with medir("matriz", TIPO_MATRIZ, ano) as medicao:
+            matriz, eventos, orgaos = _construir_ano(ano)
+            os.makedirs(diretorio, exist_ok=True)
+            destino = os.path.join(diretorio, "presencas.npz")
+            with open(destino + ".part", "wb") as arquivo:
+                sp.save_npz(arquivo, matriz, compressed=True)
+            os.replace(destino + ".part", destino)
+            for nome, tabela in (("eventos", eventos), ("orgaos", orgaos)):
+                destino = os.path.join(diretorio, f"{nome}.parquet")
+                pq.write_table(tabela, destino + ".part", compression=COMPRESSAO_PARQUET)
+                os.replace(destino + ".part", destino)
+            medicao.adicionar(linhas=int(matriz.nnz), bytes=os.path.getsize(os.path.join(diretorio, "presencas.npz")))
+        manifesto.registrar_derivado(ESTAGIO_MATRIZ, TIPO_MATRIZ, ano, versao)
+        reconstruidos.append(ano)
+
+    if reconstruidos:
+        print(f"✅ Matrizes de presença atualizadas para {len(reconstruidos)} anos.")
+    return reconstruidos
+
+
+class PresencasAno:
+    """
+    Matriz de um ano carregada em memória, com os atributos dos eventos
+    como arrays alinhados às colunas.
+    """
+
+    def __init__(self, ano):
+        import scipy.sparse as sp
+
+        diretorio = diretorio_matriz(ano)
+        self.ano = int(ano)
+        self.matriz = sp.load_npz(os.path.join(diretorio, "presencas.npz")).tocsr()
+        eventos = pq.read_table(os.path.join(diretorio, "eventos.parquet")).combine_chunks()
+        self.ids_eventos = eventos["idEvento"].to_numpy()
+        self.meses = eventos["mes"].to_numpy()
+        tipos = eventos["tipo"].chunk(0)
+        self.tipos, self.nomes_tipos = tipos.indices.to_numpy(), np.asarray(tipos.dictionary.to_pylist(), dtype=object)
+        orgaos = pq.read_table(os.path.join(diretorio, "orgaos.parquet")).combine_chunks()
+        siglas = orgaos["siglaOrgao"].chunk(0)
+        self.pares_eventos = orgaos["coluna"].to_numpy()
+        self.pares_orgaos = siglas.indices.to_numpy()
+        self.nomes_orgaos = np.asarray(siglas.dictionary.to_pylist(), dtype=object)
+
+    def _pares(self, por, orgaos_filtro):
+        """
+        Pares (evento, mês, tipo, órgão) que entram no cálculo: um por
+        evento, ou um por (evento, órgão) quando o recorte é por órgão.
+        """
+        if "orgao" in por or orgaos_filtro is not None:
+            eventos, orgaos = self.pares_eventos, self.pares_orgaos
+        else:
+            eventos = np.arange(len(self.ids_eventos))
+            orgaos = np.full(len(eventos), -1)
+        return eventos, self.meses[eventos], self.tipos[eventos], orgaos
+
+    def taxas(self, por=(), tipos=None, orgaos=None):
+        """
+        Presenças, eventos esperados e taxa por deputado e recorte.
+
+        O deputado é esperado nos eventos dos meses em que registrou alguma
+        presença (no mesmo órgão, quando o recorte é por órgão): assim a
+        taxa não pune meses fora do exercício do mandato.
+        """
+        import pandas as pd
+        import scipy.sparse as sp
+
+        por = [p for p in por if p != "ano"]
+        desconhecidos = set(por) - set(RECORTES)
+        if desconhecidos:
+            raise ValueError(f"Recortes não suportados: {sorted(desconhecidos)}")
+
+        ativos = np.flatnonzero(np.diff(self.matriz.indptr))
+        presenca = self.matriz[ativos].astype(np.int32)
+        n_eventos = len(self.ids_eventos)
+        eventos, meses, codigos_tipos, codigos_orgaos = self._pares(por, orgaos)
+
+        # Atividade: (órgão,) mês em que o deputado esteve em algum evento.
+        atividade = meses.astype(np.int64) + (13 * (codigos_orgaos.astype(np.int64) + 1) if "orgao" in por else 0)
+        codigos_atividade, atividade = np.unique(atividade, return_inverse=True)
+        ativo = (presenca @ sp.csr_matrix(
+            (np.ones(len(eventos), dtype=np.int32), (eventos, atividade)), shape=(n_eventos, len(codigos_atividade))
+        )) > 0
+
+        selecionados = np.ones(len(eventos), dtype=bool)
+        if tipos is not None:
+            selecionados &= np.isin(self.nomes_tipos[codigos_tipos], list(tipos))
+        if orgaos is not None:
+            selecionados &= np.isin(self.nomes_orgaos[codigos_orgaos], list(orgaos))
+
+        recortes = {"mes": meses, "tipo": codigos_tipos, "orgao": codigos_orgaos}
+        valores = np.column_stack([recortes[p][selecionados] for p in por]) if por else \
+            np.zeros((int(selecionados.sum()), 1), dtype=np.int64)
+        grupos, grupo = np.unique(valores, axis=0, return_inverse=True)
+        grupo = grupo.ravel()
+        eventos_sel, atividade_sel = eventos[selecionados], atividade[selecionados]
+        # Um evento de vários órgãos conta uma vez por grupo.
+        _, primeiros = np.unique(eventos_sel.astype(np.int64) * max(len(grupos), 1) + grupo, return_index=True)
+        eventos_sel, atividade_sel, grupo = eventos_sel[primeiros], atividade_sel[primeiros], grupo[primeiros]
+
+        um = np.ones(len(grupo), dtype=np.int32)
+        por_grupo = sp.csr_matrix((um, (eventos_sel, grupo)), shape=(n_eventos, len(grupos)))
+        esperados_por_atividade = sp.csr_matrix((um, (atividade_sel, grupo)),
+                                                shape=(len(codigos_atividade), len(grupos)))
+        presentes = (presenca @ por_grupo).tocsr()
+        esperados = (ativo.astype(np.int32) @ esperados_por_atividade).tocoo()
+
+        linhas, colunas = esperados.row, esperados.col
+        presencas_grupo = np.asarray(presentes[linhas, colunas]).ravel()
+        resultado = pd.DataFrame({
+            CHAVE: ativos[linhas].astype(np.int32),
+            "ano": np.full(len(linhas), self.ano, dtype=np.int16),
+        })
+        for i, p in enumerate(por):
+            coluna = grupos[colunas, i]
+            if p == "tipo":
+                coluna = self.nomes_tipos[coluna]
+            elif p == "orgao":
+                coluna = self.nomes_orgaos[coluna]
+            resultado[p] = coluna
+        resultado["presencas"] = presencas_grupo
+        resultado["eventos"] = esperados.data
+        resultado["taxa"] = presencas_grupo / esperados.data
+        return resultado.sort_values([CHAVE, *por], kind="stable", ignore_index=True)
+
+
+class MatrizPresencas:
+    """
+    Taxas de presença vetorizadas sobre as matrizes anuais.
+    """
+
+    def __init__(self, anos=None):
+        self.anos = {}
+        raiz = os.path.join(DIRETORIO_PROCESSED, TIPO_MATRIZ)
+        for nome in sorted(os.listdir(raiz)) if os.path.isdir(raiz) else []:
+            ano = nome.removeprefix("ano=")
+            if anos is not None and ano not in {str(a) for a in anos}:
+                continue
+            if os.path.exists(os.path.join(diretorio_matriz(ano), "presencas.npz")):
+                self.anos[int(ano)] = PresencasAno(ano)
+
+    def taxas(self, anos=None, por=(), tipos=None, orgaos=None):
+        """
+        DataFrame (chave_deputado, ano, <por...>, presencas, eventos, taxa).
+        `por` combina "mes", "tipo" (descricaoTipo) e "orgao" (siglaOrgao);
+        `tipos` e `orgaos` restringem os eventos considerados.
+
+        Exemplo: presença por comissão em 2023 ->
+            taxas(anos=[2023], por=["orgao"])
+        """
+        import pandas as pd
+
+        selecionados = sorted(self.anos) if anos is None else [int(a) for a in anos if int(a) in self.anos]
+        partes = [self.anos[ano].taxas(por, tipos, orgaos) for ano in selecionados]
+        if not partes:
+            return pd.DataFrame(columns=[CHAVE, "ano", *[p for p in por if p != "ano"],
+                                         "presencas", "eventos", "taxa"])
+        return pd.concat(partes, ignore_index=True)
+
+
+# Matrizes compartilhadas pelo processo, recarregadas quando alguma muda.
+_matrizes = (None, None)
+_matrizes_lock = threading.Lock()
+
+
+def obter_matriz_presencas() -> MatrizPresencas:
+    global _matrizes
+    versao = versoes_particoes(ESTAGIO_MATRIZ, TIPO_MATRIZ)
+    with _matrizes_lock:
+        if _matrizes[0] != versao:
+            _matrizes = (versao, MatrizPresencas())
+        return _matrizes[1]
+
+
+def indicador_presenca(anos=None, tipos=None, orgaos=None, nome: str = "presenca"):
+    """
+    Taxa de presença por deputado e ano, no formato de `montar_indicadores`
+    (chave_deputado, ano, <nome>).
+    """
+    taxas = obter_matriz_presencas().taxas(anos=anos, tipos=tipos, orgaos=orgaos)
+    return taxas[[CHAVE, "ano", "taxa"]].rename(columns={"taxa": nome})
@@ -0,0 +1,522 @@
+# legisdata/processamento.py
+
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
+
+from legisdata.config import (DIRETORIO_PROCESSED, COMPRESSAO_PARQUET, CONVERSAO_POR_DIFERENCA,
+                              LINHAS_POR_GRUPO_PARQUET, PROCESSOS_PROCESSAMENTO)
+from legisdata.delta import (IndiceLinhas, comparar, conteudos_mantidos, filtrar_mantidas,
+                             gravar_indice_linhas, ler_indice_linhas)
+from legisdata.dimensao import (CHAVE, caminho_historico_deputados,
+                                descartar_dimensao, dimensao_deputados, gravar_dimensao_deputados,
+                                gravar_historico_deputados)
+from legisdata.esquemas import ESQUEMAS
+from legisdata.manifesto import obter_manifesto, novo_hash
+from legisdata.metricas import RegistroMetricas, obter_registro
+from legisdata.utils.io import abrir_raw, caminho_raw
+from legisdata.coleta.checkpoint import obter_checkpoint
+
+TAMANHO_BLOCO_CSV = 16 * 1024 * 1024
+
+# Nome do estágio de conversão no manifesto de derivados.
+ESTAGIO_PARQUET = "parquet"
+
+
+def caminho_processado(tipo: str, ano) -> str:
+    """
+    Caminho do Parquet de (tipo, ano), particionado no estilo hive
+    (<tipo>/ano=<ano>/) para que leitores de dataset façam o recorte por ano.
+    Nos tipos particionados por mês, é o diretório do ano, com um
+    mes=<mês>/dados.parquet para cada mês.
+    """
+    if ano == "geral":
+        return os.path.join(DIRETORIO_PROCESSED, tipo, "dados.parquet")
+    if ESQUEMAS.get(tipo, {}).get("particionar_mes"):
+        return os.path.join(DIRETORIO_PROCESSED, tipo, f"ano={ano}")
+    return os.path.join(DIRETORIO_PROCESSED, tipo, f"ano={ano}", "dados.parquet")
+
+
+def tamanho_processado(tipo: str, ano) -> int:
+    """
+    Bytes da partição processada de (tipo, ano), arquivo ou diretório.
+    """
+    caminho = caminho_processado(tipo, ano)
+    if os.path.isfile(caminho):
+        return os.path.getsize(caminho)
+    return sum(os.path.getsize(os.path.join(raiz, nome))
+               for raiz, _, nomes in os.walk(caminho) for nome in nomes)
+
+
+def abrir_leitor_csv(tipo: str, fluxo):
+    """
+    Abre um leitor Arrow em streaming (parser C multithread) sobre o fluxo
+    binário de um arquivo bruto, já com os tipos do esquema do dataset.
+    """
+    esquema = ESQUEMAS[tipo]
+    if "separador" not in esquema:
+        raise ValueError(f"O dataset {tipo} não tem arquivo bruto em CSV.")
+    return pacsv.open_csv(
+        fluxo,
+        read_options=pacsv.ReadOptions(
+            encoding=esquema["codificacao"], block_size=TAMANHO_BLOCO_CSV
+        ),
+        parse_options=pacsv.ParseOptions(
+            delimiter=esquema["separador"], newlines_in_values=True
+        ),
+        convert_options=pacsv.ConvertOptions(
+            column_types=esquema["colunas"],
+            include_columns=list(esquema["colunas"]),
+            include_missing_columns=True,
+            strings_can_be_null=True,
+        ),
+    )
+
+
+def _adicionar_id_deputado(lote: pa.RecordBatch) -> pa.RecordBatch:
+    # deputados.csv não traz o id numérico, só a uri .../deputados/<id>.
+    ids = pc.extract_regex(lote.column("uri"), r"/deputados/(?P<id>\d+)$").field("id")
+    return lote.append_column("id_deputado", pc.cast(ids, pa.int64()))
+
+
+def _exigir_dimensao():
+    dimensao = dimensao_deputados()
+    if dimensao is None:
+        raise ValueError("Dimensão de deputados ainda não gerada: processe deputados antes.")
+    return dimensao
+
+
+# Identificação do deputado na CEAP: vira a chave da dimensão na conversão.
+_IDENTIFICACAO_GASTOS = ["ideCadastro", "txNomeParlamentar", "cpf", "nuCarteiraParlamentar", "nuDeputadoId"]
+
+
+def _adicionar_chave_deputado(lote: pa.RecordBatch) -> pa.RecordBatch:
+    # Pelo ideCadastro e, sem ele, pelo nome; lideranças ficam sem chave.
+    chaves = _exigir_dimensao().resolver(ids=lote.column("ideCadastro"), nomes=lote.column("txNomeParlamentar"))
+    lote = lote.select([n for n in lote.schema.names if n not in _IDENTIFICACAO_GASTOS])
+    return lote.append_column(CHAVE, chaves)
+
+
+def _adicionar_chave_autor(lote: pa.RecordBatch) -> pa.RecordBatch:
+    # O nome só fica para autores fora da dimensão (órgãos, Senado, Executivo).
+    chaves = _exigir_dimensao().resolver(ids=lote.column("idDeputadoAutor"), nomes=lote.column("nomeAutor"))
+    nomes = pc.if_else(pc.is_null(chaves), lote.column("nomeAutor"), pa.scalar(None, pa.string()))
+    lote = lote.set_column(lote.schema.get_field_index("nomeAutor"), "nomeAutor", nomes)
+    lote = lote.select([n for n in lote.schema.names if n != "idDeputadoAutor"])
+    return lote.append_column(CHAVE, chaves)
+
+
+def _adicionar_chave_presente(lote: pa.RecordBatch) -> pa.RecordBatch:
+    chaves = _exigir_dimensao().chaves_por_id(lote.column("idDeputado"))
+    lote = lote.select([n for n in lote.schema.names if n != "idDeputado"])
+    return lote.append_column(CHAVE, chaves)
+
+
+# Colunas derivadas calculadas lote a lote durante a conversão.
+_TRANSFORMACOES = {
+    "deputados": _adicionar_id_deputado,
+    "gastos": _adicionar_chave_deputado,
+    "autores": _adicionar_chave_autor,
+    "presencas": _adicionar_chave_presente,
+    # Membros de comissões trazem o deputado na mesma coluna idDeputado.
+    "comissoes": _adicionar_chave_presente,
+}
+
+# Tipos cuja partição depende também da dimensão de deputados.
+_USAM_DIMENSAO = {"gastos", "autores", "presencas", "comissoes"}
+
+# Entra no hash das partições: muda quando o formato gravado de um tipo
+# muda (colunas derivadas da dimensão, particionamento), forçando a
+# reconversão.
+_VERSOES_FORMATO = {
+    "gastos": "chave_deputado-int32;mes-ordenado;hash-arrow",
+    "autores": "chave_deputado-int32",
+    "presencas": "chave_deputado-int32",
+    "comissoes": "chave_deputado-int32",
+}
+
+
+def _lotes_convertidos(tipo: str, ano, fluxo):
+    transformar = _TRANSFORMACOES.get(tipo)
+    renomear = ESQUEMAS[tipo].get("renomear")
+    with (nullcontext(fluxo) if fluxo is not None else abrir_raw(tipo, ano)) as origem:
+        for lote in abrir_leitor_csv(tipo, origem):
+            if renomear:
+                lote = lote.rename_columns([renomear.get(n, n) for n in lote.schema.names])
+            if transformar is not None:
+                lote = transformar(lote)
+            yield lote
+
+
+def converter_para_parquet(tipo: str, ano, fluxo=None) -> int:
+    """
+    Converte data/raw/<tipo>/<ano>.csv (ou o .zip mantido) em Parquet tipado,
+    lote a lote, sem carregar o arquivo inteiro em memória.
+
+    `fluxo` permite converter a partir de um fluxo já aberto (por exemplo,
+    o membro do zip sendo extraído pela coleta). Retorna o número de linhas.
+    """
+    destino = caminho_processado(tipo, ano)
+    os.makedirs(os.path.dirname(destino), exist_ok=True)
+    if ESQUEMAS[tipo].get("particionar_mes"):
+        return _converter_por_mes(tipo, ano, fluxo)
+
+    parcial = destino + ".part"
+    linhas = 0
+    escritor = None
+    try:
+        for lote in _lotes_convertidos(tipo, ano, fluxo):
+            if escritor is None:
+                escritor = pq.ParquetWriter(parcial, lote.schema, compression=COMPRESSAO_PARQUET)
+            escritor.write_batch(lote)
+            linhas += lote.num_rows
+    finally:
+        if escritor is not None:
+            escritor.close()
+
+    if escritor is None:
+        raise ValueError(f"Arquivo bruto de {tipo} {ano} está vazio.")
+
+    os.replace(parcial, destino)
+    return linhas
+
+
+def _diretorio_parcial(destino: str) -> str:
+    # Oculto (prefixo "."): os leitores de dataset não o enxergam.
+    return os.path.join(os.path.dirname(destino), f".{os.path.basename(destino)}.part")
+
+
+def _gravar_meses(tipo: str, lotes, parcial: str, meses=None):
+    """
+    Grava os lotes em <parcial>/mes=<mês>/dados.parquet, um escritor por mês
+    (só os `meses` pedidos, se informados), e ordena cada mês ao fim. Só um
+    mês por vez fica inteiro em memória. Retorna (meses gravados, linhas lidas).
+    """
+    coluna_mes = ESQUEMAS[tipo]["particionar_mes"]
+    escritores, linhas = {}, 0
+    try:
+        for lote in lotes:
+            linhas += lote.num_rows
+            valores = pc.fill_null(lote.column(coluna_mes), 0)
+            for mes in pc.unique(valores).to_pylist():
+                if meses is not None and mes not in meses:
+                    continue
+                if mes not in escritores:
+                    caminho = os.path.join(parcial, f"mes={mes}", "dados.parquet")
+                    os.makedirs(os.path.dirname(caminho), exist_ok=True)
+                    escritores[mes] = pq.ParquetWriter(caminho, lote.schema, compression=COMPRESSAO_PARQUET)
+                escritores[mes].write_batch(lote.filter(pc.equal(valores, mes)))
+    finally:
+        for escritor in escritores.values():
+            escritor.close()
+
+    for mes in escritores:
+        _ordenar_particao(tipo, os.path.join(parcial, f"mes={mes}", "dados.parquet"))
+    return set(escritores), linhas
+
+
+def _converter_por_mes(tipo: str, ano, fluxo) -> int:
+    """
+    Grava o ano inteiro num diretório oculto e troca o diretório do ano.
+    Tipos com `chave_linha` gravam também o índice de linhas, no mesmo passe.
+    """
+    destino = caminho_processado(tipo, ano)
+    parcial = _diretorio_parcial(destino)
+    shutil.rmtree(parcial, ignore_errors=True)
+
+    lotes = _lotes_convertidos(tipo, ano, fluxo)
+    indice = IndiceLinhas(tipo) if ESQUEMAS[tipo].get("chave_linha") else None
+    gravados, linhas = _gravar_meses(tipo, indice.acompanhar(lotes) if indice else lotes, parcial)
+    if not gravados:
+        raise ValueError(f"Arquivo bruto de {tipo} {ano} está vazio.")
+
+    _substituir_diretorio(parcial, destino)
+    if indice is not None:
+        gravar_indice_linhas(tipo, ano, indice.tabela(_VERSOES_FORMATO[tipo]))
+    return linhas
+
+
+def pode_aplicar_delta(tipo: str, ano) -> bool:
+    """
+    Se (tipo, ano) pode ser reprocessado só pela diferença de linhas: o tipo
+    tem `chave_linha`, a partição existe e o índice de linhas está no formato
+    atual.
+    """
+    return bool(
+        CONVERSAO_POR_DIFERENCA
+        and ESQUEMAS[tipo].get("chave_linha")
+        and os.path.isdir(caminho_processado(tipo, ano))
+        and ler_indice_linhas(tipo, ano, _VERSOES_FORMATO[tipo]) is not None
+    )
+
+
+def aplicar_delta(tipo: str, ano):
+    """
+    Reprocessa (tipo, ano) pela diferença para o índice de linhas gravado.
+    Um único passe pelo bruto novo calcula o índice e guarda só as linhas de
+    conteúdo inédito (novas ou alteradas). Cada mês afetado é refeito com
+    essas linhas e as da partição gravada que seguem no bruto, trocando um
+    diretório mes=<mês> de cada vez. Só quando linhas idênticas repetidas
+    mudam de número de ocorrências os meses saem de um segundo passe pelo
+    bruto. Retorna (linhas, Diferenca).
+    """
+    formato = _VERSOES_FORMATO[tipo]
+    anterior = ler_indice_linhas(tipo, ano, formato)
+    indice = IndiceLinhas(tipo, anterior=anterior)
+    linhas = sum(lote.num_rows for lote in indice.acompanhar(_lotes_convertidos(tipo, ano, None)))
+    atual = indice.tabela(formato)
+    diferenca = comparar(anterior, atual)
+
+    if diferenca.meses:
+        destino = caminho_processado(tipo, ano)
+        parcial = _diretorio_parcial(destino)
+        shutil.rmtree(parcial, ignore_errors=True)
+        mantidos = conteudos_mantidos(anterior, atual)
+        if mantidos is None:
+            gravados, _ = _gravar_meses(tipo, _lotes_convertidos(tipo, ano, None), parcial, meses=diferenca.meses)
+        else:
+            gravados = _regravar_meses(tipo, destino, parcial, diferenca.meses, indice.retidas, mantidos)
+        for mes in diferenca.meses:
+            if mes in gravados:
+                _substituir_diretorio(os.path.join(parcial, f"mes={mes}"), os.path.join(destino, f"mes={mes}"))
+            else:
+                shutil.rmtree(os.path.join(destino, f"mes={mes}"), ignore_errors=True)
+        shutil.rmtree(parcial, ignore_errors=True)
+
+    gravar_indice_linhas(tipo, ano, atual)
+    return linhas, diferenca
+
+
+def _regravar_meses(tipo: str, destino: str, parcial: str, meses, retidas, mantidos) -> set:
+    """
+    Refaz cada mês de `meses` em <parcial>/mes=<mês>/dados.parquet: as
+    linhas gravadas em <destino> cujo conteúdo está em `mantidos` mais os
+    lotes `retidas` do mês, ordenados como na conversão. Lê só os meses
+    afetados, não o bruto. Retorna os meses gravados (os que ficaram com
+    alguma linha).
+    """
+    coluna_mes = ESQUEMAS[tipo]["particionar_mes"]
+    novas = _colunas_ordenacao_texto(tipo, pa.Table.from_batches(retidas)) if retidas else None
+    gravados = set()
+    for mes in sorted(meses):
+        partes = []
+        caminho = os.path.join(destino, f"mes={mes}", "dados.parquet")
+        if os.path.exists(caminho):
+            partes.append(filtrar_mantidas(pq.read_table(caminho), mantidos))
+        if novas is not None:
+            partes.append(novas.filter(pc.equal(pc.fill_null(novas.column(coluna_mes), 0), mes)))
+            # Instantes voltam do Parquet em ms: tudo no esquema da conversão.
+            partes = [parte.cast(novas.schema) for parte in partes]
+        tabela = pa.concat_tables(partes) if partes else None
+        if tabela is None or not tabela.num_rows:
+            continue
+        saida = os.path.join(parcial, f"mes={mes}", "dados.parquet")
+        os.makedirs(os.path.dirname(saida), exist_ok=True)
+        pq.write_table(_ordenar_tabela(tipo, tabela), saida,
+                       compression=COMPRESSAO_PARQUET, row_group_size=LINHAS_POR_GRUPO_PARQUET)
+        gravados.add(mes)
+    return gravados
+
+
+def _colunas_ordenacao_texto(tipo: str, tabela: pa.Table) -> pa.Table:
+    # Colunas de ordenação como texto: o Arrow não ordena dicionários e os
+    # filtros só usam as estatísticas dos grupos de linhas em colunas de texto.
+    for nome in ESQUEMAS[tipo].get("ordenar", []):
+        if pa.types.is_dictionary(tabela.schema.field(nome).type):
+            indice = tabela.schema.get_field_index(nome)
+            tabela = tabela.set_column(indice, nome, pc.cast(tabela.column(nome), pa.string()))
+    return tabela
+
+
+def _ordenar_tabela(tipo: str, tabela: pa.Table) -> pa.Table:
+    ordenar = ESQUEMAS[tipo].get("ordenar")
+    tabela = _colunas_ordenacao_texto(tipo, tabela)
+    return tabela.sort_by([(nome, "ascending") for nome in ordenar]) if ordenar else tabela
+
+
+def _ordenar_particao(tipo: str, caminho: str):
+    if not ESQUEMAS[tipo].get("ordenar"):
+        return
+    tabela = _ordenar_tabela(tipo, pq.ParquetFile(caminho).read())
+    pq.write_table(tabela, caminho, compression=COMPRESSAO_PARQUET, row_group_size=LINHAS_POR_GRUPO_PARQUET)
+
+
+def _substituir_diretorio(novo: str, destino: str):
+    # Dois renames: leitores veem o diretório antigo ou o novo, nunca um
+    # ano (ou mês) pela metade.
+    antigo = os.path.join(os.path.dirname(destino), f".{os.path.basename(destino)}.old")
+    shutil.rmtree(antigo, ignore_errors=True)
+    if os.path.exists(destino):
+        os.replace(destino, antigo)
+    os.replace(novo, destino)
+    shutil.rmtree(antigo, ignore_errors=True)
+
+
+def versao_processada(tipo: str, ano):
+    """
+    Versão (hash do bruto de origem) da partição processada de (tipo, ano),
+    ou None se ela ainda não foi gerada. Estágios seguintes usam esse valor
+    como hash de entrada.
+    """
+    return obter_manifesto().hash_derivado(ESTAGIO_PARQUET, tipo, ano)
+
+
+def _hash_entrada(manifesto, tipo: str, ano) -> str:
+    hash_raw = manifesto.hash_raw(tipo, ano, caminho_raw(tipo, ano))
+    if tipo not in _USAM_DIMENSAO:
+        return hash_raw
+    # Uma nova versão de deputados também invalida as partições que a usam.
+    combinado = novo_hash()
+    combinado.update(hash_raw.encode())
+    combinado.update((versao_processada("deputados", "geral") or "").encode())
+    combinado.update(_VERSOES_FORMATO.get(tipo, "").encode())
+    return combinado.hexdigest()
+
+
+def registrar_conversao(tipo: str, ano):
+    """
+    Registra no manifesto a partição de (tipo, ano) convertida fora de
+    `processar` (ex.: durante a extração da CEAP na coleta). O bruto já
+    deve estar registrado.
+    """
+    manifesto = obter_manifesto()
+    manifesto.registrar_derivado(ESTAGIO_PARQUET, tipo, ano, _hash_entrada(manifesto, tipo, ano))
+
+
+def _planejar(tipos, anos, forcar: bool):
+    # Um (tipo, ano) do checkpoint sem arquivo bruto (linha migrada do CSV
+    # legado, arquivo apagado) vira falha dessa partição, não da execução.
+    manifesto = obter_manifesto()
+    pendentes, inalterados, falhas = [], 0, []
+    for tipo, ano in sorted(obter_checkpoint().registrados()):
+        if tipo not in tipos or (anos is not None and ano not in anos):
+            continue
+        try:
+            hash_entrada = _hash_entrada(manifesto, tipo, ano)
+        except OSError as e:
+            falhas.append((tipo, ano, f"{type(e).__name__}: {e}"))
+            continue
+        if (not forcar
+                and os.path.exists(caminho_processado(tipo, ano))
+                and not manifesto.precisa_reconstruir(ESTAGIO_PARQUET, tipo, ano, hash_entrada)):
+            inalterados += 1
+            continue
+        pendentes.append((tipo, ano, hash_entrada))
+    return pendentes, inalterados, falhas
+
+
+def _converter_medindo(tipo: str, ano, forcar: bool = False):
+    """
+    Converte (tipo, ano) e devolve (linhas, medição, erro). Roda nos workers:
+    não toca no manifesto nem no checkpoint, só no sistema de arquivos.
+    Sem `forcar`, partições com índice de linhas são atualizadas pela
+    diferença em vez de reconvertidas.
+    """
+    registro = RegistroMetricas(arquivo_log=None)
+    try:
+        with registro.medir("processamento", tipo, ano) as medicao:
+            if not forcar and pode_aplicar_delta(tipo, ano):
+                linhas, diferenca = aplicar_delta(tipo, ano)
+                print(f"🔁 {tipo} {ano}: {diferenca.novas} novas, {diferenca.alteradas} alteradas, "
+                      f"{diferenca.removidas} removidas; {len(diferenca.meses)} meses regravados.")
+            else:
+                linhas = converter_para_parquet(tipo, ano)
+            medicao.adicionar(linhas=linhas, bytes=os.path.getsize(caminho_raw(tipo, ano)))
+        return linhas, medicao, None
+    except Exception as e:
+        return None, registro.medicoes[-1], f"{type(e).__name__}: {e}"
+
+
+def _iniciar_worker(threads: int):
+    # Cada processo usa uma fatia dos núcleos no parser do Arrow, para que
+    # N processos não disputem N × núcleos threads.
+    pa.set_cpu_count(threads)
+    descartar_dimensao()
+    dimensao_deputados()
+
+
+def _executar(pendentes, processos: int, forcar: bool = False) -> dict:
+    # Maiores arquivos primeiro, para não sobrar um ano grande no fim.
+    pendentes = sorted(pendentes, key=lambda p: os.path.getsize(caminho_raw(p[0], p[1])), reverse=True)
+    for tipo, ano, _ in pendentes:
+        print(f"⚙️  Convertendo {tipo} {ano} para Parquet...")
+
+    if processos <= 1 or len(pendentes) <= 1:
+        return {(tipo, ano): _converter_medindo(tipo, ano, forcar) for tipo, ano, _ in pendentes}
+
+    processos = min(processos, len(pendentes))
+    threads = max(1, (os.cpu_count() or 1) // processos)
+    with ProcessPoolExecutor(max_workers=processos, initializer=_iniciar_worker, initargs=(threads,)) as pool:
+        futuros = {(tipo, ano): pool.submit(_converter_medindo, tipo, ano, forcar) for tipo, ano, _ in pendentes}
+        return {chave: futuro.result() for chave, futuro in futuros.items()}
+
+
+def _consolidar(pendentes, resultados: dict, falhas=()) -> list:
+    # Registro no manifesto e saída sempre na mesma ordem (tipo, ano),
+    # independente de qual worker terminou primeiro. As `falhas` do
+    # planejamento entram na mesma lista de erros do fim.
+    manifesto, registro = obter_manifesto(), obter_registro()
+    convertidos, erros = [], []
+    for tipo, ano, erro in falhas:
+        print(f"❌ Erro ao planejar {tipo} {ano}: {erro}")
+        erros.append(f"{tipo} {ano}: {erro}")
+    for tipo, ano, hash_entrada in sorted(pendentes):
+        linhas, medicao, erro = resultados[(tipo, ano)]
+        registro.incluir(medicao)
+        if erro:
+            print(f"❌ Erro ao converter {tipo} {ano}: {erro}")
+            erros.append(f"{tipo} {ano}: {erro}")
+            continue
+        manifesto.registrar_derivado(ESTAGIO_PARQUET, tipo, ano, hash_entrada)
+        print(f"✅ {tipo} {ano}: {linhas} linhas em {caminho_processado(tipo, ano)}")
+        convertidos.append((tipo, ano, linhas))
+    if erros:
+        raise RuntimeError(f"{len(erros)} partições falharam na conversão: " + "; ".join(erros))
+    return convertidos
+
+
+def processar(tipos=None, anos=None, forcar: bool = False, processos: int = PROCESSOS_PROCESSAMENTO) -> list:
+    """
+    Converte para Parquet os (tipo, ano) registrados no checkpoint cujo
+    arquivo bruto mudou desde a última conversão (pelo hash do manifesto),
+    opcionalmente filtrando por tipos e anos. Retorna [(tipo, ano, linhas)]
+    das partições reconstruídas, em ordem.
+
+    Deputados vêm primeiro e geram a dimensão (chave int32) mapeada em
+    memória; os demais (tipo, ano) são independentes e convertidos em
+    paralelo, um por processo. Por fim, o histórico de partido e UF é
+    refeito a partir dos gastos, se eles mudaram.
+    """
+    tipos = set(tipos or ESQUEMAS)
+    tipos = {t for t in tipos if t in ESQUEMAS and "separador" in ESQUEMAS[t]}
+    anos = {str(a) for a in anos} if anos is not None else None
+    processos = processos or os.cpu_count() or 1
+
+    convertidos = []
+    inalterados = 0
+    if "deputados" in tipos:
+        pendentes, inalterados, falhas = _planejar({"deputados"}, None, forcar)
+        convertidos += _consolidar(pendentes, _executar(pendentes, 1), falhas)
+        if pendentes or (os.path.exists(caminho_processado("deputados", "geral"))
+                         and dimensao_deputados() is None):
+            gravar_dimensao_deputados()
+
+    pendentes, ignorados, falhas = _planejar(tipos - {"deputados"}, anos, forcar)
+    inalterados += ignorados
+    convertidos += _consolidar(pendentes, _executar(pendentes, processos, forcar), falhas)
+
+    # Partido e UF ao longo do tempo vêm das linhas da CEAP já com a chave.
+    if any(tipo == "gastos" for tipo, _, _ in pendentes) or (
+            os.path.isdir(os.path.join(DIRETORIO_PROCESSED, "gastos"))
+            and not os.path.exists(caminho_historico_deputados())):
+        print(f"🗂️  Histórico de partido e UF: {gravar_historico_deputados()} mudanças.")
+
+    if inalterados:
+        print(f"⏭️  {inalterados} partições sem alteração nos arquivos brutos.")
+    return convertidos
@@ -0,0 +1,295 @@
+# legisdata/relatorios.py
+#
+# Relatório HTML de cada deputado: quadrante, gasto da CEAP e produtividade
+# por ano, e gasto por categoria. Tudo vem dos agregados já calculados (cubo
+# de gastos, índice de autoria, matrizes de presença e dimensão de
+# deputados); nenhuma linha de despesa é relida.
+#
+# As entradas de todos os deputados são montadas de uma vez no processo
+# principal, cada uma com uma impressão digital (hash do seu conteúdo e dos
+# modelos). Só os relatórios cuja impressão mudou desde a última geração são
+# renderizados, em lotes, num pool de processos. Cada worker compila os
+# modelos uma vez e mantém em cache as partes repetidas dos gráficos (SVG).
+
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from html import escape
+from string import Template
+
+from legisdata.config import DIRETORIO_RELATORIOS, PROCESSOS_RELATORIOS
+from legisdata.dimensao import CHAVE, dimensao_deputados
+from legisdata.manifesto import novo_hash
+
+ARQUIVO_IMPRESSOES = os.path.join(DIRETORIO_RELATORIOS, "impressoes.json")
+
+# Relatórios por tarefa enviada ao pool (menos idas e voltas entre processos).
+RELATORIOS_POR_TAREFA = 32
+
+# Categorias exibidas no gráfico; as demais são somadas em "Outras".
+MAX_CATEGORIAS = 10
+
+_MODELOS = {
+    "pagina": """<!DOCTYPE html>
+<html lang="pt-BR">
+<head><meta charset="utf-8"><title>$nome</title></head>
+<body>
+<h1>$nome</h1>
+<p>$partido · $uf · id $id_deputado</p>
+<h2>Quadrante por ano</h2>
+$grafico_quadrantes
+<table>
+<tr><th>Ano</th><th>Partido</th><th>Gasto CEAP (R$$)</th><th>Proposições</th><th>Presença</th><th>Quadrante</th></tr>
+$linhas_anos
+</table>
+<h2>Gasto por categoria</h2>
+$grafico_categorias
+</body>
+</html>
+""",
+    "linha_ano": "<tr><td>$ano</td><td>$partido</td><td>$gasto</td><td>$proposicoes</td>"
+                 "<td>$presenca</td><td>$quadrante</td></tr>",
+}
+
+
+def _versao_modelos() -> str:
+    versao = novo_hash()
+    versao.update(json.dumps(_MODELOS, sort_keys=True).encode())
+    versao.update(str(MAX_CATEGORIAS).encode())
+    return versao.hexdigest()
+
+
+def caminho_relatorio(id_deputado) -> str:
+    return os.path.join(DIRETORIO_RELATORIOS, f"{id_deputado}.html")
+
+
+def _registros_por_chave(quadro) -> dict:
+    registros = {}
+    for linha in quadro.to_dict("records"):
+        registros.setdefault(int(linha.pop(CHAVE)), []).append(linha)
+    return registros
+
+
+def montar_entradas() -> dict:
+    """
+    {chave_deputado: entrada} de todos os deputados com gasto no cubo. A
+    entrada é um dicionário serializável com tudo o que o relatório exibe,
+    com valores arredondados para que a impressão só mude quando o relatório
+    mudaria.
+    """
+    import numpy as np
+
+    from legisdata.analise import ESTAGIO_CUBO, TIPO_CUBO, consultar_gastos
+    from legisdata.cache import versoes_particoes
+    from legisdata.classificacao_quadrantes import classificar_agregados
+
+    dimensao = dimensao_deputados()
+    if dimensao is None or not versoes_particoes(ESTAGIO_CUBO, TIPO_CUBO):
+        return {}
+
+    por_categoria = consultar_gastos(por=[CHAVE, "ano", "categoria"], medidas=["total"])
+    por_categoria = por_categoria.dropna(subset=[CHAVE]).astype({CHAVE: np.int32, "ano": np.int16})
+    indicadores = classificar_agregados().drop(columns=["score_producao"], errors="ignore")
+
+    chaves = indicadores[CHAVE].to_numpy()
+    anomes = indicadores["ano"].to_numpy().astype(np.int64) * 100 + 12
+    tem_historico = dimensao.historico is not None
+    anos = indicadores.assign(
+        partido=dimensao.partido_em(chaves, anomes).to_pylist() if tem_historico else None,
+        uf=dimensao.uf_em(chaves, anomes).to_pylist() if tem_historico else None,
+        gasto=indicadores["gasto"].round(2),
+    ).sort_values([CHAVE, "ano"])
+    for coluna, casas in (("proposicoes", 0), ("presenca", 4)):
+        if coluna in anos.columns:
+            anos[coluna] = anos[coluna].round(casas)
+    if "descricao_quadrante" in anos.columns:
+        anos["descricao_quadrante"] = anos["descricao_quadrante"].astype(object)
+
+    categorias = (por_categoria.groupby([CHAVE, "categoria"], as_index=False, observed=True)["total"].sum()
+                  .assign(total=lambda q: q["total"].round(2))
+                  .sort_values([CHAVE, "total", "categoria"], ascending=[True, False, True]))
+
+    anos_por_chave = _registros_por_chave(anos)
+    categorias_por_chave = _registros_por_chave(categorias)
+    chaves = sorted(anos_por_chave)
+    ids = dimensao.ids(chaves).to_pylist() if chaves else []
+    nomes = dimensao.atributo(chaves, "nome").to_pylist() if chaves else []
+
+    entradas = {}
+    for chave, id_deputado, nome in zip(chaves, ids, nomes):
+        entradas[chave] = {
+            "chave": chave,
+            "id_deputado": id_deputado,
+            "nome": nome,
+            "anos": anos_por_chave[chave],
+            "categorias": [[c["categoria"], c["total"]] for c in categorias_por_chave.get(chave, [])],
+        }
+    return entradas
+
+
+def _impressao(entrada: dict, versao_modelos: str) -> str:
+    impressao = novo_hash()
+    impressao.update(versao_modelos.encode())
+    impressao.update(json.dumps(entrada, sort_keys=True, default=str).encode())
+    return impressao.hexdigest()
+
+
+def _ler_impressoes() -> dict:
+    if not os.path.exists(ARQUIVO_IMPRESSOES):
+        return {}
+    with open(ARQUIVO_IMPRESSOES, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _gravar_impressoes(impressoes: dict):
+    os.makedirs(os.path.dirname(ARQUIVO_IMPRESSOES), exist_ok=True)
+    with open(ARQUIVO_IMPRESSOES + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(impressoes, f)
+    os.replace(ARQUIVO_IMPRESSOES + ".tmp", ARQUIVO_IMPRESSOES)
+
+
+# Modelos compilados do processo (cada worker compila os seus uma vez).
+_modelos = None
+
+
+def _iniciar_worker():
+    global _modelos
+    _modelos = {nome: Template(texto) for nome, texto in _MODELOS.items()}
+
+
+def _reais(valor) -> str:
+    # 1234567.8 -> 1.234.567,80
+    return f"{valor:,.2f}".replace(",", "_").replace(".", ",").replace("_", ".")
+
+
+@lru_cache(maxsize=None)
+def _fundo_quadrantes() -> str:
+    from legisdata.classificacao_quadrantes import QUADRANTES
+
+    celulas = []
+    for quadrante, (x, y) in {1: (0, 0), 2: (200, 0), 3: (0, 110), 4: (200, 110)}.items():
+        celulas.append(f'<rect x="{x}" y="{y}" width="198" height="108" fill="#f3f3f3"/>'
+                       f'<text x="{x + 6}" y="{y + 16}" font-size="11">{escape(QUADRANTES[quadrante])}</text>')
+    return "".join(celulas)
+
+
+@lru_cache(maxsize=4096)
+def _marca_ano(quadrante: int, posicao: int, ano: int) -> str:
+    x = (200 if quadrante in (2, 4) else 0) + 10 + (posicao % 5) * 37
+    y = (110 if quadrante in (3, 4) else 0) + 40 + (posicao // 5) * 22
+    return f'<text x="{x}" y="{y}" font-size="12" font-weight="bold">{ano}</text>'
+
+
+def _grafico_quadrantes(anos: list) -> str:
+    marcas, ocupacao = [], {}
+    for linha in anos:
+        quadrante = linha.get("quadrante")
+        if quadrante is None or quadrante != quadrante:  # sem indicadores de produtividade / NaN
+            continue
+        quadrante = int(quadrante)
+        marcas.append(_marca_ano(quadrante, ocupacao.get(quadrante, 0), int(linha["ano"])))
+        ocupacao[quadrante] = ocupacao.get(quadrante, 0) + 1
+    if not marcas:
+        return "<p>Sem indicadores de produtividade para classificar.</p>"
+    return f'<svg xmlns="http://www.w3.org/2000/svg" width="400" height="220">{_fundo_quadrantes()}{"".join(marcas)}</svg>'
+
+
+@lru_cache(maxsize=1024)
+def _rotulo_categoria(posicao: int, categoria: str) -> str:
+    texto = categoria if len(categoria) <= 48 else categoria[:47] + "…"
+    return f'<text x="0" y="{posicao * 22 + 15}" font-size="11">{escape(texto)}</text>'
+
+
+def _grafico_categorias(categorias: list) -> str:
+    if not categorias:
+        return "<p>Sem gastos registrados.</p>"
+    if len(categorias) > MAX_CATEGORIAS:
+        outras = sum(total for _, total in categorias[MAX_CATEGORIAS - 1:])
+        categorias = [*categorias[:MAX_CATEGORIAS - 1], ["Outras", outras]]
+    maximo = max(total for _, total in categorias) or 1.0
+    partes = []
+    for posicao, (categoria, total) in enumerate(categorias):
+        largura = max(total, 0) / maximo * 300
+        partes.append(_rotulo_categoria(posicao, categoria))
+        partes.append(f'<rect x="300" y="{posicao * 22 + 4}" width="{largura:.1f}" height="14" fill="#4c72b0"/>'
+                      f'<text x="{305 + largura:.1f}" y="{posicao * 22 + 15}" font-size="11">{_reais(total)}</text>')
+    altura = len(categorias) * 22
+    return f'<svg xmlns="http://www.w3.org/2000/svg" width="720" height="{altura}">{"".join(partes)}</svg>'
+
+
+def _texto(valor, formato="{}") -> str:
+    if valor is None or valor != valor:
+        return "—"
+    return formato.format(valor)
+
+
+def _renderizar(entrada: dict) -> str:
+    linhas = []
+    for linha in entrada["anos"]:
+        linhas.append(_modelos["linha_ano"].substitute(
+            ano=linha["ano"],
+            partido=escape(_texto(linha.get("partido"))),
+            gasto=_reais(linha["gasto"]),
+            proposicoes=_texto(linha.get("proposicoes"), "{:.0f}"),
+            presenca=_texto(linha.get("presenca"), "{:.1%}"),
+            quadrante=escape(_texto(linha.get("descricao_quadrante"))),
+        ))
+    ultimo = entrada["anos"][-1] if entrada["anos"] else {}
+    return _modelos["pagina"].substitute(
+        nome=escape(entrada["nome"] or f"Deputado {entrada['id_deputado']}"),
+        partido=escape(_texto(ultimo.get("partido"))),
+        uf=escape(_texto(ultimo.get("uf"))),
+        id_deputado=entrada["id_deputado"],
+        grafico_quadrantes=_grafico_quadrantes(entrada["anos"]),
+        linhas_anos="\n".join(linhas),
+        grafico_categorias=_grafico_categorias(entrada["categorias"]),
+    )
+
+
+def _renderizar_lote(entradas: list) -> int:
+    if _modelos is None:
+        _iniciar_worker()
+    for entrada in entradas:
+        destino = caminho_relatorio(entrada["id_deputado"])
+        with open(destino + ".part", "w", encoding="utf-8") as f:
+            f.write(_renderizar(entrada))
+        os.replace(destino + ".part", destino)
+    return len(entradas)
+
+
+def gerar_relatorios(forcar: bool = False, processos: int = PROCESSOS_RELATORIOS) -> list:
+    """
+    Renderiza os relatórios cujas entradas mudaram desde a última geração
+    (ou todos, com `forcar`) e retorna as chaves renderizadas.
+    """
+    entradas = montar_entradas()
+    versao_modelos = _versao_modelos()
+    impressoes = {str(chave): _impressao(entrada, versao_modelos) for chave, entrada in entradas.items()}
+    anteriores = {} if forcar else _ler_impressoes()
+
+    pendentes = [
+        entrada for chave, entrada in entradas.items()
+        if anteriores.get(str(chave)) != impressoes[str(chave)]
+        or not os.path.exists(caminho_relatorio(entrada["id_deputado"]))
+    ]
+    if not pendentes:
+        print(f"⏭️  {len(entradas)} relatórios sem alteração nas entradas.")
+        return []
+
+    print(f"📝 Renderizando {len(pendentes)} de {len(entradas)} relatórios...")
+    os.makedirs(DIRETORIO_RELATORIOS, exist_ok=True)
+    lotes = [pendentes[i:i + RELATORIOS_POR_TAREFA] for i in range(0, len(pendentes), RELATORIOS_POR_TAREFA)]
+    processos = min(processos or os.cpu_count() or 1, len(lotes))
+    if processos <= 1:
+        _iniciar_worker()
+        list(map(_renderizar_lote, lotes))
+    else:
+        with ProcessPoolExecutor(max_workers=processos, initializer=_iniciar_worker) as pool:
+            list(pool.map(_renderizar_lote, lotes))
+
+    # Mantém as impressões de deputados fora desta geração (ex.: sem gasto no
+    # período atual do cubo) para não refazê-los quando voltarem.
+    _gravar_impressoes({**_ler_impressoes(), **impressoes})
+    print(f"✅ {len(pendentes)} relatórios em {DIRETORIO_RELATORIOS}")
+    return [entrada["chave"] for entrada in pendentes]
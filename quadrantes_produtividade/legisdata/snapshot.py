@@ -0,0 +1,324 @@
+# legisdata/snapshot.py
+#
+# Snapshot dos agregados para o dashboard, gerado no fim do processamento.
+# Cada versão é um diretório snapshot/<versao>/ com arquivos Arrow IPC sem
+# compressão, um lote por arquivo:
+#
+#   cubo.arrow         o cubo de gastos de todos os anos, com ano e as
+#                      dimensões de texto codificadas em dicionário
+#   indicadores.arrow  gasto, produtividade e quadrante por deputado e ano
+#   deputados.arrow    chave, id, nome e o partido e a UF mais recentes
+#
+# e snapshot/ATUAL aponta para a versão em uso (trocado atomicamente). Os
+# processos do dashboard abrem os arquivos com mmap e leem as colunas sem
+# cópia: todos os workers compartilham as mesmas páginas do page cache e um
+# worker novo fica pronto sem ler Parquet nem montar DataFrames. A versão é
+# o hash das versões de entrada, então reprocessar sem mudanças não regrava.
+# Os metadados de cubo.arrow guardam a versão de cada partição do cubo, que
+# as consultas em cache (consultar_snapshot) usam na chave.
+
+import functools
+import json
+import os
+import shutil
+import threading
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from legisdata.analise import DIMENSOES, ESTAGIO_CUBO, MEDIDAS, TIPO_CUBO
+from legisdata.cache import chave_cache, obter_cache, versoes_particoes
+from legisdata.config import DIRETORIO_PROCESSED, DIRETORIO_SNAPSHOT
+from legisdata.dimensao import CHAVE, caminho_dimensao_deputados, caminho_historico_deputados, dimensao_deputados
+from legisdata.indice_autoria import ESTAGIO_INDICE, TIPO_INDICE
+from legisdata.manifesto import novo_hash
+from legisdata.metricas import medir
+from legisdata.presencas import ESTAGIO_MATRIZ, TIPO_MATRIZ
+
+TIPO_SNAPSHOT = "snapshot_dashboard"
+
+ARQUIVO_ATUAL = os.path.join(DIRETORIO_SNAPSHOT, "ATUAL")
+ARQUIVOS_SNAPSHOT = ("cubo", "indicadores", "deputados")
+
+# Versões mantidas além da atual: a anterior continua válida para workers
+# que ainda não perceberam a troca.
+VERSOES_ANTERIORES = 1
+
+# Mês posterior a qualquer histórico: partido e UF do último mês registrado.
+_ULTIMO_MES = 9999_12
+
+
+def _versao_entradas() -> str:
+    versao = novo_hash()
+    for estagio, tipo in ((ESTAGIO_CUBO, TIPO_CUBO), (ESTAGIO_INDICE, TIPO_INDICE), (ESTAGIO_MATRIZ, TIPO_MATRIZ)):
+        versao.update(repr(versoes_particoes(estagio, tipo)).encode())
+    # A dimensão não passa pelo manifesto: entra pelo tamanho e mtime.
+    for caminho in (caminho_dimensao_deputados(), caminho_historico_deputados()):
+        if os.path.exists(caminho):
+            estado = os.stat(caminho)
+            versao.update(f"{estado.st_size}:{estado.st_mtime_ns}".encode())
+    return versao.hexdigest()
+
+
+def versao_atual():
+    if not os.path.exists(ARQUIVO_ATUAL):
+        return None
+    with open(ARQUIVO_ATUAL, encoding="utf-8") as f:
+        return f.read().strip() or None
+
+
+def _gravar(tabela: pa.Table, destino: str):
+    # Um único lote: as colunas lidas saem em um pedaço, sem concatenação.
+    tabela = tabela.combine_chunks()
+    with pa.OSFile(destino, "wb") as arquivo:
+        with pa.ipc.new_file(arquivo, tabela.schema) as escritor:
+            escritor.write_table(tabela, max_chunksize=max(tabela.num_rows, 1))
+
+
+def _dicionario_ordenado(coluna) -> pa.DictionaryArray:
+    # Dicionário em ordem alfabética: ordenar pelos códigos é ordenar pelos
+    # valores, e as categorias saem como as do cubo em pandas.
+    coluna = pc.cast(coluna, pa.string()).combine_chunks()
+    valores = pc.unique(coluna).drop_null()
+    valores = pc.take(valores, pc.sort_indices(valores))
+    return pa.DictionaryArray.from_arrays(pc.index_in(coluna, value_set=valores), valores)
+
+
+def _tabela_cubo() -> pa.Table:
+    import pyarrow.dataset as ds
+
+    dataset = ds.dataset(os.path.join(DIRETORIO_PROCESSED, TIPO_CUBO), format="parquet", partitioning="hive")
+    cubo = dataset.to_table()
+    colunas = {"ano": pc.cast(cubo["ano"], pa.int16())}
+    for nome in DIMENSOES.values():
+        coluna = cubo[nome]
+        if nome in ("categoria", "partido", "uf"):
+            colunas[nome] = _dicionario_ordenado(coluna)
+        elif nome == CHAVE:
+            colunas[nome] = pc.cast(coluna, pa.int32())
+        else:
+            colunas[nome] = pc.cast(coluna, pa.int8())
+    for medida in MEDIDAS:
+        colunas[medida] = cubo[medida]
+    return pa.table(colunas)
+
+
+def _tabela_indicadores() -> pa.Table:
+    from legisdata.classificacao_quadrantes import classificar_agregados
+
+    indicadores = classificar_agregados()
+    return pa.Table.from_pandas(indicadores, preserve_index=False)
+
+
+def _tabela_deputados(dimensao) -> pa.Table:
+    tabela = dimensao.tabela
+    chaves = tabela[CHAVE].combine_chunks()
+    colunas = {CHAVE: chaves, "id_deputado": tabela["id_deputado"], "nome": tabela["nome"]}
+    if dimensao.historico is not None:
+        ultimo = np.full(len(chaves), _ULTIMO_MES, dtype=np.int64)
+        colunas["partido"] = dimensao.partido_em(chaves, ultimo)
+        colunas["uf"] = dimensao.uf_em(chaves, ultimo)
+    return pa.table(colunas)
+
+
+def _descartar_antigas(atual: str):
+    versoes = [
+        (os.path.getmtime(os.path.join(DIRETORIO_SNAPSHOT, nome)), nome)
+        for nome in os.listdir(DIRETORIO_SNAPSHOT)
+        if nome != atual and os.path.isdir(os.path.join(DIRETORIO_SNAPSHOT, nome))
+    ]
+    for _, nome in sorted(versoes, reverse=True)[VERSOES_ANTERIORES:]:
+        shutil.rmtree(os.path.join(DIRETORIO_SNAPSHOT, nome), ignore_errors=True)
+
+
+def gerar_snapshot(forcar: bool = False):
+    """
+    Gera uma nova versão do snapshot se alguma entrada mudou desde a última
+    (ou sempre, com `forcar`) e a torna a atual. Retorna a versão gerada, ou
+    None se nada mudou ou ainda não há cubo.
+    """
+    dimensao = dimensao_deputados()
+    if dimensao is None or not versoes_particoes(ESTAGIO_CUBO, TIPO_CUBO):
+        return None
+    versao = _versao_entradas()[:16]
+    destino = os.path.join(DIRETORIO_SNAPSHOT, versao)
+    if not forcar and versao_atual() == versao and os.path.isdir(destino):
+        return None
+
+    print("📸 Gerando snapshot do dashboard...")
+    with medir("snapshot", TIPO_SNAPSHOT, "geral") as medicao:
+        parcial = destino + ".part"
+        shutil.rmtree(parcial, ignore_errors=True)
+        os.makedirs(parcial)
+        versoes_cubo = dict(versoes_particoes(ESTAGIO_CUBO, TIPO_CUBO))
+        tabelas = {
+            "cubo": _tabela_cubo().replace_schema_metadata({"versoes_cubo": json.dumps(versoes_cubo)}),
+            "indicadores": _tabela_indicadores(),
+            "deputados": _tabela_deputados(dimensao),
+        }
+        for nome, tabela in tabelas.items():
+            _gravar(tabela, os.path.join(parcial, f"{nome}.arrow"))
+        shutil.rmtree(destino, ignore_errors=True)
+        os.replace(parcial, destino)
+
+        with open(ARQUIVO_ATUAL + ".tmp", "w", encoding="utf-8") as f:
+            f.write(versao)
+        os.replace(ARQUIVO_ATUAL + ".tmp", ARQUIVO_ATUAL)
+        _descartar_antigas(versao)
+        medicao.adicionar(linhas=tabelas["cubo"].num_rows,
+                          bytes=sum(os.path.getsize(os.path.join(destino, f"{n}.arrow")) for n in tabelas))
+    print(f"✅ Snapshot {versao} em {DIRETORIO_SNAPSHOT}")
+    return versao
+
+
+def _mapear(caminho: str) -> pa.Table:
+    # read_all sobre o mmap não copia: os buffers apontam para o arquivo.
+    with pa.memory_map(caminho, "r") as origem:
+        return pa.ipc.open_file(origem).read_all()
+
+
+class Snapshot:
+    """
+    Consultas sobre uma versão do snapshot mapeada em memória. Os filtros e
+    agrupamentos rodam em Arrow sobre as colunas mapeadas; só o resultado
+    (pequeno) vira DataFrame.
+    """
+
+    def __init__(self, versao: str):
+        self.versao = versao
+        diretorio = os.path.join(DIRETORIO_SNAPSHOT, versao)
+        self.tabelas = {nome: _mapear(os.path.join(diretorio, f"{nome}.arrow")) for nome in ARQUIVOS_SNAPSHOT}
+        self.cubo = self.tabelas["cubo"]
+        self.indicadores = self.tabelas["indicadores"]
+        self.deputados = self.tabelas["deputados"]
+        metadados = self.cubo.schema.metadata or {}
+        self.versoes_cubo = json.loads(metadados[b"versoes_cubo"]) if b"versoes_cubo" in metadados else None
+
+    def versao_cubo(self, anos=None) -> tuple:
+        """
+        ((ano, hash), ...) das partições do cubo de que esta versão foi
+        gerada, opcionalmente só dos `anos` informados. Snapshots sem esse
+        registro respondem com a própria versão.
+        """
+        if self.versoes_cubo is None:
+            return (("snapshot", self.versao),)
+        anos = {str(a) for a in anos} if anos is not None else None
+        return tuple(sorted((ano, versao) for ano, versao in self.versoes_cubo.items()
+                            if anos is None or ano in anos))
+
+    @staticmethod
+    def _filtrar(tabela: pa.Table, filtros) -> pa.Table:
+        if not filtros:
+            return tabela
+        mascara = None
+        for coluna, valor in filtros.items():
+            valores = list(valor) if isinstance(valor, (list, tuple, set, frozenset, range)) else [valor]
+            tipo = tabela.schema.field(coluna).type
+            tipo = tipo.value_type if pa.types.is_dictionary(tipo) else tipo
+            condicao = pc.is_in(tabela[coluna], value_set=pa.array(valores).cast(tipo))
+            mascara = condicao if mascara is None else pc.and_(mascara, condicao)
+        return tabela.filter(mascara)
+
+    def consultar(self, por=("ano",), filtros: dict = None, medidas=tuple(MEDIDAS)):
+        """
+        Mesma interface e resultado de legisdata.analise.consultar_gastos,
+        calculados sobre o cubo mapeado.
+        """
+        import pandas as pd
+
+        por, medidas = list(por), list(medidas)
+        recorte = self._filtrar(self.cubo, filtros)
+        agregacoes = [(m, MEDIDAS[m][1]) for m in medidas]
+
+        if por:
+            # Agrupa pelos códigos das dimensões em dicionário e devolve o
+            # dicionário no fim (group_by não aceita chaves dicionário em todas
+            # as versões do Arrow).
+            # Como no groupby do pandas, linhas com chave nula ficam de fora.
+            validas = [pc.is_valid(recorte[nome]) for nome in por]
+            if any(v.null_count or not pc.all(v).as_py() for v in validas if len(v)):
+                recorte = recorte.filter(functools.reduce(pc.and_, validas))
+            dicionarios = {}
+            colunas = {}
+            for nome in por:
+                coluna = recorte[nome].combine_chunks()
+                if pa.types.is_dictionary(coluna.type):
+                    dicionarios[nome] = coluna.dictionary
+                    coluna = coluna.indices
+                colunas[nome] = coluna
+            for medida in medidas:
+                colunas[medida] = recorte[medida]
+            agregado = pa.table(colunas).group_by(por).aggregate(agregacoes)
+            agregado = agregado.rename_columns([n.rsplit("_", 1)[0] if n not in por else n
+                                                for n in agregado.schema.names])
+            agregado = agregado.sort_by([(nome, "ascending") for nome in por])
+            resultado = {}
+            for nome in por:
+                coluna = agregado[nome].combine_chunks()
+                if nome in dicionarios:
+                    resultado[nome] = pd.Categorical.from_codes(
+                        coluna.to_numpy(zero_copy_only=False), dicionarios[nome].to_pylist())
+                else:
+                    resultado[nome] = coluna.to_numpy(zero_copy_only=False)
+            for medida in medidas:
+                resultado[medida] = agregado[medida].to_numpy()
+            resultado = pd.DataFrame(resultado)
+        else:
+            resultado = pd.DataFrame([{
+                medida: getattr(pc, funcao)(recorte[medida]).as_py() for medida, funcao in agregacoes
+            }])
+
+        if "total" in medidas and "quantidade" in medidas:
+            resultado["media"] = resultado["total"] / resultado["quantidade"]
+        return resultado
+
+    def deputado(self, id_deputado: int):
+        """
+        Dados do deputado e seus indicadores por ano, ou None se o id não
+        está no snapshot.
+        """
+        ids = self.deputados["id_deputado"]
+        posicao = pc.index(ids, pa.scalar(id_deputado, ids.type)).as_py()
+        if posicao < 0:
+            return None
+        linha = self.deputados.slice(posicao, 1).to_pylist()[0]
+        chave = linha[CHAVE]
+        anos = self._filtrar(self.indicadores, {CHAVE: chave}).sort_by("ano")
+        linha["anos"] = anos.drop_columns([CHAVE]).to_pylist()
+        return linha
+
+
+def consultar_snapshot(snapshot: Snapshot, por=("ano",), filtros: dict = None, medidas=tuple(MEDIDAS)):
+    """
+    Snapshot.consultar com cache (legisdata.cache). Como em
+    legisdata.analise.consultar_gastos, a chave inclui a versão só das
+    partições do cubo dos anos filtrados: um snapshot novo que reconstruiu
+    um ano não invalida as consultas dos outros. O DataFrame devolvido é
+    compartilhado: não altere.
+    """
+    anos = (filtros or {}).get("ano")
+    if anos is not None and not isinstance(anos, (list, tuple, set, frozenset, range)):
+        anos = [anos]
+    chave = chave_cache("snapshot.consultar", {"por": por, "filtros": filtros, "medidas": medidas},
+                        snapshot.versao_cubo(anos))
+    return obter_cache().obter(chave, lambda: snapshot.consultar(por, filtros, medidas))
+
+
+# Snapshot aberto no processo, reaberto quando ATUAL aponta para outra versão.
+_snapshot = None
+_snapshot_lock = threading.Lock()
+
+
+def abrir_snapshot():
+    """
+    O snapshot atual mapeado em memória, ou None se ainda não foi gerado.
+    """
+    global _snapshot
+    versao = versao_atual()
+    with _snapshot_lock:
+        if versao is None:
+            return None
+        if _snapshot is None or _snapshot.versao != versao:
+            _snapshot = Snapshot(versao)
+        return _snapshot
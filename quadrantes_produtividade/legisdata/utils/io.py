@@ -1,5 +1,13 @@
+import io
 import os
+import shutil
 import zipfile
+from contextlib import contextmanager
+
+from legisdata.config import DIRETORIO_RAW
+
+TAMANHO_BLOCO_COPIA = 1024 * 1024
+
 
 def salvar_csv(df, caminho):
     """
@@ -10,19 +18,229 @@ def salvar_csv(df, caminho):
     df.to_csv(caminho, index=False, encoding="utf-8-sig")
 
 
-def extrair_csv_de_zip(zip_path: str, destino: str) -> str:
+def _membro_csv(zip_ref: zipfile.ZipFile) -> str:
+    nome = next((n for n in zip_ref.namelist() if n.lower().endswith(".csv")), None)
+    if not nome:
+        raise FileNotFoundError("Nenhum arquivo .csv encontrado no zip.")
+    return nome
+
+
+@contextmanager
+def abrir_csv_de_zip(zip_path: str):
     """
-    Extrai o primeiro arquivo .csv de um arquivo .zip e salva no diretório destino.
-    Retorna o caminho final do arquivo extraído.
+    Abre o primeiro arquivo .csv de um .zip como fluxo binário, descomprimido
+    sob demanda, sem gravar nada em disco.
     """
-    with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-        zip_ref.extractall(destino)
+    with zipfile.ZipFile(zip_path, "r") as zip_ref:
+        with zip_ref.open(_membro_csv(zip_ref)) as membro:
+            yield membro
 
-    arquivos_extraidos = os.listdir(destino)
-    arquivo_csv = next((f for f in arquivos_extraidos if f.endswith(".csv")), None)
 
-    if not arquivo_csv:
-        raise FileNotFoundError("Nenhum arquivo .csv encontrado no zip.")
+def extrair_csv_de_zip(zip_path: str, destino: str, nome_arquivo: str = None, hash_obj=None) -> str:
+    """
+    Copia em streaming o primeiro arquivo .csv de um .zip para o diretório destino.
+    O conteúdo é descomprimido bloco a bloco direto no arquivo final (via .part
+    e rename atômico), sem extractall nem cópia intermediária. Se `hash_obj`
+    for informado, é atualizado com os bytes gravados.
+    Retorna o caminho final do arquivo extraído.
+    """
+    with zipfile.ZipFile(zip_path, "r") as zip_ref:
+        membro = _membro_csv(zip_ref)
+        caminho_csv = os.path.join(destino, nome_arquivo or os.path.basename(membro))
+        parcial = caminho_csv + ".part"
 
-    caminho_csv = os.path.join(destino, arquivo_csv)
+        os.makedirs(destino, exist_ok=True)
+        with zip_ref.open(membro) as origem, open(parcial, "wb") as saida:
+            if hash_obj is None:
+                shutil.copyfileobj(origem, saida, TAMANHO_BLOCO_COPIA)
+            else:
+                for bloco in iter(lambda: origem.read(TAMANHO_BLOCO_COPIA), b""):
+                    saida.write(bloco)
+                    hash_obj.update(bloco)
+
+    os.replace(parcial, caminho_csv)
     return caminho_csv
+
+
+class FluxoEspelhado(io.RawIOBase):
+    """
+    Fluxo binário que repassa tudo o que é lido de `origem` para `copia`.
+    Permite que um único passe de leitura (ex.: a conversão para Parquet)
+    também grave o CSV bruto em disco e, opcionalmente, calcule seu hash.
+    """
+
+    def __init__(self, origem, copia, hash_obj=None):
+        self.origem = origem
+        self.copia = copia
+        self.hash_obj = hash_obj
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        dados = self.origem.read(len(buffer))
+        tamanho = len(dados)
+        buffer[:tamanho] = dados
+        if tamanho:
+            self.copia.write(dados)
+            if self.hash_obj is not None:
+                self.hash_obj.update(dados)
+        return tamanho
+
+
+def caminho_raw(tipo: str, ano) -> str:
+    """
+    Localiza o arquivo bruto de (tipo, ano): o CSV extraído ou, na falta dele,
+    o .csv.zip mantido compactado.
+    """
+    nome = tipo if ano == "geral" else ano
+    base = os.path.join(DIRETORIO_RAW, tipo, f"{nome}.csv")
+    for caminho in (base, base + ".zip"):
+        if os.path.exists(caminho):
+            return caminho
+    raise FileNotFoundError(f"Arquivo bruto de {tipo} {ano} não encontrado em {os.path.dirname(base)}")
+
+
+@contextmanager
+def abrir_raw(tipo: str, ano):
+    """
+    Abre o arquivo bruto de (tipo, ano) como fluxo binário, lendo direto do
+    .zip quando apenas a versão compactada foi mantida.
+    """
+    caminho = caminho_raw(tipo, ano)
+    if caminho.endswith(".zip"):
+        with abrir_csv_de_zip(caminho) as fluxo:
+            yield fluxo
+    else:
+        with open(caminho, "rb") as fluxo:
+            yield fluxo
+
+
+def _tipos_pandas():
+    import pandas as pd
+    import pyarrow as pa
+
+    return {
+        pa.int8(): pd.Int8Dtype(),
+        pa.int16(): pd.Int16Dtype(),
+        pa.int32(): pd.Int32Dtype(),
+        pa.int64(): pd.Int64Dtype(),
+    }
+
+
+def ler_em_blocos(tipo: str, ano, colunas=None, tamanho_bloco: int = 250_000, motor: str = "pyarrow"):
+    """
+    Lê o arquivo bruto de (tipo, ano) em blocos de DataFrames já tipados
+    conforme legisdata.esquemas, sem carregar o arquivo inteiro em memória.
+
+    `motor="pyarrow"` usa o leitor Arrow em streaming (multithread) e
+    reagrupa os lotes dele em blocos de `tamanho_bloco` linhas;
+    `motor="c"` usa o parser C do pandas com `chunksize=tamanho_bloco`.
+    Em ambos, cada bloco tem `tamanho_bloco` linhas (o último, o resto),
+    inteiros com nulos viram tipos anuláveis (Int64 etc.) e as colunas
+    categóricas do esquema viram `category`.
+    """
+    import pandas as pd
+    import pyarrow as pa
+    from legisdata.esquemas import ESQUEMAS
+
+    esquema = ESQUEMAS[tipo]
+    colunas = list(colunas) if colunas is not None else list(esquema["colunas"])
+
+    if motor == "pyarrow":
+        from legisdata.processamento import abrir_leitor_csv
+
+        tipos = _tipos_pandas()
+        # O block_size do leitor Arrow é em bytes: os lotes têm tamanhos
+        # variados e são fatiados aqui em blocos de tamanho_bloco linhas.
+        pendentes, linhas = [], 0
+        with abrir_raw(tipo, ano) as fluxo:
+            for lote in abrir_leitor_csv(tipo, fluxo):
+                pendentes.append(lote.select(colunas))
+                linhas += lote.num_rows
+                while linhas >= tamanho_bloco:
+                    tabela = pa.Table.from_batches(pendentes)
+                    yield tabela.slice(0, tamanho_bloco).to_pandas(types_mapper=tipos.get)
+                    resto = tabela.slice(tamanho_bloco)
+                    pendentes, linhas = resto.to_batches(), resto.num_rows
+        if linhas:
+            yield pa.Table.from_batches(pendentes).to_pandas(types_mapper=tipos.get)
+        return
+
+    if motor != "c":
+        raise ValueError(f"Motor de leitura inválido: {motor!r}")
+
+    dtypes, datas = {}, []
+    tipos = _tipos_pandas()
+    for nome in colunas:
+        tipo_arrow = esquema["colunas"][nome]
+        if pa.types.is_dictionary(tipo_arrow):
+            dtypes[nome] = "category"
+        elif pa.types.is_temporal(tipo_arrow):
+            datas.append(nome)
+        elif tipo_arrow in tipos:
+            dtypes[nome] = tipos[tipo_arrow]
+        elif pa.types.is_floating(tipo_arrow):
+            dtypes[nome] = "float64"
+        else:
+            dtypes[nome] = "string"
+
+    with abrir_raw(tipo, ano) as fluxo:
+        leitor = pd.read_csv(
+            fluxo,
+            sep=esquema["separador"],
+            encoding="utf-8-sig" if esquema["codificacao"] == "utf8" else esquema["codificacao"],
+            engine="c",
+            usecols=lambda c: c in dtypes or c in datas,
+            dtype=dtypes,
+            parse_dates=datas,
+            chunksize=tamanho_bloco,
+        )
+        with leitor:
+            for bloco in leitor:
+                yield bloco
+
+
+_COMBINACOES = {"sum": "sum", "count": "sum", "max": "max", "min": "min"}
+
+
+def agregar_em_blocos(blocos, chaves, valores, funcoes=("sum", "count")):
+    """
+    Agrega uma sequência de blocos por `chaves`, combinando os parciais a cada
+    bloco; a memória fica limitada ao número de grupos, não ao de linhas.
+    Aceita as funções sum, count, max e min.
+    """
+    import pandas as pd
+
+    chaves, valores, funcoes = list(chaves), list(valores), list(funcoes)
+    invalidas = set(funcoes) - set(_COMBINACOES)
+    if invalidas:
+        raise ValueError(f"Funções de agregação não suportadas: {sorted(invalidas)}")
+
+    combinar = {(v, f): _COMBINACOES[f] for v in valores for f in funcoes}
+    acumulado = None
+    for bloco in blocos:
+        parcial = bloco.groupby(chaves, observed=True, dropna=False)[valores].agg(funcoes)
+        if acumulado is None:
+            acumulado = parcial
+        else:
+            acumulado = pd.concat([acumulado, parcial]).groupby(level=chaves, dropna=False).agg(combinar)
+
+    if acumulado is None:
+        return pd.DataFrame()
+    return acumulado.sort_index()
+
+
+def somar_gastos(anos, por=("ideCadastro", "numAno", "numMes", "txtDescricao"), valor="vlrLiquido",
+                 tamanho_bloco: int = 250_000):
+    """
+    Soma, conta e pega o máximo de `valor` da CEAP por `por` ao longo de vários
+    anos, lendo um bloco por vez (memória constante em relação ao volume).
+    """
+    from itertools import chain
+
+    colunas = list(dict.fromkeys([*por, valor]))
+    blocos = chain.from_iterable(
+        ler_em_blocos("gastos", ano, colunas=colunas, tamanho_bloco=tamanho_bloco) for ano in anos
+    )
+    return agregar_em_blocos(blocos, por, [valor], funcoes=("sum", "count", "max"))
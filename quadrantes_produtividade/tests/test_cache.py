@@ -0,0 +1,65 @@
+import os
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from legisdata import cache
+from legisdata.analise import ESTAGIO_CUBO, TIPO_CUBO, consultar_gastos
+from legisdata.cache import CacheConsultas
+from legisdata.dimensao import CHAVE
+from legisdata.manifesto import obter_manifesto
+from legisdata.processamento import caminho_processado
+
+
+def _gravar_cubo(ano, valor, versao):
+    tabela = pa.table({
+        CHAVE: pa.array([1, 2, 3], pa.int32()),
+        "mes": pa.array([1, 1, 2], pa.int8()),
+        "categoria": ["A", "B", "A"],
+        "partido": ["X", "Y", "X"],
+        "uf": ["SP", "RJ", "SP"],
+        "total": [valor, 2 * valor, 3 * valor],
+        "quantidade": pa.array([1, 2, 3], pa.int64()),
+        "maximo": [valor, valor, valor],
+    })
+    destino = caminho_processado(TIPO_CUBO, ano)
+    os.makedirs(os.path.dirname(destino), exist_ok=True)
+    pq.write_table(tabela, destino)
+    obter_manifesto().registrar_derivado(ESTAGIO_CUBO, TIPO_CUBO, ano, versao)
+
+
+@pytest.fixture
+def cache_vazio(tmp_path, monkeypatch):
+    instancia = CacheConsultas(diretorio=str(tmp_path / "cache"))
+    monkeypatch.setattr(cache, "_instancia", instancia)
+    return instancia
+
+
+def test_reconstruir_um_ano_invalida_so_as_consultas_dele(cache_vazio):
+    _gravar_cubo(2040, 10.0, "v1")
+    _gravar_cubo(2041, 100.0, "v1")
+
+    def consultas():
+        return (consultar_gastos(por=["uf"], filtros={"ano": 2040}),
+                consultar_gastos(por=["uf"], filtros={"ano": [2041]}),
+                consultar_gastos(por=["ano"]))
+
+    consultas()
+    assert (cache_vazio.acertos, cache_vazio.falhas) == (0, 3)
+    consultas()
+    assert (cache_vazio.acertos, cache_vazio.falhas) == (3, 3)
+
+    # Só o ano de 2041 é reconstruído (nova versão no manifesto).
+    _gravar_cubo(2041, 1000.0, "v2")
+    de_2040, de_2041, por_ano = consultas()
+    assert (cache_vazio.acertos, cache_vazio.falhas) == (4, 5)
+    assert de_2040["total"].sum() == 60.0
+    assert de_2041["total"].sum() == 6000.0
+    assert por_ano.set_index("ano")["total"].to_dict() == {2040: 60.0, 2041: 6000.0}
+
+    # O nível em disco respeita as mesmas chaves: um processo novo (cache em
+    # memória vazio) acerta as três consultas da versão atual.
+    cache_vazio.limpar()
+    consultas()
+    assert (cache_vazio.acertos, cache_vazio.falhas) == (7, 5)
@@ -0,0 +1,31 @@
+from legisdata.coleta.checkpoint import CheckpointDespesas
+
+
+def _abrir(tmp_path):
+    # Duas instâncias no mesmo banco fazem o papel de dois processos.
+    return CheckpointDespesas(str(tmp_path / "checkpoint.sqlite"), caminho_csv_legado=None)
+
+
+def test_chaves_registradas_por_outro_processo(tmp_path):
+    primeiro, segundo = _abrir(tmp_path), _abrir(tmp_path)
+    assert primeiro.registrar_lote([(10, 2030, 1), (10, 2030, 2)]) == 2
+
+    assert segundo.contem(10, 2030, 1)
+    assert not segundo.contem(10, 2030, 3)
+    assert segundo.novas([(10, 2030, m) for m in (1, 2, 3)]) == [(10, 2030, 3)]
+
+
+def test_registrar_lote_grava_so_as_novas(tmp_path):
+    primeiro, segundo = _abrir(tmp_path), _abrir(tmp_path)
+    # As duas instâncias já buscaram as chaves; a primeira registra antes.
+    chaves = [(20, 2030, 1), (20, 2030, 2), (21, 2030, 1)]
+    assert segundo.novas(chaves) == sorted(chaves)
+    primeiro.registrar_lote(chaves[:2])
+
+    gravadas = []
+    assert segundo.registrar_lote(chaves, gravar=gravadas.extend) == 1
+    assert gravadas == [(21, 2030, 1)]
+
+    # Nada novo: `gravar` nem é chamado.
+    assert segundo.registrar_lote(chaves, gravar=gravadas.extend) == 0
+    assert gravadas == [(21, 2030, 1)]
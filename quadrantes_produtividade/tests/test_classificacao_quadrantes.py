@@ -0,0 +1,113 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scipy.stats import rankdata
+
+from legisdata.classificacao_quadrantes import (
+    avaliar_cenarios,
+    classificar,
+    cortes_por_grupo,
+    montar_matriz,
+    normalizar_por_grupo,
+)
+
+
+@pytest.fixture
+def amostra():
+    gerador = np.random.default_rng(7)
+    n = 300
+    grupos = gerador.integers(0, 4, n)
+    # Valores inteiros pequenos: muitos empates dentro dos grupos.
+    valores = gerador.integers(0, 20, (n, 2)).astype(np.float64)
+    return valores, grupos
+
+
+def _matriz(producao, gasto, grupos):
+    indicadores = pd.DataFrame({
+        "chave_deputado": np.arange(len(gasto)),
+        "ano": 2020 + np.asarray(grupos),
+        "gasto": gasto,
+        **{f"p{i}": producao[:, i] for i in range(producao.shape[1])},
+    })
+    return montar_matriz(indicadores, [f"p{i}" for i in range(producao.shape[1])])
+
+
+@pytest.mark.parametrize("percentil", [0, 10, 25, 50, 62.5, 90, 100])
+def test_cortes_iguais_a_np_percentile(amostra, percentil):
+    valores, grupos = amostra
+    cortes = cortes_por_grupo(valores[:, 0], grupos, percentil)[0]
+    esperado = [np.percentile(valores[grupos == g, 0], percentil) for g in range(4)]
+    np.testing.assert_allclose(cortes, esperado)
+
+
+def test_cortes_por_cenario(amostra):
+    valores, grupos = amostra
+    cenarios = np.stack([valores[:, 0], valores[:, 1]])
+    cortes = cortes_por_grupo(cenarios, grupos, [30, 70])
+    for s, percentil in enumerate([30, 70]):
+        esperado = [np.percentile(cenarios[s, grupos == g], percentil) for g in range(4)]
+        np.testing.assert_allclose(cortes[s], esperado)
+
+
+def test_normalizacao_percentil_usa_posto_medio(amostra):
+    valores, grupos = amostra
+    normalizado = normalizar_por_grupo(valores, grupos, "percentil")
+    for g in range(4):
+        no_grupo = grupos == g
+        for coluna in range(valores.shape[1]):
+            postos = rankdata(valores[no_grupo, coluna], method="average") - 1
+            np.testing.assert_allclose(normalizado[no_grupo, coluna], postos / (no_grupo.sum() - 1))
+
+
+def test_normalizacao_zscore(amostra):
+    valores, grupos = amostra
+    normalizado = normalizar_por_grupo(valores, grupos, "zscore")
+    for g in range(4):
+        no_grupo = valores[grupos == g]
+        esperado = (no_grupo - no_grupo.mean(axis=0)) / no_grupo.std(axis=0)
+        np.testing.assert_allclose(normalizado[grupos == g], esperado)
+
+
+def test_zscore_de_grupo_constante_e_zero():
+    normalizado = normalizar_por_grupo(np.array([5.0, 5.0, 1.0, 3.0]), np.array([0, 0, 1, 1]), "zscore")
+    np.testing.assert_allclose(normalizado, [0, 0, -1, 1])
+
+
+def test_normalizacao_invalida():
+    with pytest.raises(ValueError):
+        normalizar_por_grupo(np.zeros(3), np.zeros(3, dtype=np.int64), "mediana")
+
+
+def test_quadrante_no_corte():
+    # Mediana de produção = 2 e de gasto = 20: quem está exatamente no corte
+    # conta como alta produtividade e como baixo gasto.
+    producao = np.array([[1.0], [2.0], [3.0]])
+    gasto = np.array([10.0, 20.0, 30.0])
+    resultado = classificar(_matriz(producao, gasto, [0, 0, 0]), normalizacao="minmax")
+    assert resultado["corte_producao"].tolist() == [0.5, 0.5, 0.5]
+    assert resultado["corte_gasto"].tolist() == [20.0, 20.0, 20.0]
+    assert resultado["quadrante"].tolist() == [3, 1, 2]
+
+
+def test_avaliar_cenarios_igual_a_classificar_por_cenario(amostra):
+    valores, grupos = amostra
+    gasto = np.random.default_rng(3).gamma(2.0, 1000.0, len(grupos)).round()
+    matriz = _matriz(valores, gasto, grupos)
+    pesos = np.array([[1, 0], [0, 1], [1, 1], [3, 1]], dtype=np.float64)
+    p_prod = np.array([50, 25, 75, 60])
+    p_gasto = np.array([50, 80, 20, 40])
+
+    for normalizacao in ("percentil", "zscore", "minmax"):
+        quadrantes = avaliar_cenarios(matriz, pesos, p_prod, p_gasto, normalizacao)
+        for s in range(len(pesos)):
+            esperado = classificar(matriz, pesos[s], p_prod[s], p_gasto[s], normalizacao)
+            # Referência independente: cortes com np.percentile por grupo.
+            score = esperado["score_producao"].to_numpy()
+            alta = np.empty(len(score), dtype=bool)
+            alto = np.empty(len(score), dtype=bool)
+            for g in range(matriz.n_grupos):
+                no_grupo = matriz.grupos == g
+                alta[no_grupo] = score[no_grupo] >= np.percentile(score[no_grupo], p_prod[s])
+                alto[no_grupo] = gasto[no_grupo] > np.percentile(gasto[no_grupo], p_gasto[s])
+            np.testing.assert_array_equal(quadrantes[s], 1 + 2 * ~alta + alto)
+            np.testing.assert_array_equal(quadrantes[s], esperado["quadrante"].to_numpy())
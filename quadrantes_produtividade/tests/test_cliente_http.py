@@ -0,0 +1,51 @@
+import os
+import socket
+
+import pytest
+import requests
+
+from benchmarks.servidor import ServidorCamaraLocal
+from legisdata.coleta.cliente_http import ClienteHTTP
+
+
+class MetadadosMemoria:
+    """Validadores e downloads parciais em memória, no lugar do checkpoint."""
+
+    def __init__(self):
+        self.http, self.parciais = {}, {}
+
+    def obter_metadados_http(self, url):
+        return self.http.get(url, (None, None))
+
+    def salvar_metadados_http(self, url, etag, last_modified):
+        self.http[url] = (etag, last_modified)
+
+    def obter_download_parcial(self, url):
+        return self.parciais.get(url, (None, None, None))
+
+    def salvar_download_parcial(self, url, etag, last_modified, total):
+        self.parciais[url] = (etag, last_modified, total)
+
+    def remover_download_parcial(self, url):
+        self.parciais.pop(url, None)
+
+
+def test_retoma_quedas_no_meio_do_corpo(tmp_path):
+    conteudo = os.urandom(2_000_000)
+    with ServidorCamaraLocal({"/arquivo": conteudo}, prob_queda=0.6, semente=3) as servidor:
+        cliente = ClienteHTTP(fator_backoff=0, metadados=MetadadosMemoria())
+        resultado = cliente.baixar(servidor.url + "/arquivo", str(tmp_path / "arquivo"))
+    assert resultado.retomadas == servidor.estatisticas["quedas"] > 0
+    assert (tmp_path / "arquivo").read_bytes() == conteudo
+
+
+def test_falha_de_conexao_nao_repete_fora_do_adaptador(tmp_path, capsys):
+    # Porta sem ninguém escutando: o Retry do adaptador esgota e o erro sobe
+    # sem as retomadas do laço externo.
+    with socket.socket() as livre:
+        livre.bind(("127.0.0.1", 0))
+        porta = livre.getsockname()[1]
+    cliente = ClienteHTTP(fator_backoff=0, metadados=MetadadosMemoria())
+    with pytest.raises(requests.ConnectionError):
+        cliente.baixar(f"http://127.0.0.1:{porta}/arquivo", str(tmp_path / "arquivo"))
+    assert "Retomando" not in capsys.readouterr().out
@@ -0,0 +1,31 @@
+import os
+
+import pytest
+
+from benchmarks.dados_sinteticos import zip_ceap
+from benchmarks.servidor import ServidorCamaraLocal
+from legisdata.coleta import coletor_gastos
+from legisdata.coleta.coletor_gastos import ColetorGastosCEAP
+from legisdata.config import DIRETORIO_RAW
+
+
+@pytest.fixture
+def servidor(monkeypatch):
+    with ServidorCamaraLocal({"/cotas/Ano-2033.csv.zip": zip_ceap(2033, 500)}) as servidor:
+        monkeypatch.setattr(coletor_gastos, "URL_CEAP_ZIP", servidor.url + "/cotas/Ano-{ano}.csv.zip")
+        yield servidor
+
+
+def test_revalidacao_sem_zip_recebe_304(servidor):
+    coletor = ColetorGastosCEAP(armazenamento="csv", converter=False)
+    coletor.baixar(2033)
+    destino = os.path.join(DIRETORIO_RAW, "gastos")
+    assert os.path.exists(os.path.join(destino, "2033.csv"))
+    assert not os.path.exists(os.path.join(destino, "2033.csv.zip"))
+    enviados = servidor.estatisticas["bytes_enviados"]
+
+    # O zip foi apagado, mas os validadores valem para o CSV extraído.
+    coletor.baixar(2033, atualizar=True)
+    assert servidor.estatisticas["nao_modificado"] == 1
+    assert servidor.estatisticas["bytes_enviados"] == enviados
+    assert os.path.exists(os.path.join(destino, "2033.csv"))
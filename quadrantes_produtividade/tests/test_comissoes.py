@@ -0,0 +1,108 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from legisdata.comissoes import IndiceComissoes, construir_indice_comissoes
+from legisdata.dimensao import CHAVE
+from legisdata.esquemas import esquema_arrow
+from legisdata.manifesto import obter_manifesto
+from legisdata.processamento import ESTAGIO_PARQUET, caminho_processado
+
+
+@pytest.fixture(scope="module")
+def comissoes():
+    """
+    Períodos sintéticos de 2015 a 2022: curtos, que atravessam vários anos
+    e em aberto (sem dataFim). Os últimos dados são de 2022, então
+    consultas de 2023 em diante caem no balde sentinela.
+    """
+    gerador = np.random.default_rng(23)
+    n = 600
+    inicio = np.datetime64("2015-01-01") + gerador.integers(0, 8 * 365, n).astype("timedelta64[D]")
+    duracao = np.where(gerador.random(n) < 0.3, gerador.integers(400, 1_500, n), gerador.integers(0, 200, n))
+    fim = np.minimum(inicio + duracao.astype("timedelta64[D]"), np.datetime64("2022-12-31"))
+    aberto = gerador.random(n) < 0.15
+    periodos = pd.DataFrame({
+        CHAVE: gerador.integers(0, 40, n).astype(np.int32),
+        "idOrgao": gerador.integers(100, 110, n).astype(np.int64),
+        "titulo": np.asarray(["Titular", "Suplente", "Presidente"], dtype=object)[gerador.integers(0, 3, n)],
+        "dataInicio": inicio.astype("datetime64[s]"),
+        "dataFim": pd.Series(fim.astype("datetime64[s]")).mask(aberto),
+    })
+    periodos["siglaOrgao"] = "C" + periodos["idOrgao"].astype(str)
+
+    destino = caminho_processado("comissoes", "geral")
+    os.makedirs(os.path.dirname(destino), exist_ok=True)
+    tabela = pa.Table.from_pandas(periodos, preserve_index=False)
+    # Os tipos do Parquet processado (siglas e títulos em dicionário).
+    tabela = tabela.cast(pa.schema([pa.field(n, esquema_arrow("comissoes").field(n).type if n != CHAVE
+                                              else pa.int32()) for n in tabela.schema.names]))
+    pq.write_table(tabela, destino)
+    obter_manifesto().registrar_derivado(ESTAGIO_PARQUET, "comissoes", "geral", "comissoes-teste")
+    construir_indice_comissoes(forcar=True)
+    return IndiceComissoes(), periodos
+
+
+def _instantes(semente: int, n: int = 500) -> np.ndarray:
+    # De antes do primeiro período até bem depois do último ano dos dados.
+    gerador = np.random.default_rng(semente)
+    return np.datetime64("2014-06-01") + gerador.integers(0, 12 * 365, n).astype("timedelta64[D]")
+
+
+def _forca_bruta(periodos, coluna, grupos, instantes, saida) -> set:
+    inicio = periodos["dataInicio"]
+    fim = periodos["dataFim"].fillna(pd.Timestamp.max)
+    esperado = set()
+    for linha, (grupo, instante) in enumerate(zip(grupos, pd.to_datetime(instantes))):
+        ativos = periodos[(periodos[coluna] == grupo) & (inicio <= instante) & (instante <= fim)]
+        esperado |= {(linha, *valores) for valores in ativos[saida].itertuples(index=False)}
+    return esperado
+
+
+def _obtido(resultado, saida) -> set:
+    return {(int(linha), *(v if isinstance(v, str) else int(v) for v in valores))
+            for linha, *valores in resultado[["linha", *saida]].itertuples(index=False)}
+
+
+def test_ativos_igual_a_forca_bruta(comissoes):
+    indice, periodos = comissoes
+    instantes = _instantes(1)
+    chaves = np.random.default_rng(2).integers(0, 42, len(instantes))
+    saida = ["idOrgao", "titulo"]
+    assert _obtido(indice.ativos(chaves, instantes), saida) == \
+        _forca_bruta(periodos, CHAVE, chaves, instantes, saida)
+
+
+def test_membros_igual_a_forca_bruta(comissoes):
+    indice, periodos = comissoes
+    instantes = _instantes(3)
+    orgaos = np.random.default_rng(4).integers(99, 111, len(instantes))
+    saida = [CHAVE, "titulo"]
+    assert _obtido(indice.membros(orgaos, instantes), saida) == \
+        _forca_bruta(periodos, "idOrgao", orgaos, instantes, saida)
+
+
+def test_periodos_em_aberto_no_balde_sentinela(comissoes):
+    indice, periodos = comissoes
+    assert indice.teto == 2023
+    # Bem depois do último ano dos dados, só os períodos em aberto seguem ativos.
+    depois = np.full(40, np.datetime64("2040-03-01"))
+    resultado = indice.ativos(np.arange(40), depois)
+    assert len(resultado) == periodos["dataFim"].isna().sum()
+    assert _obtido(resultado, ["idOrgao"]) == \
+        _forca_bruta(periodos, CHAVE, np.arange(40), depois, ["idOrgao"])
+
+
+def test_periodo_de_varios_anos(comissoes):
+    indice, periodos = comissoes
+    longos = periodos[(periodos["dataFim"] - periodos["dataInicio"]).dt.days > 730]
+    assert len(longos)
+    for periodo in longos.itertuples():
+        meio = periodo.dataInicio + (periodo.dataFim - periodo.dataInicio) / 2
+        for instante in (periodo.dataInicio, meio, periodo.dataFim):
+            resultado = indice.ativos([periodo.chave_deputado], [instante.to_datetime64()])
+            assert ((resultado["idOrgao"] == periodo.idOrgao) & (resultado["titulo"] == periodo.titulo)).any()
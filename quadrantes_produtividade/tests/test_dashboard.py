@@ -0,0 +1,70 @@
+import asyncio
+import json
+import os
+
+import pyarrow as pa
+import pytest
+from aiohttp.test_utils import TestClient, TestServer
+
+from dashboard.app import criar_app
+from legisdata import cache
+from legisdata.cache import CacheConsultas
+from legisdata.dimensao import CHAVE
+from legisdata.snapshot import ARQUIVO_ATUAL, DIRETORIO_SNAPSHOT, Snapshot, _gravar
+
+
+def _gravar_snapshot(versao, totais: dict):
+    """Snapshot mínimo com um cubo de {ano: (versão da partição, total)}."""
+    anos = sorted(totais)
+    cubo = pa.table({
+        "ano": pa.array(anos, pa.int16()),
+        CHAVE: pa.array([1] * len(anos), pa.int32()),
+        "mes": pa.array([1] * len(anos), pa.int8()),
+        "categoria": ["A"] * len(anos),
+        "partido": ["X"] * len(anos),
+        "uf": ["SP"] * len(anos),
+        "total": [totais[a][1] for a in anos],
+        "quantidade": pa.array([1] * len(anos), pa.int64()),
+        "maximo": [totais[a][1] for a in anos],
+    }).replace_schema_metadata({"versoes_cubo": json.dumps({str(a): totais[a][0] for a in anos})})
+    diretorio = os.path.join(DIRETORIO_SNAPSHOT, versao)
+    os.makedirs(diretorio, exist_ok=True)
+    _gravar(cubo, os.path.join(diretorio, "cubo.arrow"))
+    _gravar(pa.table({CHAVE: pa.array([1], pa.int32()), "ano": pa.array([anos[0]], pa.int16())}),
+            os.path.join(diretorio, "indicadores.arrow"))
+    _gravar(pa.table({CHAVE: pa.array([1], pa.int32()), "id_deputado": [9], "nome": ["Fulano"]}),
+            os.path.join(diretorio, "deputados.arrow"))
+    with open(ARQUIVO_ATUAL, "w", encoding="utf-8") as f:
+        f.write(versao)
+
+
+async def _obter(*caminhos):
+    async with TestClient(TestServer(criar_app())) as cliente:
+        respostas = []
+        for caminho in caminhos:
+            resposta = await cliente.get(caminho)
+            assert resposta.status == 200
+            respostas.append(await resposta.json())
+        return respostas
+
+
+@pytest.fixture
+def cache_vazio(tmp_path, monkeypatch):
+    instancia = CacheConsultas(diretorio=str(tmp_path / "cache"))
+    monkeypatch.setattr(cache, "_instancia", instancia)
+    return instancia
+
+
+def test_gastos_usa_o_cache_por_particao(cache_vazio):
+    _gravar_snapshot("teste-v1", {2050: ("a", 10.0), 2051: ("b", 20.0)})
+    assert Snapshot("teste-v1").versao_cubo([2051]) == (("2051", "b"),)
+
+    consultas = ("/gastos?ano=2050&por=uf", "/gastos?ano=2051&por=uf")
+    asyncio.run(_obter(*consultas, *consultas))
+    assert (cache_vazio.acertos, cache_vazio.falhas) == (2, 2)
+
+    # Novo snapshot em que só a partição de 2051 mudou.
+    _gravar_snapshot("teste-v2", {2050: ("a", 10.0), 2051: ("c", 30.0)})
+    de_2050, de_2051 = asyncio.run(_obter(*consultas))
+    assert (cache_vazio.acertos, cache_vazio.falhas) == (3, 3)
+    assert de_2050[0]["total"] == 10.0 and de_2051[0]["total"] == 30.0
@@ -0,0 +1,142 @@
+import csv
+import io
+import os
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+import pytest
+
+from benchmarks.dados_sinteticos import csv_ceap, csv_deputados
+from legisdata.coleta.checkpoint import obter_checkpoint
+from legisdata.config import DIRETORIO_RAW
+from legisdata.delta import hash_coluna, hash_linhas
+from legisdata.processamento import (aplicar_delta, caminho_processado, converter_para_parquet,
+                                     pode_aplicar_delta, processar)
+
+
+def _gravar_bruto(tipo, nome, conteudo, ano):
+    destino = os.path.join(DIRETORIO_RAW, tipo, f"{nome}.csv")
+    os.makedirs(os.path.dirname(destino), exist_ok=True)
+    with open(destino, "wb") as arquivo:
+        arquivo.write(conteudo)
+    obter_checkpoint().registrar(tipo, ano)
+
+
+def _ler_csv(conteudo: bytes):
+    leitor = csv.DictReader(io.StringIO(conteudo.decode("utf-8")), delimiter=";")
+    return leitor.fieldnames, list(leitor)
+
+
+def _escrever_csv(cabecalho, linhas) -> bytes:
+    saida = io.StringIO()
+    escritor = csv.DictWriter(saida, cabecalho, delimiter=";", quoting=csv.QUOTE_ALL, lineterminator="\n")
+    escritor.writeheader()
+    escritor.writerows(linhas)
+    return saida.getvalue().encode("utf-8")
+
+
+def _meses_gravados(ano) -> dict:
+    # {mês: linhas do mês em ordem canônica}, com dicionários como texto.
+    diretorio = caminho_processado("gastos", ano)
+    meses = {}
+    for nome in sorted(os.listdir(diretorio)):
+        if not nome.startswith("mes="):
+            continue
+        tabela = pq.read_table(os.path.join(diretorio, nome, "dados.parquet"))
+        for indice, campo in enumerate(tabela.schema):
+            if pa.types.is_dictionary(campo.type):
+                tabela = tabela.set_column(indice, campo.name, pc.cast(tabela.column(indice), pa.string()))
+        quadro = tabela.to_pandas()
+        meses[int(nome[4:])] = quadro.sort_values(list(quadro.columns)).reset_index(drop=True)
+    return meses
+
+
+@pytest.fixture(scope="module")
+def dimensao():
+    _gravar_bruto("deputados", "deputados", csv_deputados(2000), "geral")
+    processar(tipos=["deputados"])
+
+
+def _converter_ano(ano, linhas=3_000):
+    """Converte um ano sintético da CEAP e devolve (cabeçalho, linhas do CSV)."""
+    conteudo = csv_ceap(ano, linhas, semente=22)
+    _gravar_bruto("gastos", ano, conteudo, ano)
+    converter_para_parquet("gastos", ano)
+    assert pode_aplicar_delta("gastos", ano)
+    return _ler_csv(conteudo)
+
+
+def _conferir_com_reconversao(ano):
+    incremental = _meses_gravados(ano)
+    converter_para_parquet("gastos", ano)
+    completo = _meses_gravados(ano)
+    assert incremental.keys() == completo.keys()
+    for mes in completo:
+        assert incremental[mes].equals(completo[mes]), f"mês {mes} difere da reconversão"
+
+
+def test_novas_alteradas_removidas_e_meses(dimensao):
+    ano = 2031
+    cabecalho, linhas = _converter_ano(ano)
+    por_mes = {}
+    for posicao, linha in enumerate(linhas):
+        por_mes.setdefault(int(linha["numMes"]), []).append(posicao)
+
+    # Dois valores alterados (meses 2 e 3), uma linha que muda do mês 4
+    # para o 5, três removidas (mês 6) e duas novas (mês 7).
+    esperados = {2, 3, 4, 5, 6, 7}
+    linhas[por_mes[2][0]]["vlrLiquido"] = "1.23"
+    linhas[por_mes[3][0]]["vlrLiquido"] = "4.56"
+    movida = linhas[por_mes[4][0]]
+    movida["numMes"] = "5"
+    movida["datEmissao"] = f"{ano}-05-10T00:00:00"
+    removidas = set(por_mes[6][:3])
+    for desloca in range(2):
+        nova = dict(linhas[por_mes[7][desloca]])
+        nova["ideDocumento"] = str(ano * 10_000_000 + len(linhas) + desloca)
+        linhas.append(nova)
+    linhas = [linha for posicao, linha in enumerate(linhas) if posicao not in removidas]
+    _gravar_bruto("gastos", ano, _escrever_csv(cabecalho, linhas), ano)
+
+    total, diferenca = aplicar_delta("gastos", ano)
+    assert total == len(linhas)
+    assert (diferenca.novas, diferenca.alteradas, diferenca.removidas) == (2, 3, 3)
+    assert diferenca.meses == esperados
+    _conferir_com_reconversao(ano)
+
+    # O mesmo bruto de novo: nada muda e nenhum mês é regravado.
+    _, diferenca = aplicar_delta("gastos", ano)
+    assert not diferenca and diferenca.meses == set()
+
+
+def test_linha_repetida_e_mes_esvaziado(dimensao):
+    # Uma linha idêntica repetida muda o número de ocorrências do conteúdo
+    # (segundo passe pelo bruto), e o mês 12 perde todas as linhas.
+    ano = 2032
+    cabecalho, linhas = _converter_ano(ano, linhas=1_000)
+    linhas.append(dict(linhas[0]))
+    linhas = [linha for linha in linhas if linha["numMes"] != "12"]
+    _gravar_bruto("gastos", ano, _escrever_csv(cabecalho, linhas), ano)
+
+    _, diferenca = aplicar_delta("gastos", ano)
+    assert diferenca.novas == 1
+    assert {int(linhas[0]["numMes"]), 12} <= diferenca.meses
+    assert not os.path.exists(os.path.join(caminho_processado("gastos", ano), "mes=12"))
+    _conferir_com_reconversao(ano)
+
+
+def test_hash_independe_da_representacao():
+    textos = pa.array(["SP", None, "RJ", "", "SP", "MINAS GERAIS"])
+    assert (hash_coluna(textos) == hash_coluna(pc.cast(textos, pa.dictionary(pa.int32(), pa.string())))).all()
+    assert (hash_coluna(textos.slice(2)) == hash_coluna(textos)[2:]).all()
+    assert len(set(hash_coluna(textos).tolist())) == 5
+
+    instantes = pa.array([0, 1_700_000_000, None], type=pa.timestamp("s"))
+    assert (hash_coluna(instantes) == hash_coluna(instantes.cast(pa.timestamp("ms")))).all()
+
+    lote = pa.record_batch({"a": pa.array([1, 2, 1]), "b": pa.array(["x", "y", "x"])})
+    hashes = hash_linhas(lote, ["a", "b"])
+    assert hashes[0] == hashes[2] != hashes[1]
+    assert hashes.dtype == np.uint64
@@ -0,0 +1,81 @@
+import os
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from legisdata.dimensao import CHAVE
+from legisdata.indice_autoria import IndiceAutoria, construir_indice_autoria
+from legisdata.manifesto import obter_manifesto
+from legisdata.processamento import ESTAGIO_PARQUET, caminho_processado
+
+TIPOS = ["PL", "PEC", "REQ", "PLP"]
+
+
+def _gravar(tipo, ano, tabela):
+    destino = caminho_processado(tipo, ano)
+    os.makedirs(os.path.dirname(destino), exist_ok=True)
+    pq.write_table(tabela, destino)
+    obter_manifesto().registrar_derivado(ESTAGIO_PARQUET, tipo, ano, f"{tipo}-{ano}")
+
+
+@pytest.fixture(scope="module")
+def autoria():
+    """
+    Três anos de autoria sintética e as tuplas (chave, ano, id, tipo) únicas
+    esperadas. Em 2002 não há PEC; em 2003 falta o arquivo de proposições
+    (o tipo de todas vira ""); algumas proposições não constam do arquivo
+    do ano; há coautorias repetidas.
+    """
+    gerador = np.random.default_rng(19)
+    esperado = []
+    for ano in (2001, 2002, 2003):
+        ids = np.arange(ano * 10_000, ano * 10_000 + 400, dtype=np.int64)
+        tipos_ano = [t for t in TIPOS if not (ano == 2002 and t == "PEC")]
+        siglas = np.asarray(tipos_ano, dtype=object)[gerador.integers(0, len(tipos_ano), len(ids))]
+        chaves = gerador.integers(0, 60, 1_500).astype(np.int32)
+        propostas = gerador.choice(ids, 1_500)
+        _gravar("autores", ano, pa.table({CHAVE: chaves, "idProposicao": propostas}))
+        tipo_de = dict.fromkeys(ids.tolist(), "")
+        if ano != 2003:
+            # As 20 últimas proposições ficam de fora do arquivo: tipo "".
+            _gravar("proposicoes", ano, pa.table({"id": ids[:-20], "siglaTipo": siglas[:-20].tolist()}))
+            tipo_de.update(zip(ids[:-20].tolist(), siglas[:-20].tolist()))
+        esperado += {(int(c), ano, int(p), tipo_de[int(p)]) for c, p in zip(chaves, propostas)}
+    construir_indice_autoria(anos=[2001, 2002, 2003], forcar=True)
+    return IndiceAutoria(anos=[2001, 2002, 2003]), esperado
+
+
+def _contar(esperado, chave, anos, tipos):
+    return sum(1 for c, a, _, t in esperado
+               if c == chave and (anos is None or a in anos) and (tipos is None or t in tipos))
+
+
+@pytest.mark.parametrize("anos", [None, [2001], [2002, 2003], [1999]])
+@pytest.mark.parametrize("tipos", [None, ["PEC"], ["PL", "REQ"], [""], ["XYZ"]])
+def test_contar_igual_a_forca_bruta(autoria, anos, tipos):
+    indice, esperado = autoria
+    chaves = np.arange(-1, 62)
+    contagem = indice.contar(chaves, anos=anos, tipos=tipos)
+    assert contagem.tolist() == [_contar(esperado, int(c), anos, tipos) for c in chaves]
+
+
+def test_tipo_ausente_no_ano(autoria):
+    indice, esperado = autoria
+    assert indice.contar(np.arange(60), anos=[2002], tipos=["PEC"]).sum() == 0
+    assert indice.contar(np.arange(60), anos=[2001], tipos=["PEC"]).sum() > 0
+
+
+def test_proposicoes_e_contagens(autoria):
+    indice, esperado = autoria
+    for chave in (0, 17, 59):
+        ids = sorted(indice.proposicoes(chave, tipos=["PL", "PEC"]).tolist())
+        assert ids == sorted(p for c, _, p, t in esperado if c == chave and t in ("PL", "PEC"))
+
+    contagens = indice.contagens(por_tipo=True)
+    brutas = {}
+    for c, a, _, t in esperado:
+        brutas[(c, a, t)] = brutas.get((c, a, t), 0) + 1
+    obtidas = {(int(c), int(a), t): int(n) for c, a, t, n in contagens.itertuples(index=False)}
+    assert obtidas == brutas
@@ -0,0 +1,131 @@
+import os
+from collections import defaultdict
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from legisdata.dimensao import CHAVE
+from legisdata.manifesto import obter_manifesto
+from legisdata.presencas import PresencasAno, construir_matrizes_presenca
+from legisdata.processamento import ESTAGIO_PARQUET, caminho_processado
+
+ANO = 2045
+TIPOS = ["Sessão Deliberativa", "Reunião", "Audiência Pública"]
+ORGAOS = ["CCJ", "CFT", "CE", "PLEN", "CSAUDE"]
+
+
+def _gravar(tipo, tabela):
+    destino = caminho_processado(tipo, ANO)
+    os.makedirs(os.path.dirname(destino), exist_ok=True)
+    pq.write_table(tabela, destino)
+    obter_manifesto().registrar_derivado(ESTAGIO_PARQUET, tipo, ANO, f"{tipo}-teste")
+
+
+@pytest.fixture(scope="module")
+def presencas():
+    """
+    Um ano sintético e os atributos de cada evento como a força bruta vê:
+    mês, tipo ("" se fora do arquivo de eventos) e órgãos ({""} se sem órgão).
+    Há eventos de vários órgãos, sem órgão e fora do arquivo de eventos, e
+    deputados com mandato só em parte dos meses.
+    """
+    gerador = np.random.default_rng(20)
+    n_eventos = 150
+    ids = np.arange(900_000, 900_000 + n_eventos, dtype=np.int64)
+    meses = gerador.integers(1, 13, n_eventos)
+    tipos = np.asarray(TIPOS, dtype=object)[gerador.integers(0, len(TIPOS), n_eventos)]
+    quantos_orgaos = gerador.choice([0, 1, 2, 3], n_eventos, p=[0.2, 0.5, 0.2, 0.1])
+    orgaos = [set(gerador.choice(ORGAOS, k, replace=False).tolist()) for k in quantos_orgaos]
+
+    linhas = []
+    for chave in range(30):
+        inicio, fim = sorted(gerador.integers(1, 13, 2))
+        for evento in np.flatnonzero((meses >= inicio) & (meses <= fim)):
+            if gerador.random() < 0.4:
+                linhas.append((chave, ids[evento], meses[evento]))
+    chaves, eventos, meses_presenca = (np.asarray(c) for c in zip(*linhas))
+    _gravar("presencas", pa.table({
+        CHAVE: pa.array(chaves, pa.int32()),
+        "idEvento": pa.array(eventos, pa.int64()),
+        "dataHoraInicio": pa.array([np.datetime64(f"{ANO}-{m:02d}-15T10:00:00", "s") for m in meses_presenca]),
+    }))
+    # Os 10 últimos eventos ficam fora do arquivo de eventos: tipo "".
+    _gravar("eventos", pa.table({"id": ids[:-10], "descricaoTipo": tipos[:-10].tolist()}))
+    pares = [(ids[e], o) for e in range(n_eventos) for o in sorted(orgaos[e])]
+    _gravar("eventos_orgaos", pa.table({
+        "idEvento": pa.array([p[0] for p in pares], pa.int64()),
+        "siglaOrgao": [p[1] for p in pares],
+    }))
+    construir_matrizes_presenca(anos=[ANO], forcar=True)
+
+    atributos = {
+        int(ids[e]): (int(meses[e]), tipos[e] if e < n_eventos - 10 else "", orgaos[e] or {""})
+        for e in range(n_eventos)
+    }
+    return PresencasAno(ANO), set(zip(chaves.tolist(), eventos.tolist())), atributos
+
+
+def _forca_bruta(presentes, atributos, por, tipos, orgaos) -> set:
+    eventos = {e for _, e in presentes}
+    por_orgao = "orgao" in por or orgaos is not None
+    pares = [(e, o if por_orgao else None) for e in eventos for o in atributos[e][2]]
+
+    def atividade(e, o):
+        return atributos[e][0], (o if "orgao" in por else None)
+
+    ativo = defaultdict(set)
+    for chave, e in presentes:
+        for evento, o in pares:
+            if evento == e:
+                ativo[chave].add(atividade(e, o))
+
+    esperado = set()
+    for chave in ativo:
+        grupos = defaultdict(lambda: (set(), set()))
+        for e, o in pares:
+            mes, tipo, _ = atributos[e]
+            if (tipos is not None and tipo not in tipos) or (orgaos is not None and o not in orgaos):
+                continue
+            if atividade(e, o) not in ativo[chave]:
+                continue
+            grupo = tuple({"mes": mes, "tipo": tipo, "orgao": o}[p] for p in por)
+            grupos[grupo][0].add(e)
+            if (chave, e) in presentes:
+                grupos[grupo][1].add(e)
+        esperado |= {(chave, *grupo, len(vistos), len(todos)) for grupo, (todos, vistos) in grupos.items()}
+    return esperado
+
+
+@pytest.mark.parametrize("por, tipos, orgaos", [
+    ((), None, None),
+    (("mes",), None, None),
+    (("tipo",), None, None),
+    (("orgao",), None, None),
+    (("mes", "orgao"), None, None),
+    ((), ["Sessão Deliberativa"], None),
+    (("mes",), None, ["CCJ", "CFT", ""]),
+    (("tipo", "orgao"), ["Reunião", ""], ["CCJ", "CFT"]),
+])
+def test_taxas_igual_a_forca_bruta(presencas, por, tipos, orgaos):
+    matriz, presentes, atributos = presencas
+    resultado = matriz.taxas(por=por, tipos=tipos, orgaos=orgaos)
+    obtido = {
+        (int(linha[0]), *(int(v) if p == "mes" else v for p, v in zip(por, linha[1:-2])), int(linha[-2]), int(linha[-1]))
+        for linha in resultado[[CHAVE, *por, "presencas", "eventos"]].itertuples(index=False)
+    }
+    assert obtido == _forca_bruta(presentes, atributos, por, tipos, orgaos)
+    assert np.allclose(resultado["taxa"], resultado["presencas"] / resultado["eventos"])
+
+
+def test_evento_de_varios_orgaos_conta_uma_vez(presencas):
+    # Sem recorte por órgão, cada evento conta uma vez, tenha quantos órgãos tiver.
+    matriz, presentes, atributos = presencas
+    resultado = matriz.taxas().set_index(CHAVE)["presencas"]
+    por_deputado = defaultdict(int)
+    for chave, _ in presentes:
+        por_deputado[chave] += 1
+    assert resultado.to_dict() == dict(por_deputado)
+    assert any(len(orgaos) > 1 for _, _, orgaos in atributos.values())
+    assert any(orgaos == {""} for _, _, orgaos in atributos.values())
@@ -0,0 +1,23 @@
+import os
+
+import pytest
+
+from benchmarks.dados_sinteticos import csv_proposicoes
+from legisdata.coleta.checkpoint import obter_checkpoint
+from legisdata.config import DIRETORIO_RAW
+from legisdata.processamento import caminho_processado, processar
+
+
+def test_bruto_ausente_falha_so_a_propria_particao():
+    # proposicoes 2039 tem bruto; proposicoes 2038 está no checkpoint sem
+    # arquivo (como uma linha migrada do CSV legado).
+    destino = os.path.join(DIRETORIO_RAW, "proposicoes", "2039.csv")
+    os.makedirs(os.path.dirname(destino), exist_ok=True)
+    with open(destino, "wb") as arquivo:
+        arquivo.write(csv_proposicoes(2039, 200))
+    obter_checkpoint().registrar("proposicoes", 2039)
+    obter_checkpoint().registrar("proposicoes", 2038)
+
+    with pytest.raises(RuntimeError, match="proposicoes 2038: FileNotFoundError"):
+        processar(tipos=["proposicoes"], anos=[2038, 2039], processos=1)
+    assert os.path.exists(caminho_processado("proposicoes", 2039))